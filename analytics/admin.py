@@ -1,5 +1,13 @@
 from django.contrib import admin
-from .models import SearchHistory, ListingView
+from .models import (
+    CityOccupancyMonthly,
+    ListingOccupancyMonthly,
+    ListingView,
+    ListingViewDaily,
+    RollupCheckpoint,
+    SearchHistory,
+    SearchKeywordDaily,
+)
 
 
 @admin.register(SearchHistory)
@@ -15,6 +23,8 @@ class SearchHistoryAdmin(admin.ModelAdmin):
     date_hierarchy = "searched_at"
     # Read-only fields
     readonly_fields = ("searched_at",)
+    # Skip the unfiltered COUNT(*) over the raw table
+    show_full_result_count = False
 
 
 @admin.register(ListingView)
@@ -25,3 +35,44 @@ class ListingViewAdmin(admin.ModelAdmin):
     search_fields = ("listing__title", "user__username")
     date_hierarchy = "viewed_at"
     readonly_fields = ("viewed_at",)
+    show_full_result_count = False
+
+
+@admin.register(SearchKeywordDaily)
+class SearchKeywordDailyAdmin(admin.ModelAdmin):
+    """Daily keyword counts (filled by `manage.py rollup_analytics`)."""
+    list_display = ("day", "keyword", "count")
+    search_fields = ("keyword",)
+    date_hierarchy = "day"
+
+
+@admin.register(ListingViewDaily)
+class ListingViewDailyAdmin(admin.ModelAdmin):
+    """Daily unique viewers per listing (filled by `manage.py rollup_analytics`)."""
+    list_display = ("day", "listing", "unique_viewers")
+    search_fields = ("listing__title",)
+    date_hierarchy = "day"
+    list_select_related = ("listing",)
+
+
+@admin.register(RollupCheckpoint)
+class RollupCheckpointAdmin(admin.ModelAdmin):
+    list_display = ("name", "rolled_up_to", "updated_at")
+
+
+@admin.register(ListingOccupancyMonthly)
+class ListingOccupancyMonthlyAdmin(admin.ModelAdmin):
+    """Confirmed nights and revenue per listing and month (filled by `manage.py occupancy_report`)."""
+    list_display = ("month", "listing", "city", "nights", "days", "occupancy", "revenue")
+    list_filter = ("city",)
+    search_fields = ("listing__title",)
+    date_hierarchy = "month"
+    list_select_related = ("listing",)
+
+
+@admin.register(CityOccupancyMonthly)
+class CityOccupancyMonthlyAdmin(admin.ModelAdmin):
+    """Occupancy per city and month (filled by `manage.py occupancy_report`)."""
+    list_display = ("month", "city", "listings", "nights", "available_nights", "occupancy", "revenue")
+    search_fields = ("city",)
+    date_hierarchy = "month"
@@ -0,0 +1,60 @@
+import logging
+import threading
+
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundFlusher:
+    """
+    Base for per-process buffers drained by a daemon thread.
+
+    The worker calls `flush()` every `flush_interval` seconds, or earlier when `wake()`
+    is called (e.g. a size threshold was reached). Subclasses implement `flush()`.
+    `shutdown()` stops the thread and flushes what is left (registered with atexit by the owners).
+    """
+    thread_name = "background-flusher"
+
+    def __init__(self, flush_interval):
+        self.flush_interval = flush_interval
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+
+    def flush(self):
+        raise NotImplementedError
+
+    def wake(self):
+        self._wake.set()
+
+    def shutdown(self, timeout=5):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+        self._stop.clear()
+
+    def _ensure_worker(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=self.thread_name, daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                return
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("%s: flush failed", self.thread_name)
+            # Release the thread's DB connection between flushes (honours CONN_MAX_AGE)
+            close_old_connections()
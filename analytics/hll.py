@@ -0,0 +1,71 @@
+"""
+HyperLogLog cardinality sketch (Flajolet et al., with the linear-counting small-range correction).
+
+2**precision one-byte registers; the standard error is about 1.04 / sqrt(2**precision)
+(precision 12: 4096 registers, ~1.6%). Sketches of the same precision merge by taking the
+register-wise maximum, so the union of any number of days costs no more space than one day.
+`to_bytes()` stores the registers zlib-compressed: a sparse sketch (few viewers) is a few dozen bytes.
+"""
+import hashlib
+import math
+import zlib
+
+DEFAULT_PRECISION = 12
+HASH_BITS = 64
+
+
+def _hash(value):
+    digest = hashlib.blake2b(str(value).encode("utf-8"), digest_size=HASH_BITS // 8).digest()
+    return int.from_bytes(digest, "big")
+
+
+class HyperLogLog:
+    def __init__(self, precision=DEFAULT_PRECISION, registers=None):
+        if not 4 <= precision <= 16:
+            raise ValueError("precision must be between 4 and 16")
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = bytearray(registers) if registers is not None else bytearray(self.m)
+        if len(self.registers) != self.m:
+            raise ValueError("register count does not match precision")
+
+    def add(self, value):
+        x = _hash(value)
+        index = x >> (HASH_BITS - self.precision)
+        rest = x & ((1 << (HASH_BITS - self.precision)) - 1)
+        # Position of the leftmost 1-bit in the remaining bits
+        rank = (HASH_BITS - self.precision) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, values):
+        for value in values:
+            self.add(value)
+        return self
+
+    def merge(self, other):
+        if other.precision != self.precision:
+            raise ValueError("cannot merge sketches of different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    def count(self):
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        total = sum(self.registers.count(r) * 2.0 ** -r for r in set(self.registers))
+        estimate = alpha * m * m / total
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return round(estimate)
+
+    def __len__(self):
+        return self.count()
+
+    def to_bytes(self):
+        return bytes([self.precision]) + zlib.compress(bytes(self.registers))
+
+    @classmethod
+    def from_bytes(cls, data):
+        data = bytes(data)
+        return cls(precision=data[0], registers=zlib.decompress(data[1:]))
@@ -0,0 +1,85 @@
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from analytics.hll import HyperLogLog
+from analytics.models import ListingView, ListingViewSketch
+from analytics.uniques import merge_sketches, unique_viewers
+from listings.models import Listing
+
+# Rough on-disk cost of one ListingView row plus its unique and viewed_on index entries
+LISTING_VIEW_ROW_BYTES = 80
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the HyperLogLog unique-viewer sketches with the exact ListingView table "
+        "(size, accuracy, range-query time). Synthetic data is rolled back at the end."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=2000, help="Distinct synthetic viewers.")
+        parser.add_argument("--days", type=int, default=30, help="Days of views.")
+        parser.add_argument("--views-per-day", type=int, default=300, help="Views per day.")
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._run(**options)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _run(self, users, days, views_per_day, seed, **_):
+        rng = random.Random(seed)
+        landlord = User.objects.create_user(username=f"bench-landlord-{seed}-{time.time_ns()}")
+        listing = Listing.objects.create(
+            landlord=landlord, title=f"bench-{time.time_ns()}", description="bench", location_city="Bench",
+            location_district="Bench", price=1000, rooms=1,
+        )
+        viewers = User.objects.bulk_create(
+            [User(username=f"bench-{seed}-{i}-{time.time_ns()}") for i in range(users)]
+        )
+        end = timezone.localdate()
+        start = end - timedelta(days=days - 1)
+
+        rows, sketches = [], {}
+        for offset in range(days):
+            day = start + timedelta(days=offset)
+            day_viewers = {rng.choice(viewers).pk for _ in range(views_per_day)}
+            rows += [ListingView(user_id=pk, listing=listing, viewed_on=day) for pk in day_viewers]
+            sketches[(listing.pk, day)] = HyperLogLog().update(f"u:{pk}" for pk in day_viewers)
+        ListingView.objects.bulk_create(rows, batch_size=1000)
+        merge_sketches(sketches)
+
+        t0 = time.perf_counter()
+        exact = (
+            ListingView.objects.filter(listing=listing, viewed_on__range=(start, end))
+            .aggregate(n=Count("user", distinct=True))["n"]
+        )
+        exact_ms = (time.perf_counter() - t0) * 1000
+
+        t0 = time.perf_counter()
+        estimate = unique_viewers(listing.pk, start, end)
+        hll_ms = (time.perf_counter() - t0) * 1000
+
+        sketch_bytes = sum(
+            len(r) for r in ListingViewSketch.objects.filter(listing=listing).values_list("registers", flat=True)
+        )
+        error = abs(estimate - exact) / exact * 100 if exact else 0.0
+
+        self.stdout.write(f"ListingView rows:   {len(rows)} (~{len(rows) * LISTING_VIEW_ROW_BYTES} bytes)")
+        self.stdout.write(f"HLL sketches:       {len(sketches)} ({sketch_bytes} bytes)")
+        self.stdout.write(f"exact uniques:      {exact} in {exact_ms:.1f} ms")
+        self.stdout.write(f"estimated uniques:  {estimate} in {hll_ms:.1f} ms (error {error:.2f}%)")
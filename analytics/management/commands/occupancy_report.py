@@ -0,0 +1,43 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from analytics.models import CityOccupancyMonthly
+from analytics.occupancy import default_range, parse_month, report
+
+
+def _parse_month(value):
+    try:
+        return parse_month(value)
+    except ValueError:
+        raise CommandError(f"Invalid month '{value}', expected YYYY-MM.")
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the monthly occupancy/revenue rollups (ListingOccupancyMonthly, CityOccupancyMonthly) "
+        "from confirmed bookings. Default: the last ANALYTICS_OCCUPANCY_MONTHS months."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--from", dest="first", help="First month, YYYY-MM.")
+        parser.add_argument("--to", dest="last", help="Last month, YYYY-MM (default: the current month).")
+        parser.add_argument("--chunk-size", type=int, help="Listings per query (default: ANALYTICS_OCCUPANCY_CHUNK_SIZE).")
+
+    def handle(self, *args, **options):
+        default_first, default_last = default_range()
+        last = _parse_month(options["last"]) if options["last"] else default_last
+        first = _parse_month(options["first"]) if options["first"] else min(default_first, last)
+        if first > last:
+            raise CommandError("--from must not be after --to.")
+
+        t0 = time.perf_counter()
+        result = report(first, last, chunk_size=options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(
+            f"{first:%Y-%m} .. {last:%Y-%m}: {result['listings']} listings, {result['rows']} listing-month rows, "
+            f"{result['cities']} cities in {time.perf_counter() - t0:.1f} s."
+        ))
+        for row in CityOccupancyMonthly.objects.filter(month=last).order_by("-occupancy")[:10]:
+            self.stdout.write(
+                f"  {row.city}: {row.occupancy:.1%} ({row.nights}/{row.available_nights} nights), revenue {row.revenue}"
+            )
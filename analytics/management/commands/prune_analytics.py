@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from analytics.rollups import prune, retention_days
+
+
+class Command(BaseCommand):
+    help = "Delete raw search/view events older than the retention window, in small chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, help="Keep this many days (default: ANALYTICS_RAW_RETENTION_DAYS).")
+        parser.add_argument("--chunk-size", type=int, help="Rows deleted per transaction.")
+        parser.add_argument("--pause", type=float, default=0, help="Seconds to sleep between chunks.")
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Also delete days that are not rolled up yet (their counts are lost).",
+        )
+
+    def handle(self, *args, **options):
+        days = options["days"] if options["days"] is not None else retention_days()
+        result = prune(days=days, chunk_size=options["chunk_size"], pause=options["pause"], force=options["force"])
+        for name, deleted in result.items():
+            self.stdout.write(self.style.SUCCESS(f"{name}: deleted {deleted} rows older than {days} days."))
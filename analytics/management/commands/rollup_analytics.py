@@ -0,0 +1,29 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from analytics.rollups import rollup
+
+
+def _parse_day(value):
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise CommandError(f"Invalid date '{value}', expected YYYY-MM-DD.")
+
+
+class Command(BaseCommand):
+    help = "Aggregate raw search/view events into the daily rollup tables (only days not rolled up yet)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--until", help="Last day to aggregate, YYYY-MM-DD (default: yesterday).")
+        parser.add_argument("--since", help="Re-aggregate from this day, YYYY-MM-DD (rebuild).")
+
+    def handle(self, *args, **options):
+        until = _parse_day(options["until"]) if options["until"] else None
+        since = _parse_day(options["since"]) if options["since"] else None
+        for name, span in rollup(until=until, since=since).items():
+            if span is None:
+                self.stdout.write(f"{name}: up to date.")
+            else:
+                self.stdout.write(self.style.SUCCESS(f"{name}: aggregated {span[0]} .. {span[1]}."))
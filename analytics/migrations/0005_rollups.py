@@ -0,0 +1,78 @@
+# Generated by Django 5.2.4 on 2026-10-17 23:26
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0004_alter_listingview_viewed_at'),
+        ('listings', '0007_listing_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ListingViewDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('unique_viewers', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Listing View (daily)',
+                'verbose_name_plural': 'Listing Views (daily)',
+                'ordering': ['-day'],
+            },
+        ),
+        migrations.CreateModel(
+            name='RollupCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('rolled_up_to', models.DateField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SearchKeywordDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('keyword', models.CharField(max_length=255)),
+                ('day', models.DateField()),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Search Keyword (daily)',
+                'verbose_name_plural': 'Search Keywords (daily)',
+                'ordering': ['-day', '-count'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='searchhistory',
+            index=models.Index(fields=['searched_at'], name='search_history_at_idx'),
+        ),
+        migrations.AddField(
+            model_name='listingviewdaily',
+            name='listing',
+            field=models.ForeignKey(help_text='The listing being viewed', on_delete=django.db.models.deletion.CASCADE, related_name='daily_views', to='listings.listing'),
+        ),
+        migrations.AddIndex(
+            model_name='searchkeyworddaily',
+            index=models.Index(fields=['day', 'count'], name='search_kw_daily_day_count_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='searchkeyworddaily',
+            constraint=models.UniqueConstraint(fields=('keyword', 'day'), name='uniq_search_keyword_daily'),
+        ),
+        migrations.AddIndex(
+            model_name='listingviewdaily',
+            index=models.Index(fields=['day'], name='listing_view_daily_day_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='listingviewdaily',
+            constraint=models.UniqueConstraint(fields=('listing', 'day'), name='uniq_listing_view_daily'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2026-10-17 23:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0005_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrendingSketch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('window', models.CharField(max_length=20, unique=True)),
+                ('landmark', models.FloatField(help_text='Unix time the decayed counters are scaled to')),
+                ('counters', models.JSONField(default=dict, help_text='keyword -> [count, error]')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
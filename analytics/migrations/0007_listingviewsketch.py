@@ -0,0 +1,30 @@
+# Generated by Django 5.2.4 on 2026-10-17 23:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0006_trendingsketch'),
+        ('listings', '0007_listing_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ListingViewSketch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('registers', models.BinaryField(help_text='Serialized HyperLogLog (analytics/hll.py)')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('listing', models.ForeignKey(help_text='The listing being viewed', on_delete=django.db.models.deletion.CASCADE, related_name='view_sketches', to='listings.listing')),
+            ],
+            options={
+                'verbose_name': 'Listing View Sketch',
+                'verbose_name_plural': 'Listing View Sketches',
+                'constraints': [models.UniqueConstraint(fields=('listing', 'day'), name='uniq_listing_view_sketch')],
+            },
+        ),
+    ]
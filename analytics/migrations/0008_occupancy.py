@@ -0,0 +1,54 @@
+# Generated by Django 5.2.4 on 2026-10-18 00:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0007_listingviewsketch'),
+        ('listings', '0007_listing_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CityOccupancyMonthly',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('city', models.CharField(max_length=100)),
+                ('month', models.DateField(help_text='First day of the month')),
+                ('listings', models.PositiveIntegerField(default=0)),
+                ('nights', models.PositiveIntegerField(default=0)),
+                ('available_nights', models.PositiveIntegerField(default=0)),
+                ('occupancy', models.FloatField(default=0, help_text='nights / available_nights')),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+            ],
+            options={
+                'verbose_name': 'City Occupancy (monthly)',
+                'verbose_name_plural': 'City Occupancy (monthly)',
+                'ordering': ['-month', 'city'],
+                'constraints': [models.UniqueConstraint(fields=('city', 'month'), name='uniq_city_occupancy_monthly')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ListingOccupancyMonthly',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the month')),
+                ('city', models.CharField(help_text='Listing city at report time', max_length=100)),
+                ('nights', models.PositiveIntegerField(default=0)),
+                ('days', models.PositiveSmallIntegerField(help_text='Nights in the month')),
+                ('occupancy', models.FloatField(default=0, help_text='nights / days')),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('listing', models.ForeignKey(help_text='The listing being booked', on_delete=django.db.models.deletion.CASCADE, related_name='monthly_occupancy', to='listings.listing')),
+            ],
+            options={
+                'verbose_name': 'Listing Occupancy (monthly)',
+                'verbose_name_plural': 'Listing Occupancy (monthly)',
+                'ordering': ['-month', '-occupancy'],
+                'indexes': [models.Index(fields=['month', 'city', 'occupancy'], name='occupancy_month_city_idx')],
+                'constraints': [models.UniqueConstraint(fields=('listing', 'month'), name='uniq_listing_occupancy_monthly')],
+            },
+        ),
+    ]
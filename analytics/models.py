@@ -24,6 +24,10 @@ class SearchHistory(models.Model):
         verbose_name = 'Search History'
         verbose_name_plural = 'Search Histories'
         ordering = ['-searched_at']
+        indexes = [
+            # Range scans of the rollup and retention commands
+            models.Index(fields=['searched_at'], name='search_history_at_idx'),
+        ]
 
 
 class ListingView(models.Model):
@@ -57,3 +61,153 @@ class ListingView(models.Model):
                 name='uniq_listing_view_per_user_per_day'
             )
         ]
+
+
+class SearchKeywordDaily(models.Model):
+    """Daily rollup of SearchHistory: how many times a (normalized) keyword was searched on a day."""
+    keyword = models.CharField(max_length=255)
+    day = models.DateField()
+    count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.day}: '{self.keyword}' x{self.count}"
+
+    class Meta:
+        verbose_name = 'Search Keyword (daily)'
+        verbose_name_plural = 'Search Keywords (daily)'
+        ordering = ['-day', '-count']
+        constraints = [
+            models.UniqueConstraint(fields=['keyword', 'day'], name='uniq_search_keyword_daily'),
+        ]
+        indexes = [
+            models.Index(fields=['day', 'count'], name='search_kw_daily_day_count_idx'),
+        ]
+
+
+class ListingViewDaily(models.Model):
+    """Daily rollup of ListingView: distinct viewers of a listing on a day."""
+    listing = models.ForeignKey(
+        Listing,
+        on_delete=models.CASCADE,
+        related_name='daily_views',
+        help_text="The listing being viewed"
+    )
+    day = models.DateField()
+    unique_viewers = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.day}: listing {self.listing_id} x{self.unique_viewers}"
+
+    class Meta:
+        verbose_name = 'Listing View (daily)'
+        verbose_name_plural = 'Listing Views (daily)'
+        ordering = ['-day']
+        constraints = [
+            models.UniqueConstraint(fields=['listing', 'day'], name='uniq_listing_view_daily'),
+        ]
+        indexes = [
+            models.Index(fields=['day'], name='listing_view_daily_day_idx'),
+        ]
+
+
+class RollupCheckpoint(models.Model):
+    """Last day (inclusive) already aggregated by `rollup_analytics` for one rollup."""
+    name = models.CharField(max_length=50, unique=True)
+    rolled_up_to = models.DateField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} <= {self.rolled_up_to}"
+
+
+class TrendingSketch(models.Model):
+    """Checkpoint of the trending-keywords summary of one window (see analytics/trending.py)."""
+    window = models.CharField(max_length=20, unique=True)
+    landmark = models.FloatField(help_text="Unix time the decayed counters are scaled to")
+    counters = models.JSONField(default=dict, help_text="keyword -> [count, error]")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.window}: {len(self.counters)} keywords"
+
+
+class ListingViewSketch(models.Model):
+    """HyperLogLog of the distinct visitors (users and hashed anonymous clients) of a listing on a day."""
+    listing = models.ForeignKey(
+        Listing,
+        on_delete=models.CASCADE,
+        related_name='view_sketches',
+        help_text="The listing being viewed"
+    )
+    day = models.DateField()
+    registers = models.BinaryField(help_text="Serialized HyperLogLog (analytics/hll.py)")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.day}: listing {self.listing_id}"
+
+    class Meta:
+        verbose_name = 'Listing View Sketch'
+        verbose_name_plural = 'Listing View Sketches'
+        constraints = [
+            models.UniqueConstraint(fields=['listing', 'day'], name='uniq_listing_view_sketch'),
+        ]
+
+
+class ListingOccupancyMonthly(models.Model):
+    """
+    Confirmed nights of a listing in a calendar month and the revenue they bring at the listing's
+    price (filled by `manage.py occupancy_report`, see analytics/occupancy.py).
+    Months without confirmed nights have no row.
+    """
+    listing = models.ForeignKey(
+        Listing,
+        on_delete=models.CASCADE,
+        related_name='monthly_occupancy',
+        help_text="The listing being booked"
+    )
+    month = models.DateField(help_text="First day of the month")
+    city = models.CharField(max_length=100, help_text="Listing city at report time")
+    nights = models.PositiveIntegerField(default=0)
+    days = models.PositiveSmallIntegerField(help_text="Nights in the month")
+    occupancy = models.FloatField(default=0, help_text="nights / days")
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    def __str__(self):
+        return f"{self.month:%Y-%m}: listing {self.listing_id} {self.nights}/{self.days}"
+
+    class Meta:
+        verbose_name = 'Listing Occupancy (monthly)'
+        verbose_name_plural = 'Listing Occupancy (monthly)'
+        ordering = ['-month', '-occupancy']
+        constraints = [
+            models.UniqueConstraint(fields=['listing', 'month'], name='uniq_listing_occupancy_monthly'),
+        ]
+        indexes = [
+            models.Index(fields=['month', 'city', 'occupancy'], name='occupancy_month_city_idx'),
+        ]
+
+
+class CityOccupancyMonthly(models.Model):
+    """
+    Monthly occupancy of a city: confirmed nights over the nights its listings could be booked
+    (listings that existed by the end of the month, booked or not). Filled with ListingOccupancyMonthly.
+    """
+    city = models.CharField(max_length=100)
+    month = models.DateField(help_text="First day of the month")
+    listings = models.PositiveIntegerField(default=0)
+    nights = models.PositiveIntegerField(default=0)
+    available_nights = models.PositiveIntegerField(default=0)
+    occupancy = models.FloatField(default=0, help_text="nights / available_nights")
+    revenue = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+
+    def __str__(self):
+        return f"{self.month:%Y-%m}: {self.city} {self.occupancy:.1%}"
+
+    class Meta:
+        verbose_name = 'City Occupancy (monthly)'
+        verbose_name_plural = 'City Occupancy (monthly)'
+        ordering = ['-month', 'city']
+        constraints = [
+            models.UniqueConstraint(fields=['city', 'month'], name='uniq_city_occupancy_monthly'),
+        ]
@@ -0,0 +1,186 @@
+"""
+Monthly occupancy and revenue report (`manage.py occupancy_report`, /api/analytics/occupancy/).
+
+For every listing and calendar month: the nights covered by CONFIRMED bookings, the share of
+the month they cover and their revenue at the listing's current price. Results are written to
+ListingOccupancyMonthly (only months with confirmed nights) and CityOccupancyMonthly (every
+city, where the denominator is the nights of all listings that existed by the end of the month).
+
+Bookings are never expanded into nights. Listings are walked in primary-key chunks of
+ANALYTICS_OCCUPANCY_CHUNK_SIZE; per chunk one query returns the overlapping confirmed stays
+ordered by (listing, start_date) (Booking(listing, end_date, ...) index), loaded into flat
+`array` buffers of date ordinals clipped to the report window. A listing's stays are then
+merged into disjoint runs (the non-zero stretches of its nightly difference array, found by
+a sweep instead of a per-day prefix sum) and each run is cut at the month boundaries with a
+binary search. The work is O(stays + months crossed), independent of how long the stays are.
+NumPy is not a dependency of the project, so this stays in plain Python.
+
+A run replaces the rows of its months as a whole (one transaction), so re-running is idempotent.
+"""
+from array import array
+from bisect import bisect_right
+from datetime import date
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from bookings.choices import BookingStatus
+from bookings.models import Booking
+from listings.models import Listing
+from .models import CityOccupancyMonthly, ListingOccupancyMonthly
+
+DEFAULT_CHUNK_SIZE = 2000
+DEFAULT_MONTHS = 12
+CENTS = Decimal("0.01")
+
+
+def parse_month(value):
+    """'YYYY-MM' -> the first day of that month; ValueError otherwise."""
+    year, _, month = value.partition("-")
+    if not (year.isdigit() and month.isdigit()):
+        raise ValueError(f"Invalid month '{value}', expected YYYY-MM.")
+    return date(int(year), int(month), 1)
+
+
+def add_months(month, n):
+    index = month.year * 12 + month.month - 1 + n
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def default_range(today=None):
+    """The last DEFAULT_MONTHS months, the current one included."""
+    current = (today or timezone.localdate()).replace(day=1)
+    return add_months(current, 1 - getattr(settings, "ANALYTICS_OCCUPANCY_MONTHS", DEFAULT_MONTHS)), current
+
+
+def month_bounds(first, last):
+    """Ordinals of the first day of each month in [first, last] plus the day after `last`."""
+    return array("i", (add_months(first, i).toordinal() for i in range(_months_between(first, last) + 2)))
+
+
+def _months_between(first, last):
+    return (last.year - first.year) * 12 + last.month - first.month
+
+
+def monthly_nights(starts, ends, bounds, lo=0, hi=None):
+    """
+    Nights per month covered by the stays [starts[i], ends[i]) for i in [lo, hi), which must be
+    sorted by start and clipped to [bounds[0], bounds[-1]]. Overlapping stays count once.
+    """
+    nights = [0] * (len(bounds) - 1)
+    hi = len(starts) if hi is None else hi
+    run_start = run_end = None
+    for i in range(lo, hi):
+        start, end = starts[i], ends[i]
+        if run_end is not None and start <= run_end:
+            run_end = max(run_end, end)
+            continue
+        if run_end is not None:
+            _split(nights, bounds, run_start, run_end)
+        run_start, run_end = start, end
+    if run_end is not None:
+        _split(nights, bounds, run_start, run_end)
+    return nights
+
+
+def _split(nights, bounds, start, end):
+    month = bisect_right(bounds, start) - 1
+    while start < end:
+        stop = min(end, bounds[month + 1])
+        nights[month] += stop - start
+        start = stop
+        month += 1
+
+
+def _stays(listing_lo, listing_hi, window_start, window_end):
+    """Confirmed stays of the listings in [listing_lo, listing_hi], as three ordinal arrays."""
+    listing_ids, starts, ends = array("q"), array("i"), array("i")
+    first, last = date.fromordinal(window_start), date.fromordinal(window_end)
+    rows = (
+        Booking.objects.filter(
+            listing_id__gte=listing_lo,
+            listing_id__lte=listing_hi,
+            status=BookingStatus.CONFIRMED,
+            start_date__lt=last,
+            end_date__gt=first,
+        )
+        .order_by("listing_id", "start_date")
+        .values_list("listing_id", "start_date", "end_date")
+    )
+    for listing_id, start, end in rows.iterator(chunk_size=5000):
+        listing_ids.append(listing_id)
+        starts.append(max(start.toordinal(), window_start))
+        ends.append(min(end.toordinal(), window_end))
+    return listing_ids, starts, ends
+
+
+def report(first, last, chunk_size=None):
+    """
+    Rebuild the occupancy rollups of the months [first, last] (first days of months).
+    Returns {"months", "listings", "rows", "cities"}.
+    """
+    if first > last:
+        raise ValueError("The first month must not be after the last one.")
+    chunk_size = chunk_size or getattr(settings, "ANALYTICS_OCCUPANCY_CHUNK_SIZE", DEFAULT_CHUNK_SIZE)
+    bounds = month_bounds(first, last)
+    months = [date.fromordinal(o) for o in bounds[:-1]]
+    days = [bounds[m + 1] - bounds[m] for m in range(len(months))]
+    cities = {}  # city -> per month [listings, nights, revenue]
+    listings = rows = 0
+
+    with transaction.atomic():
+        ListingOccupancyMonthly.objects.filter(month__gte=first, month__lte=last).delete()
+        CityOccupancyMonthly.objects.filter(month__gte=first, month__lte=last).delete()
+        last_pk = 0
+        while True:
+            chunk = list(
+                Listing.objects.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .values_list("pk", "price", "location_city", "created_at")[:chunk_size]
+            )
+            if not chunk:
+                break
+            last_pk = chunk[-1][0]
+            listing_ids, starts, ends = _stays(chunk[0][0], last_pk, bounds[0], bounds[-1])
+            # Stays are grouped by listing: spans[pk] = (lo, hi) in the arrays
+            spans = {}
+            for i, listing_id in enumerate(listing_ids):
+                spans[listing_id] = (spans[listing_id][0] if listing_id in spans else i, i + 1)
+            batch = []
+            for pk, price, city, created_at in chunk:
+                listings += 1
+                totals = cities.setdefault(city, [[0, 0, Decimal(0)] for _ in months])
+                created = timezone.localtime(created_at).date().toordinal() if created_at else bounds[0]
+                nights = monthly_nights(starts, ends, bounds, *spans[pk]) if pk in spans else None
+                for m, month in enumerate(months):
+                    booked = nights[m] if nights else 0
+                    if created >= bounds[m + 1] and not booked:
+                        continue  # the listing did not exist yet
+                    revenue = (price * booked).quantize(CENTS)
+                    total = totals[m]
+                    total[0] += 1
+                    total[1] += booked
+                    total[2] += revenue
+                    if booked:
+                        batch.append(ListingOccupancyMonthly(
+                            listing_id=pk, month=month, city=city, nights=booked, days=days[m],
+                            occupancy=booked / days[m], revenue=revenue,
+                        ))
+            ListingOccupancyMonthly.objects.bulk_create(batch, batch_size=1000)
+            rows += len(batch)
+
+        CityOccupancyMonthly.objects.bulk_create(
+            (
+                CityOccupancyMonthly(
+                    city=city, month=month, listings=count, nights=nights,
+                    available_nights=count * days[m], occupancy=nights / (count * days[m]), revenue=revenue,
+                )
+                for city, totals in cities.items()
+                for m, (month, (count, nights, revenue)) in enumerate(zip(months, totals))
+                if count
+            ),
+            batch_size=1000,
+        )
+    return {"months": len(months), "listings": listings, "rows": rows, "cities": len(cities)}
@@ -0,0 +1,200 @@
+"""
+Buffered, batched recording of listing view events.
+
+`ListingViewSet.retrieve` only calls `get_view_recorder().record(...)`: the
+(user, listing, day) event is deduplicated in a per-process buffer and returns immediately.
+A daemon thread flushes the buffer when it reaches ANALYTICS_VIEW_BUFFER_SIZE events or
+every ANALYTICS_VIEW_FLUSH_INTERVAL seconds:
+- rows that already exist are filtered out with one SELECT;
+- new rows are inserted with one `bulk_create`; if another process inserted one of the keys
+  in between (unique violation), the batch is retried row by row in savepoints, so only
+  rows actually inserted are counted;
+- `views_count` increments are coalesced into one grouped UPDATE for all listings
+  of the batch (instead of one `UPDATE ... views_count + 1` per view).
+The buffer is flushed on interpreter shutdown (atexit).
+A failed flush puts its events back for the next one (writes are idempotent per key), like
+the unique-viewers recorder does, up to ANALYTICS_VIEW_MAX_PENDING buffered events; events
+beyond that are dropped and counted in `failed` (/api/analytics/pipeline-stats/).
+
+settings.ANALYTICS_VIEW_RECORDER:
+- "buffered" — the behaviour above (default);
+- "sync"     — write every event inline (tests, management commands).
+
+Note: bulk_create does not send post_save, so analytics.signals.inc_listing_views only
+covers rows created one by one (e.g. POST /api/analytics/listing-views/).
+"""
+import atexit
+import logging
+import threading
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Case, F, PositiveIntegerField, Value, When
+from django.utils import timezone
+
+from listings.models import Listing
+from .batching import BackgroundFlusher
+from .models import ListingView
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUFFER_SIZE = 500
+DEFAULT_FLUSH_INTERVAL = 5  # seconds
+DEFAULT_MAX_PENDING = 10000
+# Upper bound of already-flushed keys remembered to skip repeated views without a SELECT
+SEEN_LIMIT = 100000
+
+
+def increment_views_count(increments):
+    """
+    Apply {listing_id: n} as a single UPDATE:
+    views_count = views_count + CASE WHEN id IN (...) THEN n ... END
+    """
+    if not increments:
+        return
+    by_amount = defaultdict(list)
+    for listing_id, amount in increments.items():
+        by_amount[amount].append(listing_id)
+    delta = Case(
+        *[When(pk__in=ids, then=Value(amount)) for amount, ids in by_amount.items()],
+        default=Value(0),
+        output_field=PositiveIntegerField(),
+    )
+    Listing.objects.filter(pk__in=list(increments)).update(
+        views_count=F("views_count") + delta,
+        updated_at=timezone.now(),
+    )
+
+
+def _existing_keys(events):
+    return set(
+        ListingView.objects.filter(
+            user_id__in={e[0] for e in events},
+            listing_id__in={e[1] for e in events},
+            viewed_on__in={e[2] for e in events},
+        ).values_list("user_id", "listing_id", "viewed_on")
+    )
+
+
+def _rows(events):
+    return [ListingView(user_id=u, listing_id=l, viewed_on=d) for u, l, d in events]
+
+
+def _insert(events):
+    """Insert (user_id, listing_id, viewed_on) rows; returns the events actually inserted."""
+    try:
+        with transaction.atomic():
+            ListingView.objects.bulk_create(_rows(events), batch_size=500)
+        return events
+    except IntegrityError:
+        pass
+    # Another process inserted some of the keys since the SELECT: retry one row per savepoint
+    # to find out which rows are ours (bulk_create(ignore_conflicts=True) can't tell which rows
+    # it skipped, and save() would fire inc_listing_views on top of our increments).
+    inserted = []
+    for event in events:
+        try:
+            with transaction.atomic():
+                ListingView.objects.bulk_create(_rows([event]))
+        except IntegrityError:
+            continue
+        inserted.append(event)
+    return inserted
+
+
+def write_views(events):
+    """
+    Persist a batch of (user_id, listing_id, viewed_on) events.
+    Idempotent per (user, listing, day); returns the number of new rows.
+    """
+    events = set(events)
+    if not events:
+        return 0
+    existing = _existing_keys(events)
+    new = [e for e in events if e not in existing]
+    if not new:
+        return 0
+
+    with transaction.atomic():
+        inserted = _insert(new)
+        increment_views_count(Counter(listing_id for _, listing_id, _ in inserted))
+    return len(inserted)
+
+
+class ListingViewRecorder(BackgroundFlusher):
+    thread_name = "listing-view-recorder"
+
+    def __init__(self, buffer_size=None, flush_interval=None, max_pending=None):
+        super().__init__(
+            flush_interval or getattr(settings, "ANALYTICS_VIEW_FLUSH_INTERVAL", DEFAULT_FLUSH_INTERVAL)
+        )
+        self.buffer_size = buffer_size or getattr(settings, "ANALYTICS_VIEW_BUFFER_SIZE", DEFAULT_BUFFER_SIZE)
+        self.max_pending = max_pending or getattr(settings, "ANALYTICS_VIEW_MAX_PENDING", DEFAULT_MAX_PENDING)
+        self._pending = set()
+        self._seen = set()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self.flushed_rows = 0
+        self.failed = 0
+
+    @property
+    def is_buffered(self):
+        return getattr(settings, "ANALYTICS_VIEW_RECORDER", "buffered") == "buffered"
+
+    def record(self, user_id, listing_id, viewed_on):
+        event = (user_id, listing_id, viewed_on)
+        if not self.is_buffered:
+            write_views([event])
+            return
+
+        with self._lock:
+            if event in self._seen or event in self._pending:
+                return
+            self._pending.add(event)
+            full = len(self._pending) >= self.buffer_size
+        self._ensure_worker()
+        if full:
+            self.wake()
+
+    def flush(self):
+        """Write everything buffered so far; safe to call from any thread."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, set()
+            if not batch:
+                return 0
+            try:
+                written = write_views(batch)
+            except Exception:
+                logger.exception("Failed to flush %s listing view events", len(batch))
+                self._requeue(batch)
+                return 0
+            self.flushed_rows += written
+            with self._lock:
+                if len(self._seen) + len(batch) > SEEN_LIMIT:
+                    self._seen.clear()
+                self._seen.update(batch)
+            return written
+
+    def _requeue(self, batch):
+        """Put a failed batch back for the next flush, within `max_pending`."""
+        with self._lock:
+            room = max(self.max_pending - len(self._pending), 0)
+            retry = list(batch - self._pending)
+            self._pending.update(retry[:room])
+            self.failed += len(retry[room:])
+
+    def stats(self):
+        with self._lock:
+            pending = len(self._pending)
+        return {"mode": "buffered" if self.is_buffered else "sync", "pending": pending,
+                "flushed_rows": self.flushed_rows, "failed": self.failed}
+
+
+_recorder = ListingViewRecorder()
+atexit.register(_recorder.shutdown)
+
+
+def get_view_recorder():
+    return _recorder
@@ -0,0 +1,171 @@
+"""
+Daily rollups and retention for the raw analytics events.
+
+- `rollup()` aggregates complete days (up to yesterday) that were not rolled up yet:
+  SearchHistory -> SearchKeywordDaily(keyword, day, count), keywords lower-cased/trimmed;
+  ListingView   -> ListingViewDaily(listing, day, unique_viewers).
+  Progress is kept in RollupCheckpoint, so each run only scans the new time range
+  (an index range scan on searched_at / viewed_on). A day is replaced as a whole,
+  which makes re-running a range (`since=`) idempotent.
+- `prune()` deletes raw rows older than the retention window in primary-key chunks,
+  each chunk in its own short transaction. Days that are not rolled up yet are never pruned.
+
+Reporting should read the rollup tables; raw events are kept only for the retention window.
+"""
+import time
+from datetime import datetime, time as dt_time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import Lower, Trim, TruncDate
+from django.utils import timezone
+
+from .models import (
+    ListingView,
+    ListingViewDaily,
+    RollupCheckpoint,
+    SearchHistory,
+    SearchKeywordDaily,
+)
+
+SEARCH_KEYWORDS = "search_keywords"
+LISTING_VIEWS = "listing_views"
+# Days aggregated per transaction
+DAYS_PER_STEP = 7
+DEFAULT_RETENTION_DAYS = 90
+DEFAULT_PRUNE_CHUNK_SIZE = 5000
+
+
+def _start_of(day):
+    """Aware datetime of local midnight of `day`."""
+    return timezone.make_aware(datetime.combine(day, dt_time.min))
+
+
+def _rollup_search(start, end):
+    rows = (
+        SearchHistory.objects
+        .filter(searched_at__gte=_start_of(start), searched_at__lt=_start_of(end + timedelta(days=1)))
+        .annotate(day=TruncDate("searched_at"), kw=Lower(Trim("keyword")))
+        .values("day", "kw")
+        .annotate(n=Count("id"))
+        .order_by()
+    )
+    SearchKeywordDaily.objects.filter(day__range=(start, end)).delete()
+    SearchKeywordDaily.objects.bulk_create(
+        [SearchKeywordDaily(keyword=row["kw"], day=row["day"], count=row["n"]) for row in rows if row["kw"]],
+        batch_size=1000,
+    )
+
+
+def _rollup_views(start, end):
+    # (user, listing, viewed_on) is unique, so rows per (listing, day) = distinct viewers;
+    # rows whose user was deleted (user=NULL) still count as one viewer each.
+    rows = (
+        ListingView.objects
+        .filter(viewed_on__range=(start, end))
+        .values("listing_id", "viewed_on")
+        .annotate(n=Count("id"))
+        .order_by()
+    )
+    ListingViewDaily.objects.filter(day__range=(start, end)).delete()
+    ListingViewDaily.objects.bulk_create(
+        [ListingViewDaily(listing_id=row["listing_id"], day=row["viewed_on"], unique_viewers=row["n"]) for row in rows],
+        batch_size=1000,
+    )
+
+
+def _first_search_day():
+    first = SearchHistory.objects.order_by("searched_at").values_list("searched_at", flat=True).first()
+    return timezone.localdate(first) if first else None
+
+
+def _first_view_day():
+    return ListingView.objects.order_by("viewed_on").values_list("viewed_on", flat=True).first()
+
+
+# name -> (aggregate(start, end), first day with raw data)
+ROLLUPS = {
+    SEARCH_KEYWORDS: (_rollup_search, _first_search_day),
+    LISTING_VIEWS: (_rollup_views, _first_view_day),
+}
+
+
+def rollup(until=None, since=None):
+    """
+    Aggregate every rollup up to `until` (default: yesterday, the last complete day).
+    `since` forces a rebuild from that day (clamped to the oldest raw event still kept). Returns {name: (first_day, last_day) or None}.
+    """
+    until = until or timezone.localdate() - timedelta(days=1)
+    done = {}
+    for name, (aggregate, first_day) in ROLLUPS.items():
+        checkpoint = RollupCheckpoint.objects.filter(name=name).first()
+        if since is not None:
+            # Days before the oldest raw row were pruned: their rollups must not be wiped
+            oldest = first_day()
+            start = max(since, oldest) if oldest else None
+        elif checkpoint is not None:
+            start = checkpoint.rolled_up_to + timedelta(days=1)
+        else:
+            start = first_day()
+        if start is None or start > until:
+            done[name] = None
+            continue
+
+        day = start
+        while day <= until:
+            step_end = min(day + timedelta(days=DAYS_PER_STEP - 1), until)
+            with transaction.atomic():
+                aggregate(day, step_end)
+                # Never move the checkpoint backwards on a partial rebuild
+                if checkpoint is None or step_end > checkpoint.rolled_up_to:
+                    checkpoint, _ = RollupCheckpoint.objects.update_or_create(
+                        name=name, defaults={"rolled_up_to": step_end}
+                    )
+            day = step_end + timedelta(days=1)
+        done[name] = (start, until)
+    return done
+
+
+def retention_days():
+    return getattr(settings, "ANALYTICS_RAW_RETENTION_DAYS", DEFAULT_RETENTION_DAYS)
+
+
+def _delete_in_chunks(queryset, chunk_size, pause=0):
+    deleted = 0
+    while True:
+        ids = list(queryset.order_by("pk").values_list("pk", flat=True)[:chunk_size])
+        if not ids:
+            return deleted
+        with transaction.atomic():
+            count, _ = queryset.model.objects.filter(pk__in=ids).delete()
+        deleted += count
+        if pause:
+            time.sleep(pause)
+
+
+def prune(days=None, chunk_size=None, pause=0, force=False):
+    """
+    Delete raw SearchHistory/ListingView rows older than `days` (ANALYTICS_RAW_RETENTION_DAYS).
+    Without `force`, the cutoff is clamped to the rollup checkpoints so no un-aggregated day is lost.
+    Returns {name: deleted_rows}.
+    """
+    days = retention_days() if days is None else days
+    chunk_size = chunk_size or getattr(settings, "ANALYTICS_PRUNE_CHUNK_SIZE", DEFAULT_PRUNE_CHUNK_SIZE)
+    cutoff = timezone.localdate() - timedelta(days=days)  # first day that is kept
+
+    checkpoints = dict(RollupCheckpoint.objects.values_list("name", "rolled_up_to"))
+    result = {}
+    for name, model, filter_for in (
+        (SEARCH_KEYWORDS, SearchHistory, lambda day: {"searched_at__lt": _start_of(day)}),
+        (LISTING_VIEWS, ListingView, lambda day: {"viewed_on__lt": day}),
+    ):
+        keep_from = cutoff
+        if not force:
+            rolled_up_to = checkpoints.get(name)
+            if rolled_up_to is None:
+                result[name] = 0
+                continue
+            keep_from = min(cutoff, rolled_up_to + timedelta(days=1))
+        result[name] = _delete_in_chunks(model.objects.filter(**filter_for(keep_from)), chunk_size, pause)
+    return result
@@ -0,0 +1,122 @@
+"""
+Asynchronous SearchHistory logging.
+
+`ListingViewSet.list` / `search` call `get_search_logger().log(user_id, keyword)`, which only
+appends to a bounded in-memory queue. A daemon thread drains it with `bulk_create` in batches of
+ANALYTICS_SEARCH_BATCH_SIZE, every ANALYTICS_SEARCH_FLUSH_INTERVAL seconds or as soon as a full
+batch is waiting. The search request never waits for the analytics table.
+
+When the queue is full (database slow or down) events are shed according to
+ANALYTICS_SEARCH_SHED_POLICY and counted in `dropped`:
+- "drop_newest" — reject the incoming event (default; keeps the oldest backlog);
+- "drop_oldest" — evict the oldest queued event to make room.
+
+settings.ANALYTICS_SEARCH_LOG: "async" (default) or "sync" (insert inline; tests).
+Note: `searched_at` is auto_now_add, so it records the flush time (at most one interval late).
+"""
+import atexit
+import logging
+import threading
+from collections import deque
+
+from django.conf import settings
+
+from .batching import BackgroundFlusher
+from .models import SearchHistory
+from .trending import get_trending
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_SIZE = 10000
+DEFAULT_BATCH_SIZE = 200
+DEFAULT_FLUSH_INTERVAL = 2  # seconds
+KEYWORD_MAX_LENGTH = SearchHistory._meta.get_field("keyword").max_length
+
+
+class SearchLogger(BackgroundFlusher):
+    thread_name = "search-history-logger"
+
+    def __init__(self, queue_size=None, batch_size=None, flush_interval=None, policy=None):
+        super().__init__(
+            flush_interval or getattr(settings, "ANALYTICS_SEARCH_FLUSH_INTERVAL", DEFAULT_FLUSH_INTERVAL)
+        )
+        self.queue_size = queue_size or getattr(settings, "ANALYTICS_SEARCH_QUEUE_SIZE", DEFAULT_QUEUE_SIZE)
+        self.batch_size = batch_size or getattr(settings, "ANALYTICS_SEARCH_BATCH_SIZE", DEFAULT_BATCH_SIZE)
+        self.policy = policy or getattr(settings, "ANALYTICS_SEARCH_SHED_POLICY", "drop_newest")
+        self._queue = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+    @property
+    def is_async(self):
+        return getattr(settings, "ANALYTICS_SEARCH_LOG", "async") == "async"
+
+    def log(self, user_id, keyword):
+        # The trending summary sees every search, even one shed from the queue below
+        get_trending().record(keyword)
+        event = (user_id, keyword[:KEYWORD_MAX_LENGTH])
+        if not self.is_async:
+            self._write([event])
+            return
+
+        with self._lock:
+            if len(self._queue) >= self.queue_size:
+                self.dropped += 1
+                if self.policy != "drop_oldest":
+                    return
+                self._queue.popleft()
+            self._queue.append(event)
+            self.enqueued += 1
+            batch_ready = len(self._queue) >= self.batch_size
+        self._ensure_worker()
+        if batch_ready:
+            self.wake()
+
+    def flush(self):
+        """Drain the queue in batches; returns the number of rows written."""
+        total = 0
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+                if not batch:
+                    return total
+                total += self._write(batch)
+
+    def _write(self, batch):
+        try:
+            SearchHistory.objects.bulk_create(
+                [SearchHistory(user_id=user_id, keyword=keyword) for user_id, keyword in batch]
+            )
+        except Exception:
+            # The batch is lost; count it rather than retrying into a failing database
+            self.failed += len(batch)
+            logger.exception("Failed to write %s search history rows", len(batch))
+            return 0
+        self.written += len(batch)
+        return len(batch)
+
+    def stats(self):
+        with self._lock:
+            queued = len(self._queue)
+        return {
+            "mode": "async" if self.is_async else "sync",
+            "policy": self.policy,
+            "queued": queued,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+
+_logger = SearchLogger()
+atexit.register(_logger.shutdown)
+
+
+def get_search_logger():
+    return _logger
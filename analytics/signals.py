@@ -1,6 +1,7 @@
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.db.models import F
+from django.utils import timezone
 from .models import ListingView
 from listings.models import Listing
 
@@ -8,4 +9,8 @@ from listings.models import Listing
 @receiver(post_save, sender=ListingView)
 def inc_listing_views(sender, instance, created, **kwargs):
     if created:
-        Listing.objects.filter(pk=instance.listing_id).update(views_count=F('views_count') + 1)
+        # updated_at too: views_count is part of the listing representation (ETag)
+        Listing.objects.filter(pk=instance.listing_id).update(
+            views_count=F('views_count') + 1,
+            updated_at=timezone.now(),
+        )
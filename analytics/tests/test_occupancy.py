@@ -0,0 +1,137 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+from freezegun import freeze_time
+from model_bakery import baker
+
+from analytics.models import CityOccupancyMonthly, ListingOccupancyMonthly
+from analytics.occupancy import month_bounds, monthly_nights, parse_month, report
+from bookings.choices import BookingStatus
+from listings.models import Listing
+
+URL = "/api/analytics/occupancy/"
+JAN, FEB, MAR = date(2025, 1, 1), date(2025, 2, 1), date(2025, 3, 1)
+
+
+def o(y, m, d):
+    return date(y, m, d).toordinal()
+
+
+def stay(listing, start, end, status=BookingStatus.CONFIRMED):
+    return baker.make("bookings.Booking", listing=listing, start_date=start, end_date=end, status=status)
+
+
+def listing_in(city, price, created=date(2024, 12, 1)):
+    listing = baker.make("listings.Listing", location_city=city, price=Decimal(price))
+    at = timezone.make_aware(datetime(created.year, created.month, created.day, 12))
+    Listing.objects.filter(pk=listing.pk).update(created_at=at)  # auto_now_add
+    return listing
+
+
+def test_monthly_nights_splits_at_month_ends_and_counts_overlaps_once():
+    bounds = month_bounds(JAN, MAR)
+    assert list(bounds) == [o(2025, 1, 1), o(2025, 2, 1), o(2025, 3, 1), o(2025, 4, 1)]
+    starts = [o(2025, 1, 28), o(2025, 1, 30), o(2025, 2, 10), o(2025, 3, 31)]
+    ends = [o(2025, 2, 3), o(2025, 2, 2), o(2025, 3, 2), o(2025, 4, 1)]
+    # Jan 28..Feb 2 (4 + 2 nights, the second stay is inside the first), Feb 10..Mar 1, Mar 31
+    assert monthly_nights(starts, ends, bounds) == [4, 2 + 19, 1 + 1]
+    assert monthly_nights(starts, ends, bounds, 2, 3) == [0, 19, 1]
+    assert monthly_nights([], [], bounds) == [0, 0, 0]
+
+
+def test_parse_month():
+    assert parse_month("2025-02") == FEB
+    for value in ("2025", "2025-13", "feb-2025"):
+        with pytest.raises(ValueError):
+            parse_month(value)
+
+
+@pytest.mark.django_db
+def test_report_writes_listing_and_city_rollups():
+    kyiv = listing_in("Kyiv", 100)
+    kyiv_idle = listing_in("Kyiv", 50)
+    lviv = listing_in("Lviv", 80)
+    listing_in("Lviv", 80, created=date(2025, 2, 15))  # exists from February on
+
+    stay(kyiv, date(2025, 1, 28), date(2025, 2, 3))
+    stay(kyiv, date(2024, 12, 30), date(2025, 1, 2))  # clipped to the window
+    stay(kyiv, date(2025, 2, 10), date(2025, 2, 12), status=BookingStatus.PENDING)
+    stay(kyiv_idle, date(2025, 1, 5), date(2025, 1, 9), status=BookingStatus.CANCELLED)
+    stay(lviv, date(2025, 2, 27), date(2025, 3, 5))
+
+    result = report(JAN, MAR, chunk_size=2)
+
+    assert result == {"months": 3, "listings": 4, "rows": 4, "cities": 2}
+    rows = {(r.listing_id, r.month): r for r in ListingOccupancyMonthly.objects.all()}
+    assert set(rows) == {(kyiv.pk, JAN), (kyiv.pk, FEB), (lviv.pk, FEB), (lviv.pk, MAR)}
+    jan = rows[(kyiv.pk, JAN)]
+    assert (jan.nights, jan.days, jan.city, jan.revenue) == (5, 31, "Kyiv", Decimal("500.00"))
+    assert jan.occupancy == pytest.approx(5 / 31)
+    assert rows[(lviv.pk, MAR)].nights == 4
+
+    cities = {(c.city, c.month): c for c in CityOccupancyMonthly.objects.all()}
+    kyiv_jan = cities[("Kyiv", JAN)]
+    assert (kyiv_jan.listings, kyiv_jan.nights, kyiv_jan.available_nights) == (2, 5, 62)
+    assert kyiv_jan.revenue == Decimal("500.00")
+    assert cities[("Lviv", JAN)].listings == 1
+    lviv_feb = cities[("Lviv", FEB)]
+    assert (lviv_feb.listings, lviv_feb.nights, lviv_feb.available_nights) == (2, 2, 56)
+
+
+@pytest.mark.django_db
+def test_report_rerun_replaces_its_months_only():
+    listing = listing_in("Kyiv", 100)
+    booking = stay(listing, date(2025, 1, 10), date(2025, 1, 12))
+    report(JAN, FEB)
+    stay(listing, date(2025, 2, 1), date(2025, 2, 4))
+    booking.status = BookingStatus.CANCELLED
+    booking.save()
+
+    report(FEB, FEB, chunk_size=1)
+
+    assert sorted(ListingOccupancyMonthly.objects.values_list("month", "nights")) == [(JAN, 2), (FEB, 3)]
+    assert CityOccupancyMonthly.objects.count() == 2
+
+
+@pytest.mark.django_db
+@freeze_time("2025-03-15 12:00:00")
+def test_occupancy_command_defaults_to_recent_months():
+    listing = listing_in("Kyiv", 100)
+    stay(listing, date(2025, 3, 1), date(2025, 3, 8))
+
+    call_command("occupancy_report", "--from", "2025-02")
+
+    row = ListingOccupancyMonthly.objects.get()
+    assert (row.month, row.nights) == (MAR, 7)
+    assert set(CityOccupancyMonthly.objects.values_list("month", flat=True)) == {FEB, MAR}
+
+
+@pytest.mark.django_db
+def test_occupancy_api_is_admin_only_and_serves_rollups(api_client, user_with_profile):
+    kyiv = listing_in("Kyiv", 100)
+    busy = listing_in("Kyiv", 200)
+    stay(kyiv, date(2025, 1, 1), date(2025, 1, 3))
+    stay(busy, date(2025, 1, 1), date(2025, 1, 11))
+    report(JAN, FEB)
+
+    api_client.force_authenticate(user=user_with_profile(username="landlord", role="landlord"))
+    assert api_client.get(URL).status_code == 403
+
+    api_client.force_authenticate(user=user_with_profile(username="admin", is_staff=True))
+    r = api_client.get(URL, {"from": "2025-01", "to": "2025-02"})
+    assert r.status_code == 200
+    data = r.json()
+    assert (data["by"], data["from"], data["to"]) == ("city", "2025-01", "2025-02")
+    assert [(row["month"], row["nights"], row["available_nights"]) for row in data["results"]] == [
+        ("2025-01", 12, 62), ("2025-02", 0, 56),
+    ]
+
+    r = api_client.get(URL, {"by": "listing", "from": "2025-01", "city": "Kyiv", "to": "2025-01", "limit": 1})
+    assert [(row["listing"], row["nights"]) for row in r.json()["results"]] == [(busy.pk, 10)]
+
+    assert api_client.get(URL, {"from": "2025-1x"}).status_code == 400
+    assert api_client.get(URL, {"by": "district"}).status_code == 400
+    assert api_client.get(URL, {"from": "2025-02", "to": "2025-01"}).status_code == 400
@@ -0,0 +1,130 @@
+from datetime import date
+
+import pytest
+from django.db import OperationalError, connection
+from django.test.utils import CaptureQueriesContext
+from model_bakery import baker
+
+from analytics import recorder as recorder_module
+from analytics.models import ListingView
+from analytics.recorder import ListingViewRecorder
+
+DAY = date(2025, 8, 24)
+
+
+@pytest.fixture
+def buffered(settings, monkeypatch):
+    """A buffered recorder flushed explicitly by the test (no background thread)."""
+    settings.ANALYTICS_VIEW_RECORDER = "buffered"
+    rec = ListingViewRecorder(buffer_size=100)
+    monkeypatch.setattr(rec, "_ensure_worker", lambda: None)
+    return rec
+
+
+@pytest.mark.django_db
+def test_flush_dedupes_and_coalesces_increments(buffered, user_with_profile):
+    u1 = user_with_profile(username="u1")
+    u2 = user_with_profile(username="u2")
+    hot = baker.make("listings.Listing", views_count=10)
+    cold = baker.make("listings.Listing", views_count=0)
+    # u2 already viewed the hot listing today
+    baker.make("analytics.ListingView", user=u2, listing=hot, viewed_on=DAY)
+    hot.refresh_from_db()
+
+    for _ in range(3):
+        buffered.record(u1.pk, hot.pk, DAY)
+    buffered.record(u2.pk, hot.pk, DAY)
+    buffered.record(u1.pk, cold.pk, DAY)
+    assert ListingView.objects.filter(user=u1).count() == 0  # nothing written before the flush
+
+    with CaptureQueriesContext(connection) as ctx:
+        assert buffered.flush() == 2
+    updates = [q for q in ctx.captured_queries if q["sql"].startswith("UPDATE")]
+    assert len(updates) == 1
+
+    hot.refresh_from_db()
+    cold.refresh_from_db()
+    assert hot.views_count == 12
+    assert cold.views_count == 1
+    assert ListingView.objects.filter(user=u1).count() == 2
+
+    # Already flushed keys are skipped without touching the database
+    buffered.record(u1.pk, hot.pk, DAY)
+    assert buffered.flush() == 0
+
+
+@pytest.mark.django_db
+def test_rows_inserted_meanwhile_are_not_counted(user_with_profile, monkeypatch):
+    u1 = user_with_profile(username="u1")
+    u2 = user_with_profile(username="u2")
+    listing = baker.make("listings.Listing", views_count=0)
+    # Another process wrote u2's view after our existence SELECT
+    baker.make("analytics.ListingView", user=u2, listing=listing, viewed_on=DAY)
+    listing.refresh_from_db()
+    before = listing.views_count
+    monkeypatch.setattr(recorder_module, "_existing_keys", lambda events: set())
+
+    assert recorder_module.write_views([(u1.pk, listing.pk, DAY), (u2.pk, listing.pk, DAY)]) == 1
+
+    listing.refresh_from_db()
+    assert listing.views_count == before + 1
+    assert ListingView.objects.filter(listing=listing).count() == 2
+
+
+@pytest.mark.django_db
+def test_failed_flush_requeues_up_to_max_pending(settings, monkeypatch, user_with_profile):
+    settings.ANALYTICS_VIEW_RECORDER = "buffered"
+    rec = ListingViewRecorder(buffer_size=100, max_pending=2)
+    monkeypatch.setattr(rec, "_ensure_worker", lambda: None)
+    user = user_with_profile(username="u1")
+    listings = baker.make("listings.Listing", views_count=0, _quantity=3)
+    for listing in listings:
+        rec.record(user.pk, listing.pk, DAY)
+
+    def broken(*args, **kwargs):
+        raise OperationalError("database is down")
+
+    with monkeypatch.context() as m:
+        m.setattr(recorder_module, "increment_views_count", broken)
+        assert rec.flush() == 0
+    # Rolled back: nothing written, two events kept for the retry, one dropped and counted
+    assert ListingView.objects.count() == 0
+    assert rec.stats()["pending"] == 2
+    assert rec.stats()["failed"] == 1
+
+    assert rec.flush() == 2
+    assert ListingView.objects.count() == 2
+    assert rec.stats() == {"mode": "buffered", "pending": 0, "flushed_rows": 2, "failed": 1}
+
+
+def test_size_threshold_wakes_the_worker(settings, monkeypatch):
+    settings.ANALYTICS_VIEW_RECORDER = "buffered"
+    rec = ListingViewRecorder(buffer_size=2)
+    monkeypatch.setattr(rec, "_ensure_worker", lambda: None)
+    rec.record(1, 1, DAY)
+    assert not rec._wake.is_set()
+    rec.record(1, 2, DAY)
+    assert rec._wake.is_set()
+
+
+def test_shutdown_flushes_pending_events(settings, monkeypatch):
+    settings.ANALYTICS_VIEW_RECORDER = "buffered"
+    written = []
+    monkeypatch.setattr(recorder_module, "write_views", lambda events: written.extend(events) or len(events))
+    rec = ListingViewRecorder(buffer_size=100, flush_interval=60)
+    rec.record(1, 2, DAY)
+    rec.shutdown()
+    assert written == [(1, 2, DAY)]
+
+
+@pytest.mark.django_db
+def test_sync_mode_writes_inline(user_with_profile):
+    user = user_with_profile(username="u1")
+    listing = baker.make("listings.Listing", views_count=0)
+    rec = ListingViewRecorder()
+    rec.record(user.pk, listing.pk, DAY)
+    rec.record(user.pk, listing.pk, DAY)
+
+    assert ListingView.objects.filter(user=user, listing=listing).count() == 1
+    listing.refresh_from_db()
+    assert listing.views_count == 1
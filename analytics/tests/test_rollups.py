@@ -0,0 +1,115 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from freezegun import freeze_time
+from model_bakery import baker
+
+from analytics.models import (
+    ListingView,
+    ListingViewDaily,
+    RollupCheckpoint,
+    SearchHistory,
+    SearchKeywordDaily,
+)
+from analytics.rollups import LISTING_VIEWS, SEARCH_KEYWORDS, prune, rollup
+
+TODAY = date(2025, 9, 10)
+
+
+def search_on(day, keyword, hour=12):
+    sh = baker.make("analytics.SearchHistory", keyword=keyword)
+    at = timezone.make_aware(datetime(day.year, day.month, day.day, hour))
+    SearchHistory.objects.filter(pk=sh.pk).update(searched_at=at)  # auto_now_add
+    return sh
+
+
+@pytest.mark.django_db
+@freeze_time("2025-09-10 10:00:00")
+def test_rollup_aggregates_complete_days_incrementally(user_with_profile):
+    u1 = user_with_profile(username="u1")
+    u2 = user_with_profile(username="u2")
+    listing = baker.make("listings.Listing")
+    d1, d2 = TODAY - timedelta(days=2), TODAY - timedelta(days=1)
+
+    search_on(d1, "Kyiv")
+    search_on(d1, " kyiv ", hour=23)
+    search_on(d2, "lviv")
+    search_on(TODAY, "kyiv")  # today is not complete yet
+    baker.make("analytics.ListingView", user=u1, listing=listing, viewed_on=d1)
+    baker.make("analytics.ListingView", user=u2, listing=listing, viewed_on=d1)
+    baker.make("analytics.ListingView", user=u1, listing=listing, viewed_on=d2)
+
+    assert rollup() == {SEARCH_KEYWORDS: (d1, d2), LISTING_VIEWS: (d1, d2)}
+
+    assert set(SearchKeywordDaily.objects.values_list("keyword", "day", "count")) == {
+        ("kyiv", d1, 2),
+        ("lviv", d2, 1),
+    }
+    assert set(ListingViewDaily.objects.values_list("day", "unique_viewers")) == {(d1, 2), (d2, 1)}
+    assert RollupCheckpoint.objects.get(name=SEARCH_KEYWORDS).rolled_up_to == d2
+
+    # A second run has nothing new to scan
+    with CaptureQueriesContext(connection) as ctx:
+        assert rollup() == {SEARCH_KEYWORDS: None, LISTING_VIEWS: None}
+    assert not any("analytics_searchhistory" in q["sql"] for q in ctx.captured_queries)
+
+    # The next day only the new range is aggregated
+    with freeze_time("2025-09-11 10:00:00"):
+        assert rollup()[SEARCH_KEYWORDS] == (TODAY, TODAY)
+    assert SearchKeywordDaily.objects.get(day=TODAY).count == 1
+    assert SearchKeywordDaily.objects.get(day=d1).count == 2
+
+
+@pytest.mark.django_db
+@freeze_time("2025-09-10 10:00:00")
+def test_rebuild_is_idempotent():
+    d1 = TODAY - timedelta(days=1)
+    search_on(d1, "odesa")
+    rollup()
+    search_on(d1, "odesa")  # late event for an already aggregated day
+    rollup(since=d1)
+    rollup(since=d1)
+    assert SearchKeywordDaily.objects.get(day=d1, keyword="odesa").count == 2
+
+
+@pytest.mark.django_db
+@freeze_time("2025-09-10 10:00:00")
+def test_prune_respects_checkpoint_and_chunks(user_with_profile):
+    u = user_with_profile(username="u1")
+    listing = baker.make("listings.Listing")
+    old = TODAY - timedelta(days=100)
+    for i in range(5):
+        search_on(old, f"old{i}")
+    search_on(TODAY - timedelta(days=1), "recent")
+    baker.make("analytics.ListingView", user=u, listing=listing, viewed_on=old)
+
+    # Nothing is rolled up yet: raw rows are kept
+    assert prune(days=90) == {SEARCH_KEYWORDS: 0, LISTING_VIEWS: 0}
+
+    rollup()
+    with CaptureQueriesContext(connection) as ctx:
+        result = prune(days=90, chunk_size=2)
+    assert result == {SEARCH_KEYWORDS: 5, LISTING_VIEWS: 1}
+    deletes = [q for q in ctx.captured_queries if q["sql"].startswith("DELETE") and "searchhistory" in q["sql"]]
+    assert len(deletes) == 3  # 2 + 2 + 1
+
+    assert list(SearchHistory.objects.values_list("keyword", flat=True)) == ["recent"]
+    assert ListingView.objects.count() == 0
+    # Rollups survive the raw rows, and a rebuild does not wipe pruned days
+    rollup(since=old)
+    assert SearchKeywordDaily.objects.filter(day=old).count() == 5
+
+
+@pytest.mark.django_db
+@freeze_time("2025-09-10 10:00:00")
+def test_commands(capsys):
+    search_on(TODAY - timedelta(days=1), "kyiv")
+    call_command("rollup_analytics")
+    call_command("prune_analytics", "--days", "30")
+    out = capsys.readouterr().out
+    assert "search_keywords: aggregated 2025-09-09 .. 2025-09-09." in out
+    assert "search_keywords: deleted 0 rows older than 30 days." in out
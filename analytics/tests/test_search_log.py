@@ -0,0 +1,111 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from analytics import search_log, trending
+from analytics.models import SearchHistory
+from analytics.search_log import SearchLogger
+from analytics.trending import TrendingKeywords
+
+
+@pytest.fixture
+def async_logger(settings, monkeypatch):
+    """An async logger drained explicitly by the test (no background thread)."""
+    settings.ANALYTICS_SEARCH_LOG = "async"
+    # A private trending summary, so its local deltas don't leak into other tests
+    tracker = TrendingKeywords()
+    monkeypatch.setattr(tracker, "_ensure_worker", lambda: None)
+    monkeypatch.setattr(trending, "_trending", tracker)
+
+    def make(**kwargs):
+        logger = SearchLogger(**kwargs)
+        monkeypatch.setattr(logger, "_ensure_worker", lambda: None)
+        return logger
+
+    return make
+
+
+@pytest.mark.django_db
+def test_flush_writes_in_batches(async_logger, user_with_profile):
+    u = user_with_profile(username="searcher")
+    logger = async_logger(batch_size=2)
+    for kw in ("kyiv", "lviv", "odesa"):
+        logger.log(u.pk, kw)
+    logger.log(None, "x" * 300)
+    assert SearchHistory.objects.count() == 0  # nothing written before the flush
+
+    with CaptureQueriesContext(connection) as ctx:
+        assert logger.flush() == 4
+    inserts = [q for q in ctx.captured_queries if q["sql"].startswith("INSERT")]
+    assert len(inserts) == 2
+
+    assert set(SearchHistory.objects.values_list("keyword", flat=True)) == {"kyiv", "lviv", "odesa", "x" * 255}
+    assert logger.stats()["written"] == 4
+    assert logger.stats()["queued"] == 0
+
+
+def test_full_queue_drops_newest(async_logger):
+    logger = async_logger(queue_size=2, batch_size=10)
+    for kw in ("a", "b", "c"):
+        logger.log(None, kw)
+    assert list(logger._queue) == [(None, "a"), (None, "b")]
+    assert logger.stats()["dropped"] == 1
+    assert logger.stats()["enqueued"] == 2
+
+
+def test_full_queue_drops_oldest(async_logger):
+    logger = async_logger(queue_size=2, batch_size=10, policy="drop_oldest")
+    for kw in ("a", "b", "c"):
+        logger.log(None, kw)
+    assert list(logger._queue) == [(None, "b"), (None, "c")]
+    assert logger.stats()["dropped"] == 1
+
+
+def test_full_batch_wakes_the_writer(async_logger):
+    logger = async_logger(batch_size=2)
+    logger.log(None, "a")
+    assert not logger._wake.is_set()
+    logger.log(None, "b")
+    assert logger._wake.is_set()
+
+
+@pytest.mark.django_db
+def test_failed_batch_is_counted(async_logger, monkeypatch):
+    logger = async_logger()
+    logger.log(None, "a")
+
+    def boom(*args, **kwargs):
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(SearchHistory.objects, "bulk_create", boom)
+    assert logger.flush() == 0
+    assert logger.stats()["failed"] == 1
+
+
+@pytest.mark.django_db
+def test_search_request_only_enqueues(api_client, async_logger, monkeypatch):
+    logger = async_logger()
+    monkeypatch.setattr(search_log, "_logger", logger)
+
+    r = api_client.get("/api/listings/listings/?search=kyiv")
+    assert r.status_code == 200
+    assert SearchHistory.objects.count() == 0
+    assert list(logger._queue) == [(None, "kyiv")]
+
+    logger.flush()
+    assert SearchHistory.objects.filter(keyword="kyiv", user__isnull=True).exists()
+
+
+@pytest.mark.django_db
+def test_pipeline_stats_admin_only(api_client, user_with_profile):
+    url = reverse("pipeline-stats")
+    api_client.force_authenticate(user=user_with_profile(username="plain"))
+    assert api_client.get(url).status_code == 403
+
+    admin = user_with_profile(username="admin", is_staff=True)
+    api_client.force_authenticate(user=admin)
+    r = api_client.get(url)
+    assert r.status_code == 200
+    assert set(r.data) == {"listing_views", "search_history", "unique_viewers", "booking_expiry"}
+    assert r.data["search_history"]["mode"] == "sync"
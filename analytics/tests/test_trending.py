@@ -0,0 +1,86 @@
+import pytest
+from django.urls import reverse
+
+from analytics.models import TrendingSketch
+from analytics.trending import SpaceSaving, TrendingKeywords
+
+NOW = 1_750_000_000.0
+HOUR = 3600
+
+
+def test_space_saving_keeps_heavy_hitters_with_bounded_error():
+    sketch = SpaceSaving(capacity=5, tau=10 ** 12, landmark=NOW)
+    stream = ["kyiv"] * 50 + ["lviv"] * 30 + [f"rare{i}" for i in range(40)] + ["kyiv"] * 10
+    for key in stream:
+        sketch.offer(key, at=NOW)
+
+    assert len(sketch.counters) == 5
+    top = sketch.top(2, now=NOW)
+    assert [key for key, _, _ in top] == ["kyiv", "lviv"]
+    for key, count, error in top:
+        true = stream.count(key)
+        # Space-Saving never under-counts, and over-counts by at most `error`
+        assert true <= round(count, 6) <= true + error
+
+
+def test_decay_favours_recent_searches():
+    sketch = SpaceSaving(capacity=10, tau=HOUR, landmark=NOW)
+    for _ in range(10):
+        sketch.offer("old", at=NOW)
+    for _ in range(4):
+        sketch.offer("new", at=NOW + 3 * HOUR)
+
+    top = sketch.top(2, now=NOW + 3 * HOUR)
+    assert [key for key, _, _ in top] == ["new", "old"]
+    assert top[0][1] == pytest.approx(4)
+    assert top[1][1] == pytest.approx(10 * 2.718281828 ** -3)
+
+
+def test_merge_aligns_landmarks_and_trims():
+    a = SpaceSaving(capacity=2, tau=HOUR, landmark=NOW)
+    b = SpaceSaving(capacity=2, tau=HOUR, landmark=NOW + HOUR)
+    a.offer("kyiv", at=NOW + HOUR)
+    a.offer("odesa", at=NOW + HOUR)
+    b.offer("kyiv", at=NOW + HOUR)
+    b.offer("lviv", at=NOW + HOUR)
+    b.offer("lviv", at=NOW + HOUR)
+
+    a.merge(b)
+    assert a.landmark == NOW + HOUR
+    assert [(key, round(count, 6)) for key, count, _ in a.top(5, now=NOW + HOUR)] == [("kyiv", 2), ("lviv", 2)]
+
+
+@pytest.mark.django_db
+def test_checkpoint_survives_restart(settings, monkeypatch):
+    settings.ANALYTICS_SEARCH_LOG = "async"
+    first = TrendingKeywords(capacity=10)
+    monkeypatch.setattr(first, "_ensure_worker", lambda: None)
+    for keyword in ("Kyiv", "kyiv ", "lviv"):
+        first.record(keyword)
+    assert not TrendingSketch.objects.exists()  # nothing stored before the checkpoint
+    assert first.top("day")[0][0] == "kyiv"  # but visible locally
+
+    assert first.flush() == 3
+    assert TrendingSketch.objects.count() == 3
+
+    restarted = TrendingKeywords(capacity=10)
+    assert [(key, round(score)) for key, score, _ in restarted.top("week")] == [("kyiv", 2), ("lviv", 1)]
+
+
+@pytest.mark.django_db
+def test_trending_endpoint_fed_by_search_logging(api_client):
+    for q in ("kyiv", "kyiv", "lviv"):
+        assert api_client.get("/api/listings/listings/", {"search": q}).status_code == 200
+    api_client.get("/api/listings/listings/search/", {"q": "kyiv"})
+
+    r = api_client.get(reverse("trending-keywords"), {"window": "hour", "limit": 1})
+    assert r.status_code == 200
+    assert r.data["window"] == "hour"
+    assert [row["keyword"] for row in r.data["results"]] == ["kyiv"]
+    assert r.data["results"][0]["score"] == pytest.approx(3, rel=0.01)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("params", [{"window": "year"}, {"limit": "0"}, {"limit": "x"}])
+def test_trending_endpoint_validates_params(api_client, params):
+    assert api_client.get(reverse("trending-keywords"), params).status_code == 400
@@ -0,0 +1,107 @@
+from datetime import date, timedelta
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from model_bakery import baker
+
+from analytics.hll import HyperLogLog
+from analytics.models import ListingViewSketch
+from analytics.uniques import UniqueViewerRecorder, merge_sketches, unique_viewers
+
+DAY = date(2025, 9, 1)
+
+
+def test_hll_estimate_and_merge():
+    a = HyperLogLog().update(range(0, 6000))
+    b = HyperLogLog().update(range(3000, 9000))
+    assert abs(a.count() - 6000) / 6000 < 0.05
+    # Union: register-wise max, duplicates are not double counted
+    assert abs(a.merge(b).count() - 9000) / 9000 < 0.05
+    assert HyperLogLog().count() == 0
+    assert HyperLogLog().update(["x", "y", "x"]).count() == 2
+
+
+def test_hll_serialization_is_compact():
+    sparse = HyperLogLog().update(range(20))
+    data = sparse.to_bytes()
+    assert len(data) < 200  # vs 4096 raw registers
+    assert HyperLogLog.from_bytes(data).registers == sparse.registers
+    with pytest.raises(ValueError):
+        HyperLogLog(precision=10).merge(sparse)
+
+
+@pytest.mark.django_db
+def test_buffered_recorder_merges_into_daily_rows(settings, monkeypatch):
+    settings.ANALYTICS_VIEW_RECORDER = "buffered"
+    listing = baker.make("listings.Listing")
+    rec = UniqueViewerRecorder()
+    monkeypatch.setattr(rec, "_ensure_worker", lambda: None)
+
+    for visitor in ("u:1", "u:2", "a:x", "u:1"):
+        rec.record(listing.pk, DAY, visitor)
+    rec.record(listing.pk, DAY + timedelta(days=1), "u:1")
+    assert not ListingViewSketch.objects.exists()
+
+    assert rec.flush() == 2
+    rec.record(listing.pk, DAY, "u:3")
+    rec.flush()
+
+    assert ListingViewSketch.objects.count() == 2
+    assert unique_viewers(listing.pk, DAY, DAY) == 4
+    assert unique_viewers(listing.pk, DAY, DAY + timedelta(days=1)) == 4  # u:1 counted once
+    assert unique_viewers(listing.pk, DAY + timedelta(days=1), DAY + timedelta(days=5)) == 1
+
+
+@pytest.mark.django_db
+def test_merge_is_idempotent():
+    listing = baker.make("listings.Listing")
+    sketch = HyperLogLog().update(["u:1", "u:2"])
+    merge_sketches({(listing.pk, DAY): sketch})
+    merge_sketches({(listing.pk, DAY): sketch})
+    assert unique_viewers(listing.pk, DAY, DAY) == 2
+
+
+@pytest.mark.django_db
+def test_retrieve_counts_anonymous_and_authenticated_visitors(api_client, user_with_profile):
+    listing = baker.make("listings.Listing", status="available")
+    url = f"/api/listings/listings/{listing.pk}/"
+
+    api_client.get(url, REMOTE_ADDR="10.0.0.1")
+    api_client.get(url, REMOTE_ADDR="10.0.0.1")  # same client, served from the cache
+    api_client.get(url, REMOTE_ADDR="10.0.0.2")
+    api_client.force_authenticate(user=user_with_profile(username="viewer"))
+    api_client.get(url)
+
+    today = ListingViewSketch.objects.get(listing=listing).day
+    assert unique_viewers(listing.pk, today, today) == 3
+
+
+@pytest.mark.django_db
+def test_unique_viewers_endpoint_owner_only(api_client, user_with_profile):
+    owner = user_with_profile(username="owner", role="landlord")
+    listing = baker.make("listings.Listing", landlord=owner)
+    merge_sketches({(listing.pk, DAY): HyperLogLog().update(["u:1", "u:2"])})
+    url = reverse("unique-viewers")
+    params = {"listing": listing.pk, "from": "2025-08-25", "to": "2025-09-01"}
+
+    api_client.force_authenticate(user=user_with_profile(username="other"))
+    assert api_client.get(url, params).status_code == 403
+
+    api_client.force_authenticate(user=owner)
+    r = api_client.get(url, params)
+    assert r.status_code == 200
+    assert r.data["unique_viewers"] == 2
+    assert api_client.get(url, {**params, "from": "2025-09-02"}).status_code == 400
+    assert api_client.get(url, {"listing": "x"}).status_code == 400
+    invalid = api_client.get(url, {**params, "to": "2026-02-30"})
+    assert invalid.status_code == 400
+    assert "to" in invalid.data
+
+
+@pytest.mark.django_db
+def test_benchmark_command(capsys):
+    call_command("benchmark_unique_viewers", "--users", "200", "--days", "3", "--views-per-day", "50")
+    out = capsys.readouterr().out
+    assert "estimated uniques" in out
+    assert not ListingViewSketch.objects.exists()  # synthetic data rolled back
@@ -0,0 +1,183 @@
+"""
+Trending search keywords (GET /api/analytics/trending-keywords/).
+
+Instead of `GROUP BY keyword ORDER BY count` over SearchHistory, every logged search is offered
+to a Space-Saving heavy-hitters summary per window ("hour", "day", "week"):
+- at most ANALYTICS_TRENDING_CAPACITY keywords are tracked; a new keyword evicts the smallest
+  counter and inherits its count as the over-estimation `error` (the classic Space-Saving bound);
+- counts decay exponentially with the window as time constant (forward decay: an event at `t`
+  weighs exp((t - landmark) / window), so old counts never need rewriting).
+
+Each process keeps a *delta* summary of searches since its last checkpoint. A background thread
+merges the delta into the window's `TrendingSketch` row (SELECT ... FOR UPDATE) every
+ANALYTICS_TRENDING_CHECKPOINT_INTERVAL seconds, so all workers share one summary and a restart
+loses at most one interval, without rescanning SearchHistory. Reads merge the stored row with
+the local delta. With ANALYTICS_SEARCH_LOG="sync" (tests) every search is checkpointed inline.
+"""
+import atexit
+import logging
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.db import transaction
+
+from .batching import BackgroundFlusher
+from .models import TrendingSketch
+
+logger = logging.getLogger(__name__)
+
+# window name -> decay time constant in seconds
+WINDOWS = {"hour": 3600, "day": 86400, "week": 7 * 86400}
+DEFAULT_CAPACITY = 200
+DEFAULT_CHECKPOINT_INTERVAL = 30  # seconds
+# Rescale the counters before exp() gets near the float range
+MAX_EXPONENT = 50
+
+
+def normalize_keyword(keyword):
+    return " ".join(keyword.lower().split())[:255]
+
+
+class SpaceSaving:
+    """
+    Space-Saving summary with forward exponential decay.
+    `counters` maps keyword -> [count, error], both scaled to `landmark`.
+    """
+
+    def __init__(self, capacity, tau, landmark=None, counters=None):
+        self.capacity = capacity
+        self.tau = tau
+        self.landmark = time.time() if landmark is None else landmark
+        self.counters = counters if counters is not None else {}
+
+    def _rescale(self, landmark):
+        factor = math.exp((self.landmark - landmark) / self.tau)
+        for entry in self.counters.values():
+            entry[0] *= factor
+            entry[1] *= factor
+        self.landmark = landmark
+
+    def _weight(self, at):
+        exponent = (at - self.landmark) / self.tau
+        if exponent > MAX_EXPONENT:
+            self._rescale(at)
+            exponent = 0.0
+        return math.exp(exponent)
+
+    def offer(self, key, at=None, weight=1.0):
+        weight *= self._weight(time.time() if at is None else at)
+        entry = self.counters.get(key)
+        if entry is not None:
+            entry[0] += weight
+        elif len(self.counters) < self.capacity:
+            self.counters[key] = [weight, 0.0]
+        else:
+            victim = min(self.counters, key=lambda k: self.counters[k][0])
+            floor = self.counters.pop(victim)[0]
+            self.counters[key] = [floor + weight, floor]
+
+    def merge(self, other):
+        """Add `other` into this summary (counts and errors are summed), then trim to capacity."""
+        landmark = max(self.landmark, other.landmark)
+        if self.landmark != landmark:
+            self._rescale(landmark)
+        factor = math.exp((other.landmark - landmark) / self.tau)
+        for key, (count, error) in other.counters.items():
+            entry = self.counters.setdefault(key, [0.0, 0.0])
+            entry[0] += count * factor
+            entry[1] += error * factor
+        if len(self.counters) > self.capacity:
+            keep = sorted(self.counters.items(), key=lambda item: -item[1][0])[: self.capacity]
+            self.counters = dict(keep)
+
+    def top(self, k, now=None):
+        """[(keyword, decayed_count, decayed_error)] by count, highest first."""
+        now = time.time() if now is None else now
+        factor = math.exp((self.landmark - now) / self.tau)
+        best = sorted(self.counters.items(), key=lambda item: (-item[1][0], item[0]))[:k]
+        return [(key, count * factor, error * factor) for key, (count, error) in best]
+
+    def copy(self):
+        return SpaceSaving(self.capacity, self.tau, self.landmark, {k: list(v) for k, v in self.counters.items()})
+
+
+class TrendingKeywords(BackgroundFlusher):
+    thread_name = "trending-keywords-checkpoint"
+
+    def __init__(self, capacity=None, flush_interval=None):
+        super().__init__(
+            flush_interval
+            or getattr(settings, "ANALYTICS_TRENDING_CHECKPOINT_INTERVAL", DEFAULT_CHECKPOINT_INTERVAL)
+        )
+        self.capacity = capacity or getattr(settings, "ANALYTICS_TRENDING_CAPACITY", DEFAULT_CAPACITY)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._deltas = self._empty_deltas()
+
+    @property
+    def is_async(self):
+        return getattr(settings, "ANALYTICS_SEARCH_LOG", "async") == "async"
+
+    def _empty_deltas(self):
+        return {window: SpaceSaving(self.capacity, tau) for window, tau in WINDOWS.items()}
+
+    def record(self, keyword, at=None):
+        keyword = normalize_keyword(keyword)
+        if not keyword:
+            return
+        at = time.time() if at is None else at
+        with self._lock:
+            for sketch in self._deltas.values():
+                sketch.offer(keyword, at)
+        if self.is_async:
+            self._ensure_worker()
+        else:
+            self.flush()
+
+    def _stored(self, window, row):
+        return SpaceSaving(self.capacity, WINDOWS[window], row.landmark, row.counters)
+
+    def flush(self):
+        """Merge the local deltas into the stored summaries; returns the number of windows written."""
+        with self._flush_lock:
+            with self._lock:
+                deltas, self._deltas = self._deltas, self._empty_deltas()
+            deltas = {window: sketch for window, sketch in deltas.items() if sketch.counters}
+            if not deltas:
+                return 0
+            try:
+                with transaction.atomic():
+                    for window, delta in deltas.items():
+                        row, _ = TrendingSketch.objects.select_for_update().get_or_create(
+                            window=window, defaults={"landmark": delta.landmark, "counters": {}}
+                        )
+                        stored = self._stored(window, row)
+                        stored.merge(delta)
+                        row.landmark, row.counters = stored.landmark, stored.counters
+                        row.save(update_fields=["landmark", "counters", "updated_at"])
+            except Exception:
+                # Put the deltas back so the next checkpoint retries them
+                with self._lock:
+                    for window, delta in deltas.items():
+                        delta.merge(self._deltas[window])
+                        self._deltas[window] = delta
+                logger.exception("Failed to checkpoint trending keywords")
+                return 0
+            return len(deltas)
+
+    def top(self, window, k=10):
+        row = TrendingSketch.objects.filter(window=window).first()
+        sketch = self._stored(window, row) if row else SpaceSaving(self.capacity, WINDOWS[window])
+        with self._lock:
+            sketch.merge(self._deltas[window].copy())
+        return sketch.top(k)
+
+
+_trending = TrendingKeywords()
+atexit.register(_trending.shutdown)
+
+
+def get_trending():
+    return _trending
@@ -1,6 +1,13 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import SearchHistoryViewSet, ListingViewViewSet
+from .views import (
+    ListingViewViewSet,
+    OccupancyView,
+    PipelineStatsView,
+    SearchHistoryViewSet,
+    TrendingKeywordsView,
+    UniqueViewersView,
+)
 
 
 router = DefaultRouter()
@@ -9,5 +16,9 @@ router.register(r'listing-views', ListingViewViewSet, basename='listing view')
 
 
 urlpatterns = [
+    path('pipeline-stats/', PipelineStatsView.as_view(), name='pipeline-stats'),
+    path('trending-keywords/', TrendingKeywordsView.as_view(), name='trending-keywords'),
+    path('unique-viewers/', UniqueViewersView.as_view(), name='unique-viewers'),
+    path('occupancy/', OccupancyView.as_view(), name='occupancy'),
     path('', include(router.urls)),
 ]
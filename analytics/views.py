@@ -1,8 +1,22 @@
+from datetime import timedelta
+
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from rest_framework import viewsets, permissions, status
+from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.response import Response
+from rest_framework.views import APIView
 
-from .models import SearchHistory, ListingView
+from bookings import expiry as booking_expiry
+from listings.models import Listing
+from utils.dates import query_date
+from .models import CityOccupancyMonthly, ListingOccupancyMonthly, SearchHistory, ListingView
+from .occupancy import parse_month
 from .serializers import SearchHistorySerializer, ListingViewSerializer
+from .recorder import get_view_recorder
+from .search_log import get_search_logger
+from .trending import WINDOWS, get_trending
+from .uniques import get_unique_viewers_recorder, unique_viewers
 
 
 class SearchHistoryViewSet(viewsets.ModelViewSet):
@@ -53,3 +67,135 @@ class ListingViewViewSet(viewsets.ModelViewSet):
             status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
             headers=self.get_success_headers(out) if created else {},
         )
+
+
+class PipelineStatsView(APIView):
+    """
+    Admin-only counters of the in-process analytics writers
+    (listing view recorder and search history logger): queue depth, written/dropped/failed,
+    plus the metrics of the pending-booking expiry sweeper.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response({
+            "listing_views": get_view_recorder().stats(),
+            "search_history": get_search_logger().stats(),
+            "unique_viewers": get_unique_viewers_recorder().stats(),
+            "booking_expiry": booking_expiry.stats(),
+        })
+
+
+class TrendingKeywordsView(APIView):
+    """
+    Popular searches: /api/analytics/trending-keywords/?window=day&limit=10
+    window: hour | day | week (exponentially decayed counts); limit: 1..50.
+    """
+    permission_classes = [permissions.AllowAny]
+    max_limit = 50
+
+    def get(self, request):
+        window = request.query_params.get("window", "day")
+        if window not in WINDOWS:
+            raise ValidationError({"window": f"Must be one of: {', '.join(WINDOWS)}."})
+        try:
+            limit = int(request.query_params.get("limit", 10))
+        except ValueError:
+            raise ValidationError({"limit": "Must be an integer."})
+        if not 1 <= limit <= self.max_limit:
+            raise ValidationError({"limit": f"Must be between 1 and {self.max_limit}."})
+
+        results = [
+            {"keyword": keyword, "score": round(score, 3)}
+            for keyword, score, _ in get_trending().top(window, limit)
+        ]
+        return Response({"window": window, "results": results})
+
+
+class UniqueViewersView(APIView):
+    """
+    Approximate distinct visitors of a listing (users + anonymous clients):
+    /api/analytics/unique-viewers/?listing=<id>&from=YYYY-MM-DD&to=YYYY-MM-DD
+    Defaults to the last 30 days. Only the listing's landlord or staff.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    default_days = 30
+
+    def get(self, request):
+        listing_id = request.query_params.get("listing")
+        if not listing_id or not listing_id.isdigit():
+            raise ValidationError({"listing": "A listing id is required."})
+        listing = get_object_or_404(Listing.objects.only("id", "landlord_id"), pk=listing_id)
+        if listing.landlord_id != request.user.pk and not request.user.is_staff:
+            raise PermissionDenied("Only the landlord can see listing statistics.")
+
+        today = timezone.localdate()
+        end = query_date(request, "to", today)
+        start = query_date(request, "from", end - timedelta(days=self.default_days - 1))
+        if start > end:
+            raise ValidationError({"from": "Must not be after 'to'."})
+        return Response({
+            "listing": listing.pk,
+            "from": start,
+            "to": end,
+            "unique_viewers": unique_viewers(listing.pk, start, end),
+        })
+
+
+class OccupancyView(APIView):
+    """
+    Admin-only monthly occupancy and revenue, from the rollups of `manage.py occupancy_report`:
+    /api/analytics/occupancy/?by=city|listing&from=YYYY-MM&to=YYYY-MM&city=<name>&limit=50
+    Months default to the current one; by=listing is ordered by occupancy (limit: 1..500).
+    """
+    permission_classes = [permissions.IsAdminUser]
+    max_limit = 500
+
+    def _month(self, name, default):
+        value = self.request.query_params.get(name)
+        if not value:
+            return default
+        try:
+            return parse_month(value)
+        except ValueError:
+            raise ValidationError({name: "Expected YYYY-MM."})
+
+    def get(self, request):
+        by = request.query_params.get("by", "city")
+        if by not in ("city", "listing"):
+            raise ValidationError({"by": "Must be one of: city, listing."})
+        last = self._month("to", timezone.localdate().replace(day=1))
+        first = self._month("from", last)
+        if first > last:
+            raise ValidationError({"from": "Must not be after 'to'."})
+
+        model = CityOccupancyMonthly if by == "city" else ListingOccupancyMonthly
+        qs = model.objects.filter(month__gte=first, month__lte=last)
+        city = request.query_params.get("city")
+        if city:
+            qs = qs.filter(city=city)
+        if by == "city":
+            results = [
+                {
+                    "month": f"{row.month:%Y-%m}", "city": row.city, "listings": row.listings,
+                    "nights": row.nights, "available_nights": row.available_nights,
+                    "occupancy": round(row.occupancy, 4), "revenue": row.revenue,
+                }
+                for row in qs.order_by("month", "-occupancy", "city")
+            ]
+        else:
+            try:
+                limit = int(request.query_params.get("limit", 50))
+            except ValueError:
+                raise ValidationError({"limit": "Must be an integer."})
+            if not 1 <= limit <= self.max_limit:
+                raise ValidationError({"limit": f"Must be between 1 and {self.max_limit}."})
+            results = [
+                {
+                    "month": f"{row.month:%Y-%m}", "listing": row.listing_id, "city": row.city,
+                    "nights": row.nights, "days": row.days,
+                    "occupancy": round(row.occupancy, 4), "revenue": row.revenue,
+                }
+                for row in qs.order_by("-occupancy", "-revenue", "listing_id")[:limit]
+            ]
+        return Response({"by": by, "from": f"{first:%Y-%m}", "to": f"{last:%Y-%m}", "results": results})
@@ -0,0 +1,102 @@
+"""
+Overlap checks for bookings.
+
+Stays are half-open [start_date, end_date): two stays overlap when a.start < b.end and
+a.end > b.start, so a check-out day can be the next check-in day. Only PENDING/CONFIRMED
+bookings (BUSY_STATUSES) make dates unavailable.
+
+- `overlapping(listing_id, start, end)` is the single-check query (BookingSerializer.validate),
+  answered from the covering Booking(listing, end_date, start_date, status) index
+  `booking_overlap_idx`: equality on listing, range on end_date > start (a listing's past
+  stays, usually most of its rows, are skipped), start_date and status are checked in the
+  index entry, so no table row is touched.
+- `IntervalIndex` is for callers that check many stays at once (bulk creation, imports): the
+  busy intervals of the listings involved are loaded with one query, after which every check
+  is a binary search in memory (sorted starts + running maximum of ends) instead of a round
+  trip. `add()` registers an accepted stay, so the following checks of the batch see it.
+"""
+from bisect import bisect_left
+from collections import defaultdict
+
+from django.db.models import Q
+
+from .choices import BookingStatus
+from .models import Booking
+
+BUSY_STATUSES = (BookingStatus.PENDING, BookingStatus.CONFIRMED)
+
+
+def overlapping(listing_id, start, end, exclude_pk=None):
+    """Busy bookings of a listing overlapping [start, end)."""
+    qs = Booking.objects.filter(
+        listing_id=listing_id,
+        status__in=BUSY_STATUSES,
+        start_date__lt=end,  # overlap if (a.start < b.end) AND
+        end_date__gt=start,  #            (a.end > b.start)
+    )
+    if exclude_pk is not None:
+        qs = qs.exclude(pk=exclude_pk)
+    return qs
+
+
+def is_available(listing_id, start, end, exclude_pk=None):
+    return not overlapping(listing_id, start, end, exclude_pk).exists()
+
+
+class IntervalIndex:
+    """
+    Busy intervals per listing, sorted by start. For each listing `_ends_max[i]` is the largest
+    end among the first i + 1 intervals, so "does any interval overlap [start, end)?" is:
+    take the intervals starting before `end` (bisect), and check whether the largest of their
+    ends is after `start`. Intervals may overlap each other (e.g. concurrent legacy rows).
+    """
+
+    def __init__(self, intervals=()):
+        """`intervals`: iterable of (listing_id, start, end)."""
+        self._intervals = defaultdict(list)
+        for listing_id, start, end in intervals:
+            self._intervals[listing_id].append((start, end))
+        self._starts = {}
+        self._ends_max = {}
+        for listing_id in self._intervals:
+            self._intervals[listing_id].sort()
+            self._rebuild(listing_id, 0)
+
+    @classmethod
+    def load(cls, spans, statuses=BUSY_STATUSES):
+        """
+        One query for {listing_id: (start, end)}: the bookings with `statuses` overlapping each
+        listing's span. Checks must then stay inside the loaded span of their listing.
+        """
+        condition = Q()
+        for listing_id, (start, end) in spans.items():
+            condition |= Q(listing_id=listing_id, start_date__lt=end, end_date__gt=start)
+        if not condition:
+            return cls()
+        rows = Booking.objects.filter(condition, status__in=statuses).values_list("listing_id", "start_date", "end_date")
+        return cls(rows)
+
+    def _rebuild(self, listing_id, position):
+        intervals = self._intervals[listing_id]
+        starts = self._starts.setdefault(listing_id, [])
+        ends_max = self._ends_max.setdefault(listing_id, [])
+        del starts[position:], ends_max[position:]
+        for start, end in intervals[position:]:
+            starts.append(start)
+            ends_max.append(max(end, ends_max[-1]) if ends_max else end)
+
+    def overlaps(self, listing_id, start, end):
+        starts = self._starts.get(listing_id)
+        if not starts:
+            return False
+        before_end = bisect_left(starts, end)  # intervals with interval.start < end
+        return before_end > 0 and self._ends_max[listing_id][before_end - 1] > start
+
+    def add(self, listing_id, start, end):
+        intervals = self._intervals[listing_id]
+        position = bisect_left(intervals, (start, end))
+        intervals.insert(position, (start, end))
+        self._rebuild(listing_id, position)
+
+    def __len__(self):
+        return sum(len(intervals) for intervals in self._intervals.values())
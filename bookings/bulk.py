@@ -0,0 +1,135 @@
+"""
+Bulk booking creation (POST /api/bookings/bulk/).
+
+Instead of one transaction + listing lock + overlap `exists()` per booking:
+1. every item is validated without queries (BookingBulkItemSerializer);
+2. all affected listings are locked with one SELECT ... FOR UPDATE, in primary-key order,
+   so two concurrent batches always lock in the same order and cannot deadlock;
+3. one query loads the bookings that could clash (per listing, over the batch's date span);
+4. items are checked in memory (bookings.availability.IntervalIndex) against those bookings
+   and against the items accepted before them in the same batch (same overlap rule as
+   BookingSerializer.validate);
+5. the accepted items are inserted with one bulk_create.
+Each item gets its own result; a rejected item never blocks the others.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+
+from listings import cache as listing_cache
+from listings.choices import ListingStatus
+from listings.models import Listing
+from . import concurrency
+from .availability import BUSY_STATUSES, IntervalIndex
+from .models import Booking, BookingNight
+from .serializers import BookingBulkItemSerializer, BookingSerializer
+
+
+def _error(index, message):
+    return {"index": index, "status": "error", "errors": message}
+
+
+def create_bookings(tenant, items):
+    """
+    Create PENDING bookings for `tenant`. Returns (results, created_count) with results in
+    request order: {"index", "status": "created", "booking": {...}} or {"index", "status": "error", "errors"}.
+    """
+    results = [None] * len(items)
+    valid = []
+    for index, item in enumerate(items):
+        serializer = BookingBulkItemSerializer(data=item)
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            results[index] = _error(index, serializer.errors)
+
+    created = []
+    if valid:
+        try:
+            with transaction.atomic():
+                created = _create_locked(tenant, valid, results)
+        except IntegrityError:
+            # BOOKING_CONCURRENCY="claims": a single booking claimed one of the nights meanwhile
+            for index, _ in valid:
+                if results[index] is None:
+                    results[index] = _error(index, {"non_field_errors": [
+                        "A concurrent booking took some of these dates; nothing was created, please retry."
+                    ]})
+
+    for index, booking in created:
+        results[index] = {"index": index, "status": "created", "booking": BookingSerializer(booking).data}
+    return results, len(created)
+
+
+def _create_locked(tenant, valid, results):
+    listing_ids = sorted({data["listing"] for _, data in valid})
+    listings = {
+        listing.pk: listing
+        for listing in Listing.objects.select_for_update().filter(pk__in=listing_ids).order_by("pk")
+        .only("id", "landlord_id", "status")
+    }
+
+    # One query for everything that could clash: per listing, bookings overlapping the span
+    # of the batch's stays for it (any status: the exact-dates unique constraint ignores status)
+    spans = {}
+    for _, data in valid:
+        start, end = data["start_date"], data["end_date"]
+        span = spans.get(data["listing"])
+        spans[data["listing"]] = (min(span[0], start), max(span[1], end)) if span else (start, end)
+    clash = Q()
+    for listing_id, (start, end) in spans.items():
+        if listing_id in listings:
+            clash |= Q(listing_id=listing_id, start_date__lt=end, end_date__gt=start)
+    busy = []
+    taken = set()
+    if clash:
+        for listing_id, start, end, status in Booking.objects.filter(clash).values_list(
+            "listing_id", "start_date", "end_date", "status"
+        ):
+            taken.add((listing_id, start, end))
+            if status in BUSY_STATUSES:
+                busy.append((listing_id, start, end))
+    busy = IntervalIndex(busy)
+
+    accepted = []
+    for index, data in valid:
+        listing = listings.get(data["listing"])
+        start, end = data["start_date"], data["end_date"]
+        if listing is None:
+            results[index] = _error(index, {"listing": ["Listing not found."]})
+        elif listing.status != ListingStatus.AVAILABLE:
+            results[index] = _error(index, {"listing": ["This listing is currently not available for booking."]})
+        elif listing.landlord_id == tenant.pk:
+            results[index] = _error(index, {"listing": ["You cannot book your own listing."]})
+        elif busy.overlaps(listing.pk, start, end) or (listing.pk, start, end) in taken:
+            results[index] = _error(
+                index, {"non_field_errors": ["This period overlaps with an existing booking or reservation for the listing."]}
+            )
+        else:
+            # New bookings are PENDING, i.e. busy for the items that follow
+            busy.add(listing.pk, start, end)
+            taken.add((listing.pk, start, end))
+            accepted.append((index, Booking(listing=listing, tenant=tenant, start_date=start, end_date=end)))
+
+    if not accepted:
+        return []
+    bookings = Booking.objects.bulk_create([booking for _, booking in accepted])
+    if any(booking.pk is None for booking in bookings):
+        # Backends that don't return ids from bulk INSERT (MySQL): reload by the unique key
+        _reload(bookings)
+    if concurrency.uses_claims():
+        BookingNight.objects.bulk_create(concurrency.claims_for(bookings))
+    listing_cache.bookings_changed((b.listing_id, b.listing.landlord_id) for _, b in accepted)
+    return [(index, booking) for (index, _), booking in zip(accepted, bookings)]
+
+
+def _reload(bookings):
+    keys = {(b.listing_id, b.start_date, b.end_date): b for b in bookings}
+    rows = Booking.objects.filter(
+        listing_id__in={b.listing_id for b in bookings},
+        start_date__gte=min(b.start_date for b in bookings),
+        start_date__lte=max(b.start_date for b in bookings),
+    ).values_list("pk", "listing_id", "start_date", "end_date", "created_at", "updated_at")
+    for pk, listing_id, start, end, created_at, updated_at in rows:
+        booking = keys.get((listing_id, start, end))
+        if booking is not None:
+            booking.pk, booking.created_at, booking.updated_at = pk, created_at, updated_at
@@ -6,4 +6,5 @@ class BookingStatus(models.TextChoices):
     PENDING = 'pending', 'Pending'
     CONFIRMED = 'confirmed', 'Confirmed'
     CANCELLED = 'cancelled', 'Cancelled'
+    EXPIRED = 'expired', 'Expired'  # PENDING left unanswered for BOOKING_PENDING_TTL_HOURS
 
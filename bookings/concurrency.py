@@ -0,0 +1,167 @@
+"""
+How concurrent booking writes (create / update through BookingViewSet, bulk creation) are
+kept from double-booking a listing. Selected with BOOKING_CONCURRENCY:
+
+- "lock" (default): the listing row is locked (SELECT ... FOR UPDATE) while the overlap is
+  re-checked and the booking saved. Simple, but every booking attempt on a listing waits for
+  the previous one, whatever its dates.
+- "claims": no listing lock. Each PENDING/CONFIRMED booking owns one BookingNight row per
+  night, unique on (listing, night), inserted in the same transaction as the booking.
+  Bookings for different nights of the same listing proceed in parallel; of two overlapping
+  ones the database lets only the first commit, the second fails with IntegrityError and is
+  answered with the usual overlap error. Claims are released when a booking leaves the busy
+  statuses (transitions, expiry) and rebuilt by `manage.py sync_booking_claims` (run it when
+  switching to this mode).
+- "retry": no lock and no claims: the overlap check and the insert run in one transaction
+  which is retried (BOOKING_CONCURRENCY_RETRIES times, with jittered backoff) when the
+  database reports a serialization conflict. Only sound where transactions are serializable,
+  i.e. SQLite (one writer at a time: a conflicting writer gets "database is locked").
+- "optimistic": "retry" on SQLite, "claims" elsewhere (MySQL).
+"""
+import random
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, OperationalError, connection, transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from listings.models import Listing
+from .availability import BUSY_STATUSES, is_available
+from .models import Booking, BookingNight
+
+LOCK = "lock"
+CLAIMS = "claims"
+RETRY = "retry"
+OPTIMISTIC = "optimistic"
+
+DEFAULT_RETRIES = 25
+MAX_BACKOFF = 0.05  # seconds
+OVERLAP_MESSAGE = "This period overlaps with an existing booking or reservation for the listing."
+
+
+def strategy():
+    mode = getattr(settings, "BOOKING_CONCURRENCY", LOCK)
+    if mode == OPTIMISTIC:
+        return RETRY if connection.vendor == "sqlite" else CLAIMS
+    return mode
+
+
+def uses_claims():
+    return strategy() == CLAIMS
+
+
+def nights(start, end):
+    return [start + timedelta(days=i) for i in range((end - start).days)]
+
+
+def claims_for(bookings):
+    """Unsaved BookingNight rows of busy `bookings`."""
+    return [
+        BookingNight(listing_id=b.listing_id, night=night, booking_id=b.pk)
+        for b in bookings
+        if b.status in BUSY_STATUSES
+        for night in nights(b.start_date, b.end_date)
+    ]
+
+
+def release(booking_ids):
+    """
+    Drop the claims of those `booking_ids` that are no longer busy (no-op unless claims are in
+    use); a booking that turned out busy after all (lost race) keeps its nights.
+    """
+    if uses_claims() and booking_ids:
+        BookingNight.objects.filter(booking_id__in=booking_ids).exclude(booking__status__in=BUSY_STATUSES).delete()
+
+
+def sync_claims(batch_size=1000):
+    """
+    Make BookingNight match the busy bookings from today on: drop claims of past nights and of
+    bookings that are no longer busy, add the missing ones. Overlapping legacy bookings can't
+    both claim a night; the number of such nights is reported as `conflicts`.
+    """
+    today = timezone.localdate()
+    stale = BookingNight.objects.filter(night__lt=today).delete()[0]
+    stale += BookingNight.objects.exclude(booking__status__in=BUSY_STATUSES).delete()[0]
+    before = BookingNight.objects.count()
+    expected = 0
+    batch = []
+    bookings = Booking.objects.filter(status__in=BUSY_STATUSES, end_date__gt=today).only(
+        "pk", "listing_id", "start_date", "end_date", "status"
+    )
+    for booking in bookings.iterator(chunk_size=batch_size):
+        for claim in claims_for([booking]):
+            if claim.night >= today:
+                batch.append(claim)
+        if len(batch) >= batch_size:
+            expected += len(batch)
+            BookingNight.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    expected += len(batch)
+    BookingNight.objects.bulk_create(batch, ignore_conflicts=True)
+    total = BookingNight.objects.count()
+    return {"removed": stale, "added": total - before, "claimed": total, "conflicts": expected - total}
+
+
+def _overlap_error():
+    return ValidationError({"non_field_errors": [OVERLAP_MESSAGE]})
+
+
+def _check_available(serializer, listing):
+    data = serializer.validated_data
+    instance = serializer.instance
+    start = data.get("start_date") or instance.start_date
+    end = data.get("end_date") or instance.end_date
+    if not is_available(listing.pk, start, end, exclude_pk=instance.pk if instance else None):
+        raise _overlap_error()
+
+
+def _listing(serializer):
+    return serializer.validated_data.get("listing") or serializer.instance.listing
+
+
+def _save_locked(serializer, **kwargs):
+    listing = _listing(serializer)
+    with transaction.atomic():
+        Listing.objects.select_for_update().get(pk=listing.pk)
+        # serializer.validate() ran before the lock was taken: check again under it
+        _check_available(serializer, listing)
+        return serializer.save(**kwargs)
+
+
+def _save_claimed(serializer, **kwargs):
+    try:
+        with transaction.atomic():
+            booking = serializer.save(**kwargs)
+            BookingNight.objects.filter(booking_id=booking.pk).delete()
+            BookingNight.objects.bulk_create(claims_for([booking]))
+            return booking
+    except IntegrityError:
+        # A night is claimed by a booking committed in the meantime (or the exact dates exist)
+        raise _overlap_error()
+
+
+def _save_retried(serializer, **kwargs):
+    listing = _listing(serializer)
+    creating = serializer.instance is None
+    retries = getattr(settings, "BOOKING_CONCURRENCY_RETRIES", DEFAULT_RETRIES)
+    for attempt in range(retries + 1):
+        try:
+            with transaction.atomic():
+                _check_available(serializer, listing)
+                return serializer.save(**kwargs)
+        except OperationalError:
+            if attempt == retries:
+                raise
+            if creating:
+                serializer.instance = None  # the rolled back INSERT left a pk behind
+            time.sleep(random.uniform(0, min(MAX_BACKOFF, 0.005 * 2 ** attempt)))
+
+
+_SAVERS = {LOCK: _save_locked, CLAIMS: _save_claimed, RETRY: _save_retried}
+
+
+def save_booking(serializer, **kwargs):
+    """`serializer.save(**kwargs)` for a validated BookingSerializer, under the configured strategy."""
+    return _SAVERS[strategy()](serializer, **kwargs)
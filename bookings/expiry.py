@@ -0,0 +1,138 @@
+"""
+Expiry of stale PENDING bookings.
+
+A PENDING booking blocks its dates (overlap checks, availability filter, calendar) until the
+landlord answers. Bookings still PENDING BOOKING_PENDING_TTL_HOURS after creation are moved to
+EXPIRED by `expire_pending()`, run by `manage.py expire_bookings` (once, or `--loop` as a
+scheduler process):
+
+- candidates are read oldest first from the Booking(status, created_at) index, at most
+  BOOKING_EXPIRY_BATCH_SIZE per batch;
+- each batch is one conditional UPDATE (`... WHERE id IN (...) AND status = 'pending' AND
+  created_at < cutoff`), in its own short transaction. A booking confirmed or cancelled in the
+  meantime no longer matches, so the sweep never overrides a real answer;
+- where the database supports it (MySQL 8 / PostgreSQL) candidates are selected with
+  `FOR UPDATE SKIP LOCKED`: sweepers on several nodes take disjoint batches instead of
+  waiting on each other. Elsewhere they may pick the same rows; the conditional UPDATE
+  makes the loser update nothing.
+
+Metrics (last run, total expired, runs) are kept in the default cache so every node reports
+the same numbers; `stats()` adds the current overdue backlog. Exposed in
+/api/analytics/pipeline-stats/ under "booking_expiry".
+"""
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.utils import timezone
+
+from listings import cache as listing_cache
+from . import concurrency
+from .choices import BookingStatus
+from .models import Booking
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PENDING_TTL_HOURS = 72
+DEFAULT_BATCH_SIZE = 500
+
+LAST_RUN_KEY = "bookings:expiry:last_run"
+TOTAL_KEY = "bookings:expiry:expired_total"
+RUNS_KEY = "bookings:expiry:runs"
+
+
+def pending_ttl():
+    """TTL of a PENDING booking, or None when expiry is disabled (BOOKING_PENDING_TTL_HOURS = 0)."""
+    hours = getattr(settings, "BOOKING_PENDING_TTL_HOURS", DEFAULT_PENDING_TTL_HOURS)
+    return timedelta(hours=hours) if hours and hours > 0 else None
+
+
+def overdue(cutoff):
+    return Booking.objects.filter(status=BookingStatus.PENDING, created_at__lt=cutoff)
+
+
+def _expire_batch(cutoff, now, batch_size):
+    """Returns (selected, expired) for one batch."""
+    with transaction.atomic():
+        candidates = overdue(cutoff).order_by("created_at", "pk")
+        if connection.features.has_select_for_update_skip_locked:
+            lock = {"skip_locked": True}
+            if connection.features.has_select_for_update_of:
+                lock["of"] = ("self",)  # the listing row is only read, not locked
+            candidates = candidates.select_for_update(**lock)
+        rows = list(candidates.values_list("pk", "listing_id", "listing__landlord_id")[:batch_size])
+        if not rows:
+            return 0, 0
+        expired = overdue(cutoff).filter(pk__in=[pk for pk, _, _ in rows]).update(
+            status=BookingStatus.EXPIRED, updated_at=now
+        )
+        if expired:
+            concurrency.release([pk for pk, _, _ in rows])
+            # queryset.update() sends no post_save: free the dates in calendars and dashboards
+            listing_cache.bookings_changed((listing_id, landlord_id) for _, listing_id, landlord_id in rows)
+    return len(rows), expired
+
+
+def expire_pending(now=None, batch_size=None, max_batches=None, pause=0):
+    """
+    Expire PENDING bookings older than the TTL. Returns
+    {"expired", "batches", "cutoff", "duration_ms"}; does nothing when expiry is disabled.
+    """
+    ttl = pending_ttl()
+    now = now or timezone.now()
+    result = {"expired": 0, "batches": 0, "cutoff": None, "duration_ms": 0}
+    if ttl is None:
+        return result
+    cutoff = now - ttl
+    batch_size = batch_size or getattr(settings, "BOOKING_EXPIRY_BATCH_SIZE", DEFAULT_BATCH_SIZE)
+    result["cutoff"] = cutoff
+    started = time.perf_counter()
+
+    while max_batches is None or result["batches"] < max_batches:
+        selected, expired = _expire_batch(cutoff, now, batch_size)
+        if not selected:
+            break
+        result["batches"] += 1
+        result["expired"] += expired
+        if selected < batch_size:
+            break
+        if pause:
+            time.sleep(pause)
+
+    result["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    _record(result, now)
+    logger.info(
+        "Expired %s pending bookings older than %s in %s batches (%s ms)",
+        result["expired"], cutoff.isoformat(), result["batches"], result["duration_ms"],
+    )
+    return result
+
+
+def _record(result, now):
+    cache.set(LAST_RUN_KEY, {
+        "at": now.isoformat(),
+        "cutoff": result["cutoff"].isoformat(),
+        "expired": result["expired"],
+        "batches": result["batches"],
+        "duration_ms": result["duration_ms"],
+    }, None)
+    for key, delta in ((TOTAL_KEY, result["expired"]), (RUNS_KEY, 1)):
+        cache.add(key, 0, None)
+        try:
+            cache.incr(key, delta)
+        except ValueError:  # evicted between add() and incr()
+            cache.set(key, delta, None)
+
+
+def stats():
+    ttl = pending_ttl()
+    return {
+        "ttl_hours": ttl.total_seconds() / 3600 if ttl else None,
+        "overdue": overdue(timezone.now() - ttl).count() if ttl else 0,
+        "expired_total": cache.get(TOTAL_KEY, 0),
+        "runs": cache.get(RUNS_KEY, 0),
+        "last_run": cache.get(LAST_RUN_KEY),
+    }
@@ -0,0 +1,107 @@
+import random
+import threading
+import time
+from collections import Counter
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, close_old_connections, connection
+from django.test.utils import override_settings
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from bookings.concurrency import CLAIMS, LOCK, OPTIMISTIC, RETRY, save_booking, strategy
+from bookings.serializers import BookingSerializer
+from listings.choices import ListingStatus
+from listings.models import Listing
+
+
+class Command(BaseCommand):
+    help = (
+        "Multi-threaded contention benchmark of the BOOKING_CONCURRENCY modes: threads book "
+        "one popular listing at the same time (mostly different nights). Reports bookings/s. "
+        "Needs committed data (threads use their own connections); everything created is deleted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--modes", default=f"{LOCK},{OPTIMISTIC}", help=f"Any of {LOCK},{CLAIMS},{RETRY},{OPTIMISTIC}.")
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--per-thread", type=int, default=50, help="Booking attempts per thread.")
+        parser.add_argument("--overlap", type=float, default=0.1, help="Share of attempts on already requested nights.")
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **options):
+        run = time.time_ns()
+        landlord = User.objects.create_user(username=f"bench-ll-{run}")
+        tenants = [User.objects.create_user(username=f"bench-tt-{run}-{i}") for i in range(options["threads"])]
+        try:
+            for mode in options["modes"].split(","):
+                listing = Listing.objects.create(
+                    landlord=landlord, title=f"bench-{run}-{mode}", description="bench", location_city="Kyiv",
+                    location_district="Center", price=Decimal(500), rooms=2, status=ListingStatus.AVAILABLE,
+                )
+                with override_settings(BOOKING_CONCURRENCY=mode):
+                    self._scenario(mode, listing, tenants, options)
+        finally:
+            Listing.objects.filter(landlord=landlord).delete()
+            User.objects.filter(pk__in=[landlord.pk] + [t.pk for t in tenants]).delete()
+
+    def _scenario(self, mode, listing, tenants, options):
+        per_thread = options["per_thread"]
+        rng = random.Random(options["seed"])
+        first_day = timezone.localdate() + timedelta(days=1)
+        # Slot k = nights [first_day + 3k, first_day + 3k + 2): one slot per attempt, some repeated
+        total = len(tenants) * per_thread
+        slots = list(range(total))
+        for i in range(total):
+            if rng.random() < options["overlap"]:
+                slots[i] = rng.randrange(total)
+        rng.shuffle(slots)
+
+        outcomes = Counter()
+        lock = threading.Lock()
+        barrier = threading.Barrier(len(tenants))
+
+        def worker(index, tenant):
+            local = Counter()
+            try:
+                barrier.wait()
+                for slot in slots[index * per_thread:(index + 1) * per_thread]:
+                    start = first_day + timedelta(days=3 * slot)
+                    data = {"listing": listing.pk, "start_date": start, "end_date": start + timedelta(days=2)}
+                    serializer = BookingSerializer(data=data)
+                    try:
+                        if not serializer.is_valid():
+                            local["overlap"] += 1
+                            continue
+                        save_booking(serializer, tenant=tenant)
+                        local["created"] += 1
+                    except ValidationError:
+                        local["overlap"] += 1
+                    except DatabaseError as exc:
+                        local[f"error: {type(exc).__name__}"] += 1
+            finally:
+                close_old_connections()
+                connection.close()
+                with lock:
+                    outcomes.update(local)
+
+        threads = [threading.Thread(target=worker, args=(i, t)) for i, t in enumerate(tenants)]
+        t0 = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - t0
+
+        distinct = len(set(slots))
+        self.stdout.write(f"\n[{mode} -> {strategy()}] {len(tenants)} threads x {per_thread} attempts ({connection.vendor})")
+        self.stdout.write(f"  created {outcomes['created']} / {distinct} distinct stays, rejected {outcomes['overlap']}")
+        for name, n in sorted(outcomes.items()):
+            if name.startswith("error"):
+                self.stdout.write(f"  {name}: {n}")
+        self.stdout.write(f"  {elapsed:.2f} s, {outcomes['created'] / elapsed:.1f} bookings/s")
+        if outcomes["created"] > distinct:
+            self.stdout.write(self.style.ERROR("  double booking detected"))
@@ -0,0 +1,172 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from bookings.models import Booking
+from bookings.visibility import BranchUnion, branches, union_ordering, visible_bookings
+from listings.choices import ListingStatus
+from listings.models import Listing
+
+BATCH = 5000
+PAGE = 20
+TRAVEL_BOOKINGS = 50  # bookings of the heavy landlord as a tenant
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the bookings list visibility query: OR over a join + DISTINCT against the "
+        "UNION of the tenant and landlord branches. Synthetic data is rolled back at the end."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--landlords", type=int, default=2_000)
+        parser.add_argument("--tenants", type=int, default=20_000)
+        parser.add_argument("--bookings", type=int, default=1_000_000)
+        parser.add_argument("--heavy-listings", type=int, default=500, help="Listings of the heavy landlord.")
+        parser.add_argument("--heavy-bookings", type=int, default=50_000, help="Bookings on the heavy landlord's listings.")
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **options):
+        for name in ("landlords", "tenants", "heavy_listings", "repeat"):
+            if options[name] < 1:
+                raise CommandError(f"--{name.replace('_', '-')} must be at least 1.")
+        for name in ("bookings", "heavy_bookings"):
+            if options[name] < 0:
+                raise CommandError(f"--{name.replace('_', '-')} must not be negative.")
+        try:
+            with transaction.atomic():
+                self._run(**options)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _timed(self, repeat, func):
+        samples = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            result = func()
+            samples.append((time.perf_counter() - t0) * 1000)
+        return result, statistics.median(samples)
+
+    def _users(self, prefix, n):
+        User.objects.bulk_create(
+            (User(username=f"{prefix}-{i}") for i in range(n)), batch_size=BATCH
+        )
+        return list(User.objects.filter(username__startswith=f"{prefix}-").values_list("id", flat=True))
+
+    def _listings(self, landlord_ids, per_landlord, tag):
+        Listing.objects.bulk_create(
+            (
+                Listing(
+                    landlord_id=landlord_id, title=f"{tag}-{landlord_id}-{i}", description="bench",
+                    location_city="Kyiv", location_district="Center", price=Decimal(500), rooms=2,
+                    status=ListingStatus.AVAILABLE,
+                )
+                for landlord_id in landlord_ids
+                for i in range(per_landlord)
+            ),
+            batch_size=BATCH,
+        )
+        return list(Listing.objects.filter(title__startswith=f"{tag}-").values_list("id", flat=True))
+
+    def _bookings(self, rng, listing_ids, tenant_ids, n, first_day=0):
+        # Distinct (listing, start, end) per row: uniq_booking_exact. Row i takes day
+        # first_day + i // len(listing_ids), so n rows span ceil(n / len(listing_ids)) days.
+        today = timezone.localdate() + timedelta(days=first_day)
+        now = timezone.now()
+        batch = []
+        for i in range(n):
+            start = today + timedelta(days=i // len(listing_ids))
+            batch.append(Booking(
+                listing_id=listing_ids[i % len(listing_ids)], tenant_id=rng.choice(tenant_ids),
+                start_date=start, end_date=start + timedelta(days=1),
+                created_at=now - timedelta(seconds=rng.randint(0, 365 * 86400)),
+            ))
+            if len(batch) >= BATCH:
+                self._insert(batch)
+                batch = []
+        self._insert(batch)
+
+    def _insert(self, batch):
+        # auto_now_add overrides created_at on insert: write the spread-out times back afterwards
+        created_at = [b.created_at for b in batch]
+        created = Booking.objects.bulk_create(batch)
+        if created and created[0].pk is not None:
+            for booking, value in zip(created, created_at):
+                booking.created_at = value
+            Booking.objects.bulk_update(created, ["created_at"], batch_size=1000)
+
+    def _seed(self, landlords, tenants, bookings, heavy_listings, heavy_bookings, seed):
+        rng = random.Random(seed)
+        run = time.time_ns()
+        heavy = User.objects.create_user(username=f"bench-heavy-{run}")
+        landlord_ids = self._users(f"bench-ll-{run}", landlords)
+        tenant_ids = self._users(f"bench-tt-{run}", tenants)
+        listing_ids = self._listings(landlord_ids, 5, f"bench-{run}")
+        heavy_listing_ids = self._listings([heavy.pk], heavy_listings, f"bench-heavy-{run}")
+
+        self._bookings(rng, listing_ids, tenant_ids, bookings)
+        self._bookings(rng, heavy_listing_ids, tenant_ids, heavy_bookings)
+        # The heavy landlord also travels: on the days right before the other bookings
+        # (which start today), so no (listing, start, end) repeats however few listings there are
+        travel_days = -(-TRAVEL_BOOKINGS // len(listing_ids))
+        self._bookings(rng, listing_ids, [heavy.pk], TRAVEL_BOOKINGS, first_day=-travel_days)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE" if connection.vendor != "mysql" else "ANALYZE TABLE bookings_booking")
+        return heavy, User.objects.get(pk=tenant_ids[0])
+
+    def _run(self, landlords, tenants, bookings, heavy_listings, heavy_bookings, repeat, seed, **_):
+        t0 = time.perf_counter()
+        heavy, tenant = self._seed(landlords, tenants, bookings, heavy_listings, heavy_bookings, seed)
+        self.stdout.write(
+            f"seeded {bookings + heavy_bookings} bookings in {time.perf_counter() - t0:.1f} s "
+            f"({connection.vendor})"
+        )
+        for label, user in (("heavy landlord", heavy), ("ordinary tenant", tenant)):
+            self._scenario(label, user, repeat)
+
+    def _scenario(self, label, user, repeat):
+        # The previous get_queryset()
+        old = (
+            Booking.objects.select_related("listing")
+            .filter(Q(tenant_id=user.pk) | Q(listing__landlord_id=user.pk))
+            .distinct()
+            .order_by("-created_at", "-id")
+        )
+        old_page, old_page_ms = self._timed(repeat, lambda: list(old[:PAGE]))
+        old_count, old_count_ms = self._timed(repeat, old.count)
+
+        branch_querysets = branches(user)
+        union = BranchUnion(branch_querysets, union_ordering(branch_querysets[0]), {"pk", "updated_at"})
+        full = visible_bookings(user).select_related("listing")
+
+        def union_page():
+            ids = [row.pk for row in union[0:PAGE]]
+            rows = full.in_bulk(ids)
+            return [rows[pk] for pk in ids]
+
+        new_page, new_page_ms = self._timed(repeat, union_page)
+        new_count, new_count_ms = self._timed(repeat, union.count)
+        assert [b.pk for b in new_page] == [b.pk for b in old_page]
+        assert new_count == old_count
+
+        self.stdout.write(f"\n[{label}] visible bookings: {new_count}")
+        self.stdout.write(f"  OR + DISTINCT, first page of {PAGE}:   {old_page_ms:.1f} ms")
+        self.stdout.write(f"  OR + DISTINCT, COUNT(*):              {old_count_ms:.1f} ms")
+        self.stdout.write(f"  UNION, first page + rows by pk:       {new_page_ms:.1f} ms")
+        self.stdout.write(f"  UNION, COUNT(*):                      {new_count_ms:.1f} ms")
+        self.stdout.write("  plan (OR + DISTINCT):\n" + old[:PAGE].explain())
+        self.stdout.write("  plan (UNION):\n" + union._union(PAGE)[:PAGE].explain())
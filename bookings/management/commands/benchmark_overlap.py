@@ -0,0 +1,128 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from bookings.availability import IntervalIndex, is_available, overlapping
+from bookings.choices import BookingStatus
+from bookings.models import Booking
+from listings.choices import ListingStatus
+from listings.models import Listing
+
+BATCH = 5000
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark booking overlap checks on listings with a long booking history: one indexed "
+        "query per check against one load into an in-memory IntervalIndex. Synthetic data is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--listings", type=int, default=50)
+        parser.add_argument("--history", type=int, default=5_000, help="Past bookings per listing.")
+        parser.add_argument("--future", type=int, default=30, help="Upcoming bookings per listing.")
+        parser.add_argument("--checks", type=int, default=2_000, help="Candidate stays to check.")
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._run(**options)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _timed(self, repeat, func):
+        samples = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            result = func()
+            samples.append((time.perf_counter() - t0) * 1000)
+        return result, statistics.median(samples)
+
+    def _seed(self, rng, listings, history, future):
+        run = time.time_ns()
+        landlord = User.objects.create_user(username=f"bench-ll-{run}")
+        tenant = User.objects.create_user(username=f"bench-tt-{run}")
+        Listing.objects.bulk_create(
+            Listing(
+                landlord=landlord, title=f"bench-{run}-{i}", description="bench", location_city="Kyiv",
+                location_district="Center", price=Decimal(500), rooms=2, status=ListingStatus.AVAILABLE,
+            )
+            for i in range(listings)
+        )
+        ids = list(Listing.objects.filter(landlord=landlord).values_list("id", flat=True))
+
+        today = timezone.localdate()
+        past = [BookingStatus.CONFIRMED] * 6 + [BookingStatus.CANCELLED, BookingStatus.REJECTED, BookingStatus.EXPIRED]
+        batch = []
+        for listing_id in ids:
+            # Back-to-back history ending today, then upcoming stays with gaps
+            day = today - timedelta(days=3 * history)
+            for _ in range(history):
+                batch.append(Booking(listing_id=listing_id, tenant=tenant, start_date=day,
+                                     end_date=day + timedelta(days=2), status=rng.choice(past)))
+                day += timedelta(days=3)
+            for _ in range(future):
+                day += timedelta(days=rng.randint(0, 6))
+                nights = rng.randint(1, 7)
+                batch.append(Booking(listing_id=listing_id, tenant=tenant, start_date=day,
+                                     end_date=day + timedelta(days=nights),
+                                     status=rng.choice((BookingStatus.PENDING, BookingStatus.CONFIRMED))))
+                day += timedelta(days=nights)
+            if len(batch) >= BATCH:
+                Booking.objects.bulk_create(batch)
+                batch = []
+        Booking.objects.bulk_create(batch)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE" if connection.vendor != "mysql" else "ANALYZE TABLE bookings_booking")
+        return ids
+
+    def _run(self, listings, history, future, checks, repeat, seed, **_):
+        rng = random.Random(seed)
+        t0 = time.perf_counter()
+        ids = self._seed(rng, listings, history, future)
+        self.stdout.write(
+            f"seeded {listings} listings x ({history} past + {future} upcoming) bookings "
+            f"in {time.perf_counter() - t0:.1f} s ({connection.vendor})"
+        )
+
+        today = timezone.localdate()
+        stays = []
+        for _ in range(checks):
+            start = today + timedelta(days=rng.randint(1, 200))
+            stays.append((rng.choice(ids), start, start + timedelta(days=rng.randint(1, 10))))
+
+        def per_query():
+            return [is_available(listing_id, start, end) for listing_id, start, end in stays]
+
+        def interval_index():
+            spans = {}
+            for listing_id, start, end in stays:
+                span = spans.get(listing_id)
+                spans[listing_id] = (min(span[0], start), max(span[1], end)) if span else (start, end)
+            index = IntervalIndex.load(spans)
+            return [not index.overlaps(listing_id, start, end) for listing_id, start, end in stays]
+
+        queried, query_ms = self._timed(repeat, per_query)
+        indexed, index_ms = self._timed(repeat, interval_index)
+        assert queried == indexed
+
+        self.stdout.write(f"\n{checks} checks, {sum(queried)} available")
+        self.stdout.write(f"  one query per check:            {query_ms:.1f} ms ({query_ms * 1000 / checks:.0f} us/check)")
+        self.stdout.write(f"  IntervalIndex (1 load + memory): {index_ms:.1f} ms ({index_ms * 1000 / checks:.0f} us/check)")
+        listing_id, start, end = stays[0]
+        probe = overlapping(listing_id, start, end).order_by()
+        self.stdout.write("  plan of one check:\n" + probe.values("pk")[:1].explain())
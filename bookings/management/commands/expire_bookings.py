@@ -0,0 +1,36 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from bookings.expiry import expire_pending, pending_ttl
+
+DEFAULT_INTERVAL = 300  # seconds between sweeps with --loop
+
+
+class Command(BaseCommand):
+    help = "Move PENDING bookings older than BOOKING_PENDING_TTL_HOURS to EXPIRED, in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, help="Bookings per UPDATE (default: BOOKING_EXPIRY_BATCH_SIZE).")
+        parser.add_argument("--max-batches", type=int, help="Stop a sweep after this many batches.")
+        parser.add_argument("--pause", type=float, default=0, help="Seconds to sleep between batches.")
+        parser.add_argument("--loop", action="store_true", help="Keep sweeping every --interval seconds.")
+        parser.add_argument("--interval", type=float, help="Seconds between sweeps (default: BOOKING_EXPIRY_INTERVAL).")
+
+    def handle(self, *args, **options):
+        if pending_ttl() is None:
+            self.stdout.write(self.style.WARNING("BOOKING_PENDING_TTL_HOURS is 0: expiry is disabled."))
+            return
+        interval = options["interval"] or getattr(settings, "BOOKING_EXPIRY_INTERVAL", DEFAULT_INTERVAL)
+        while True:
+            result = expire_pending(
+                batch_size=options["batch_size"], max_batches=options["max_batches"], pause=options["pause"]
+            )
+            self.stdout.write(self.style.SUCCESS(
+                f"Expired {result['expired']} pending bookings created before {result['cutoff']:%Y-%m-%d %H:%M} "
+                f"({result['batches']} batches, {result['duration_ms']} ms)."
+            ))
+            if not options["loop"]:
+                return
+            time.sleep(interval)
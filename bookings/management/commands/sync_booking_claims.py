@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from bookings.concurrency import sync_claims, uses_claims
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the per-night claims (BookingNight) of pending/confirmed bookings from today on. "
+        'Run it when switching BOOKING_CONCURRENCY to "claims" and, e.g. daily, to drop past nights.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        result = sync_claims(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Claims: {result['claimed']} nights ({result['added']} added, {result['removed']} removed)."
+        ))
+        if result["conflicts"]:
+            self.stdout.write(self.style.WARNING(
+                f"{result['conflicts']} nights are booked by more than one pending/confirmed booking."
+            ))
+        if not uses_claims():
+            self.stdout.write(self.style.WARNING('BOOKING_CONCURRENCY is not "claims": claims are not kept up to date.'))
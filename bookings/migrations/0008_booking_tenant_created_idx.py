@@ -0,0 +1,20 @@
+# Generated by Django 5.2.4 on 2026-10-17 23:57
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0007_pending_expiry'),
+        ('listings', '0007_listing_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['tenant', 'created_at'], name='booking_tenant_created_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.4 on 2026-10-18 00:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0008_booking_tenant_created_idx'),
+        ('listings', '0007_listing_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['listing', 'end_date', 'start_date', 'status'], name='booking_overlap_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='booking',
+            name='bookings_bo_listing_e73481_idx',
+        ),
+        # Superseded: its start_date range reads a listing's whole busy history
+        migrations.RemoveIndex(
+            model_name='booking',
+            name='booking_availability_idx',
+        ),
+    ]
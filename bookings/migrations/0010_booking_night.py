@@ -0,0 +1,29 @@
+# Generated by Django 5.2.4 on 2026-10-18 00:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0009_booking_overlap_idx'),
+        ('listings', '0007_listing_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookingNight',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('night', models.DateField()),
+                ('booking', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='nights', to='bookings.booking')),
+                ('listing', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='listings.listing')),
+            ],
+            options={
+                'verbose_name': 'Booked night',
+                'verbose_name_plural': 'Booked nights',
+                'constraints': [models.UniqueConstraint(fields=('listing', 'night'), name='uniq_booking_night')],
+            },
+        ),
+    ]
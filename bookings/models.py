@@ -26,6 +26,7 @@ class Booking(models.Model):
         help_text="Booking status"
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, help_text='Last change; used as HTTP validator (ETag/Last-Modified)')
 
     def __str__(self):
         return f"Booking by {self.tenant.username} for {self.listing.title} [{self.start_date} - {self.end_date}]"
@@ -42,5 +43,31 @@ class Booking(models.Model):
         ]
         indexes = [
             models.Index(fields=['listing', 'start_date']),
-            models.Index(fields=['listing', 'end_date']),
+            # Overlap probe (bookings.availability): the range on end_date > new start skips a listing's
+            # past stays, start_date/status are checked inside the index entry (covering)
+            models.Index(fields=['listing', 'end_date', 'start_date', 'status'], name='booking_overlap_idx'),
+            # Expiry sweep: oldest PENDING rows first (bookings.expiry)
+            models.Index(fields=['status', 'created_at'], name='booking_status_created_idx'),
+            # Tenant branch of the visibility UNION (bookings.visibility), already in list order
+            models.Index(fields=['tenant', 'created_at'], name='booking_tenant_created_idx'),
+            # iCal feed validators: MAX(updated_at) / COUNT of a listing's bookings (listings.ical)
+            models.Index(fields=['listing', 'updated_at'], name='booking_listing_updated_idx'),
+        ]
+
+
+class BookingNight(models.Model):
+    """
+    One night claimed by a PENDING/CONFIRMED booking, used when BOOKING_CONCURRENCY is "claims"
+    (see bookings/concurrency.py): the unique (listing, night) key lets non-overlapping bookings
+    of the same listing be inserted in parallel while overlapping ones fail at the database.
+    """
+    listing = models.ForeignKey(Listing, on_delete=models.CASCADE, related_name='+')
+    night = models.DateField()
+    booking = models.ForeignKey(Booking, on_delete=models.CASCADE, related_name='nights')
+
+    class Meta:
+        verbose_name = 'Booked night'
+        verbose_name_plural = 'Booked nights'
+        constraints = [
+            models.UniqueConstraint(fields=['listing', 'night'], name='uniq_booking_night'),
         ]
@@ -1,9 +1,10 @@
+from django.conf import settings
 from django.utils import timezone
 from rest_framework import serializers
 
 from listings.choices import ListingStatus
+from .availability import is_available
 from .models import Booking
-from .choices import BookingStatus
 
 
 class BookingSerializer(serializers.ModelSerializer):
@@ -44,19 +45,67 @@ class BookingSerializer(serializers.ModelSerializer):
         if start < today:
             raise serializers.ValidationError("Cannot book past dates (start_date is in the past).")
 
-        busy_statuses = (BookingStatus.CONFIRMED, BookingStatus.PENDING)
-        qs = Booking.objects.filter(
-            listing=listing,
-            status__in=busy_statuses,
-            start_date__lt=end,  # overlap if (a.start < b.end) AND
-            end_date__gt=start,  #            (a.end > b.start)
-        )
-        if inst:
-            qs = qs.exclude(pk=inst.pk)
-
-        if qs.exists():
+        # Index-only probe of booking_overlap_idx (see bookings.availability)
+        if not is_available(listing.pk, start, end, exclude_pk=inst.pk if inst else None):
             raise serializers.ValidationError(
                 "This period overlaps with an existing booking or reservation for the listing."
             )
 
         return attrs
+
+
+class BookingBulkItemSerializer(serializers.Serializer):
+    """
+    One stay of a bulk request. Only checks that need no query live here;
+    listing state and overlaps are checked for the whole batch in bookings.bulk.
+    """
+    listing = serializers.IntegerField(min_value=1)
+    start_date = serializers.DateField()
+    end_date = serializers.DateField()
+
+    def validate(self, attrs):
+        if attrs["start_date"] >= attrs["end_date"]:
+            raise serializers.ValidationError("start_date must be earlier than end_date.")
+        if attrs["start_date"] < timezone.localdate():
+            raise serializers.ValidationError("Cannot book past dates (start_date is in the past).")
+        return attrs
+
+
+class BookingBulkCreateSerializer(serializers.Serializer):
+    """Envelope of POST /api/bookings/bulk/: {"items": [{listing, start_date, end_date}, ...]}."""
+    items = serializers.ListField(child=serializers.DictField(), allow_empty=False)
+
+    def validate_items(self, items):
+        limit = getattr(settings, "BOOKING_BULK_MAX_ITEMS", 100)
+        if len(items) > limit:
+            raise serializers.ValidationError(f"At most {limit} items per request.")
+        return items
+
+
+class BookingBulkTransitionSerializer(serializers.Serializer):
+    """
+    Body of POST /api/bookings/bulk-confirm|bulk-reject|bulk-cancel/:
+    either {"ids": [...]} or a filter {"listing", "start_from", "start_to"} (at least one key).
+    """
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False, allow_empty=False)
+    listing = serializers.IntegerField(min_value=1, required=False)
+    start_from = serializers.DateField(required=False)
+    start_to = serializers.DateField(required=False)
+
+    FILTER_FIELDS = ("listing", "start_from", "start_to")
+
+    def validate_ids(self, ids):
+        limit = getattr(settings, "BOOKING_BULK_TRANSITION_MAX_IDS", 5000)
+        if len(ids) > limit:
+            raise serializers.ValidationError(f"At most {limit} ids per request.")
+        return ids
+
+    def validate(self, attrs):
+        has_filter = any(name in attrs for name in self.FILTER_FIELDS)
+        if "ids" in attrs and has_filter:
+            raise serializers.ValidationError("Give either ids or a filter (listing, start_from, start_to), not both.")
+        if "ids" not in attrs and not has_filter:
+            raise serializers.ValidationError("Give ids or a filter (listing, start_from, start_to).")
+        if attrs.get("start_from") and attrs.get("start_to") and attrs["start_from"] > attrs["start_to"]:
+            raise serializers.ValidationError({"start_to": "start_to must not be earlier than start_from."})
+        return attrs
@@ -0,0 +1,17 @@
+from datetime import date, timedelta
+
+import pytest
+from model_bakery import baker
+
+
+def in_days(n):
+    return date.today() + timedelta(days=n)
+
+
+@pytest.fixture
+def parties(user_with_profile):
+    """(landlord, tenant, an available listing of the landlord)."""
+    landlord = user_with_profile(username="ll", role="landlord")
+    tenant = user_with_profile(username="tt", role="tenant")
+    listing = baker.make("listings.Listing", landlord=landlord, status="available")
+    return landlord, tenant, listing
@@ -1,5 +1,7 @@
 import pytest
 from datetime import date, timedelta
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from model_bakery import baker
 from listings.choices import ListingStatus
 
@@ -156,3 +158,104 @@ def test_cancel_with_deadline(api_client, user_with_profile, settings):
     )
     r_bad = api_client.post(f"{BASE}{b2.id}/cancel/")
     assert r_bad.status_code == 400
+
+
+@pytest.mark.django_db
+def test_conditional_get_on_list_and_detail(api_client, user_with_profile):
+    landlord = user_with_profile(username="ll", role="landlord")
+    tenant = user_with_profile(username="tt", role="tenant")
+    l = baker.make("listings.Listing", landlord=landlord, status=ListingStatus.AVAILABLE)
+    b = baker.make(
+        "bookings.Booking",
+        listing=l,
+        tenant=tenant,
+        start_date=date.today() + timedelta(days=7),
+        end_date=date.today() + timedelta(days=9),
+        status="pending",
+    )
+    api_client.force_authenticate(user=landlord)
+
+    list_etag = api_client.get(BASE)["ETag"]
+    detail_etag = api_client.get(f"{BASE}{b.id}/")["ETag"]
+    assert api_client.get(BASE, HTTP_IF_NONE_MATCH=list_etag).status_code == 304
+    assert api_client.get(f"{BASE}{b.id}/", HTTP_IF_NONE_MATCH=detail_etag).status_code == 304
+
+    # a state transition changes both validators
+    assert api_client.post(f"{BASE}{b.id}/confirm/").status_code == 200
+    assert api_client.get(BASE, HTTP_IF_NONE_MATCH=list_etag).status_code == 200
+    assert api_client.get(f"{BASE}{b.id}/", HTTP_IF_NONE_MATCH=detail_etag).status_code == 200
+
+
+# ---- bulk create ----
+
+def _stay(listing, start_in, nights):
+    start = date.today() + timedelta(days=start_in)
+    return {"listing": listing.id, "start_date": str(start), "end_date": str(start + timedelta(days=nights))}
+
+
+@pytest.mark.django_db
+def test_bulk_create_per_item_results(api_client, user_with_profile, django_capture_on_commit_callbacks):
+    landlord = user_with_profile(username="ll", role="landlord")
+    tenant = user_with_profile(username="tt", role="tenant")
+    free, busy = baker.make("listings.Listing", landlord=landlord, status=ListingStatus.AVAILABLE, _quantity=2)
+    closed = baker.make("listings.Listing", landlord=landlord, status=ListingStatus.UNAVAILABLE)
+    own = baker.make("listings.Listing", landlord=tenant, status=ListingStatus.AVAILABLE)
+    existing = _stay(busy, 10, 5)
+    baker.make("bookings.Booking", listing=busy, tenant=landlord, status="confirmed",
+               start_date=existing["start_date"], end_date=existing["end_date"])
+    # Same dates as a cancelled booking: not busy, but the exact-dates constraint still applies
+    cancelled = _stay(free, 40, 2)
+    baker.make("bookings.Booking", listing=free, tenant=landlord, status="cancelled",
+               start_date=cancelled["start_date"], end_date=cancelled["end_date"])
+
+    items = [
+        _stay(free, 5, 3),              # 0 ok
+        _stay(free, 7, 2),              # 1 overlaps item 0
+        _stay(free, 8, 2),              # 2 starts on item 0's check-out day: ok
+        _stay(busy, 12, 2),             # 3 overlaps the confirmed booking
+        _stay(busy, 15, 2),             # 4 ok (check-in on check-out day)
+        _stay(closed, 5, 2),            # 5 listing not available
+        _stay(own, 5, 2),               # 6 own listing
+        {"listing": 999999, "start_date": "2100-01-01", "end_date": "2100-01-02"},  # 7 unknown
+        _stay(free, -3, 2),             # 8 past
+        {"listing": free.id, "start_date": "2100-01-05", "end_date": "2100-01-05"},  # 9 empty stay
+        cancelled,                      # 10 duplicate of the cancelled booking's dates
+    ]
+    calendar_url = f"/api/listings/listings/{free.id}/calendar/"
+    assert api_client.get(calendar_url).json()["busy"] == []  # cached now
+
+    api_client.force_authenticate(user=tenant)
+    with CaptureQueriesContext(connection) as ctx, django_capture_on_commit_callbacks(execute=True):
+        r = api_client.post(f"{BASE}bulk/", {"items": items}, format="json")
+    assert r.status_code == 201
+    data = r.json()
+    assert data["created"] == 3
+    statuses = [res["status"] for res in data["results"]]
+    assert statuses == ["created", "error", "created", "error", "created",
+                        "error", "error", "error", "error", "error", "error"]
+    created = data["results"][0]["booking"]
+    assert created["id"] and created["status"] == "pending" and created["tenant"] == tenant.id
+    assert "own listing" in str(data["results"][6]["errors"])
+
+    # One lock query, one clash query, one INSERT, whatever the batch size
+    sql = [q["sql"] for q in ctx.captured_queries if "bookings_booking" in q["sql"] or "listings_listing" in q["sql"]]
+    assert len([q for q in sql if q.startswith("INSERT")]) == 1
+    assert len([q for q in sql if q.startswith("SELECT") and "bookings_booking" in q]) == 1
+
+    # bulk_create sends no post_save: the calendar cache is bumped explicitly
+    assert len(api_client.get(calendar_url).json()["busy"]) == 1
+
+
+@pytest.mark.django_db
+def test_bulk_create_nothing_created_and_limits(api_client, user_with_profile, settings):
+    tenant = user_with_profile(username="tt", role="tenant")
+    api_client.force_authenticate(user=tenant)
+    r = api_client.post(f"{BASE}bulk/", {"items": [{"listing": 1}]}, format="json")
+    assert r.status_code == 400
+    assert r.json()["created"] == 0
+
+    assert api_client.post(f"{BASE}bulk/", {"items": []}, format="json").status_code == 400
+    settings.BOOKING_BULK_MAX_ITEMS = 1
+    r = api_client.post(f"{BASE}bulk/", {"items": [{}, {}]}, format="json")
+    assert r.status_code == 400
+    assert "items" in r.json()
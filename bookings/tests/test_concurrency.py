@@ -0,0 +1,141 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import OperationalError
+from model_bakery import baker
+
+from bookings import concurrency, expiry, serializers, transitions
+from bookings.models import Booking, BookingNight
+from bookings.tests.conftest import in_days
+
+URL = "/api/bookings/"
+
+
+def payload(listing, start_in, nights):
+    return {"listing": listing.id, "start_date": str(in_days(start_in)), "end_date": str(in_days(start_in + nights))}
+
+
+@pytest.fixture
+def stale_validation(monkeypatch):
+    """Serializer validation that misses a booking committed concurrently, right after it ran."""
+    monkeypatch.setattr(serializers, "is_available", lambda *args, **kwargs: True)
+
+
+@pytest.mark.django_db
+def test_claims_follow_booking_lifecycle(api_client, parties, settings):
+    settings.BOOKING_CONCURRENCY = "claims"
+    settings.BOOKING_PENDING_TTL_HOURS = 1
+    landlord, tenant, listing = parties
+    api_client.force_authenticate(user=tenant)
+
+    r = api_client.post(URL, payload(listing, 10, 3), format="json")
+    assert r.status_code == 201, r.data
+    booking_id = r.data["id"]
+    assert sorted(BookingNight.objects.values_list("night", flat=True)) == [in_days(10), in_days(11), in_days(12)]
+
+    # Moving the dates moves the claims
+    r = api_client.patch(f"{URL}{booking_id}/", {"start_date": str(in_days(20)), "end_date": str(in_days(22))}, format="json")
+    assert r.status_code == 200, r.data
+    assert sorted(BookingNight.objects.values_list("night", flat=True)) == [in_days(20), in_days(21)]
+
+    assert transitions.transition("confirm", landlord, booking_id).ok
+    assert BookingNight.objects.count() == 2
+    assert transitions.transition("cancel", landlord, booking_id).ok
+    assert BookingNight.objects.count() == 0
+
+    other = api_client.post(URL, payload(listing, 30, 2), format="json").data["id"]
+    Booking.objects.filter(pk=other).update(created_at=Booking.objects.get(pk=other).created_at - timedelta(hours=2))
+    expiry.expire_pending()
+    assert BookingNight.objects.count() == 0
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("stale_validation")
+def test_claims_reject_overlap_missed_by_validation(api_client, parties, settings):
+    settings.BOOKING_CONCURRENCY = "claims"
+    _, tenant, listing = parties
+    api_client.force_authenticate(user=tenant)
+    assert api_client.post(URL, payload(listing, 10, 5), format="json").status_code == 201
+    # Same listing, other nights: no lock to wait for, no conflict
+    assert api_client.post(URL, payload(listing, 15, 2), format="json").status_code == 201
+
+    r = api_client.post(URL, payload(listing, 12, 2), format="json")
+    assert r.status_code == 400
+    assert r.data["non_field_errors"] == [concurrency.OVERLAP_MESSAGE]
+    assert Booking.objects.count() == 2
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("stale_validation")
+def test_lock_mode_rechecks_under_the_lock(api_client, parties, settings):
+    settings.BOOKING_CONCURRENCY = "lock"
+    _, tenant, listing = parties
+    api_client.force_authenticate(user=tenant)
+    assert api_client.post(URL, payload(listing, 10, 5), format="json").status_code == 201
+    assert api_client.post(URL, payload(listing, 12, 2), format="json").status_code == 400
+    assert BookingNight.objects.count() == 0  # no claims outside "claims" mode
+
+
+@pytest.mark.django_db
+def test_retry_mode_retries_serialization_conflicts(api_client, parties, settings, monkeypatch):
+    settings.BOOKING_CONCURRENCY = "optimistic"  # -> "retry" on SQLite
+    assert concurrency.strategy() == concurrency.RETRY
+    _, tenant, listing = parties
+    api_client.force_authenticate(user=tenant)
+
+    calls = []
+    real_check = concurrency.is_available
+
+    def conflicting_twice(*args, **kwargs):
+        calls.append(1)
+        if len(calls) <= 2:
+            raise OperationalError("database is locked")
+        return real_check(*args, **kwargs)
+
+    monkeypatch.setattr(concurrency, "is_available", conflicting_twice)
+    r = api_client.post(URL, payload(listing, 10, 2), format="json")
+    assert r.status_code == 201, r.data
+    assert len(calls) == 3
+    assert Booking.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_bulk_create_claims_nights(api_client, parties, settings):
+    settings.BOOKING_CONCURRENCY = "claims"
+    _, tenant, listing = parties
+    other = baker.make("listings.Listing", status="available")
+    api_client.force_authenticate(user=tenant)
+    items = [payload(listing, 10, 2), payload(other, 10, 3)]
+    r = api_client.post(f"{URL}bulk/", {"items": items}, format="json")
+    assert r.data["created"] == 2
+    assert BookingNight.objects.count() == 5
+
+    # A night claimed concurrently (not yet visible as a booking to the batch): nothing is created
+    claimer = baker.make("bookings.Booking", listing=other, status="cancelled",
+                         start_date=in_days(50), end_date=in_days(51))
+    BookingNight.objects.create(listing=other, night=in_days(40), booking=claimer)
+    r = api_client.post(f"{URL}bulk/", {"items": [payload(listing, 40, 2), payload(other, 40, 1)]}, format="json")
+    assert r.status_code == 400
+    assert r.data["created"] == 0
+    assert all("retry" in item["errors"]["non_field_errors"][0] for item in r.data["results"])
+    assert Booking.objects.count() == 3
+
+
+@pytest.mark.django_db
+def test_sync_booking_claims(parties, settings):
+    settings.BOOKING_CONCURRENCY = "claims"
+    _, tenant, listing = parties
+    baker.make("bookings.Booking", listing=listing, status="confirmed", start_date=in_days(-2), end_date=in_days(2))
+    baker.make("bookings.Booking", listing=listing, status="pending", start_date=in_days(5), end_date=in_days(7))
+    # Legacy overlap on night +6
+    baker.make("bookings.Booking", listing=listing, status="pending", start_date=in_days(6), end_date=in_days(8))
+    baker.make("bookings.Booking", listing=listing, status="rejected", start_date=in_days(10), end_date=in_days(12))
+
+    out = StringIO()
+    call_command("sync_booking_claims", stdout=out)
+    nights = sorted(BookingNight.objects.values_list("night", flat=True))
+    # Only from today on: +0, +1 / +5, +6 / +7
+    assert nights == [in_days(0), in_days(1), in_days(5), in_days(6), in_days(7)]
+    assert "1 nights are booked by more than one" in out.getvalue()
@@ -0,0 +1,97 @@
+from datetime import date, timedelta
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from model_bakery import baker
+
+from bookings import expiry
+from bookings.models import Booking
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics():
+    cache.delete_many([expiry.LAST_RUN_KEY, expiry.TOTAL_KEY, expiry.RUNS_KEY])
+
+
+def make_booking(listing, age_hours, status="pending", start_in=10):
+    booking = baker.make("bookings.Booking", listing=listing, status=status,
+                         start_date=date.today() + timedelta(days=start_in),
+                         end_date=date.today() + timedelta(days=start_in + 2))
+    Booking.objects.filter(pk=booking.pk).update(created_at=timezone.now() - timedelta(hours=age_hours))
+    return booking
+
+
+@pytest.mark.django_db
+def test_expire_pending_in_batches(settings):
+    settings.BOOKING_PENDING_TTL_HOURS = 24
+    listing = baker.make("listings.Listing", status="available")
+    stale = [make_booking(listing, 30 + i, start_in=10 + 3 * i) for i in range(5)]
+    fresh = make_booking(listing, 2, start_in=40)
+    answered = make_booking(listing, 100, "confirmed", start_in=50)
+
+    with CaptureQueriesContext(connection) as ctx:
+        result = expiry.expire_pending(batch_size=2)
+    assert result["expired"] == 5
+    assert result["batches"] == 3
+    updates = [q for q in ctx.captured_queries if q["sql"].startswith("UPDATE")]
+    assert len(updates) == 3  # one UPDATE per batch
+
+    statuses = dict(Booking.objects.values_list("id", "status"))
+    assert all(statuses[b.id] == "expired" for b in stale)
+    assert statuses[fresh.id] == "pending"
+    assert statuses[answered.id] == "confirmed"
+
+    assert expiry.expire_pending()["expired"] == 0
+    metrics = expiry.stats()
+    assert metrics["expired_total"] == 5
+    assert metrics["runs"] == 2
+    assert metrics["overdue"] == 0
+    assert metrics["last_run"]["expired"] == 0
+
+
+@pytest.mark.django_db
+def test_expired_booking_frees_dates(api_client, user_with_profile, settings):
+    settings.BOOKING_PENDING_TTL_HOURS = 24
+    tenant = user_with_profile(username="t", role="tenant")
+    listing = baker.make("listings.Listing", status="available")
+    stale = make_booking(listing, 48)
+    # Overlapping (not identical: uniq_booking_exact also covers past bookings) dates
+    payload = {"listing": listing.id, "start_date": str(stale.start_date + timedelta(days=1)),
+               "end_date": str(stale.end_date + timedelta(days=1))}
+    calendar_url = f"/api/listings/listings/{listing.id}/calendar/"
+    assert len(api_client.get(calendar_url).json()["busy"]) == 1
+
+    api_client.force_authenticate(user=tenant)
+    assert api_client.post("/api/bookings/", payload, format="json").status_code == 400
+
+    expiry.expire_pending()
+    assert api_client.get(calendar_url).json()["busy"] == []
+    assert api_client.post("/api/bookings/", payload, format="json").status_code == 201
+
+    api_client.force_authenticate(user=listing.landlord)
+    resp = api_client.post(f"/api/bookings/{stale.pk}/confirm/")
+    assert resp.status_code == 400
+    assert resp.data["current_status"] == "expired"
+
+
+@pytest.mark.django_db
+def test_command_and_disabled_ttl(settings):
+    settings.BOOKING_PENDING_TTL_HOURS = 1
+    listing = baker.make("listings.Listing", status="available")
+    make_booking(listing, 5)
+    out = StringIO()
+    call_command("expire_bookings", stdout=out)
+    assert "Expired 1 pending bookings" in out.getvalue()
+
+    settings.BOOKING_PENDING_TTL_HOURS = 0
+    make_booking(listing, 500, start_in=30)
+    assert expiry.expire_pending()["expired"] == 0
+    out = StringIO()
+    call_command("expire_bookings", stdout=out)
+    assert "disabled" in out.getvalue()
+    assert Booking.objects.filter(status="pending").count() == 1
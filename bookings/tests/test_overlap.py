@@ -0,0 +1,69 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+from django.db import connection
+from model_bakery import baker
+
+from bookings.availability import IntervalIndex, is_available, overlapping
+
+
+def brute_force(intervals, listing_id, start, end):
+    return any(l == listing_id and s < end and e > start for l, s, e in intervals)
+
+
+def test_interval_index_matches_brute_force():
+    rng = random.Random(7)
+    base = date(2026, 1, 1)
+    intervals = []
+    for _ in range(300):
+        start = base + timedelta(days=rng.randint(0, 400))
+        intervals.append((rng.randint(1, 3), start, start + timedelta(days=rng.randint(1, 20))))
+    index = IntervalIndex(intervals[:200])
+    for listing_id, start, end in intervals[200:]:
+        index.add(listing_id, start, end)
+    assert len(index) == 300
+
+    for _ in range(2000):
+        start = base + timedelta(days=rng.randint(-10, 420))
+        end = start + timedelta(days=rng.randint(1, 15))
+        listing_id = rng.randint(1, 4)
+        assert index.overlaps(listing_id, start, end) == brute_force(intervals, listing_id, start, end)
+
+
+def test_interval_index_half_open_edges():
+    index = IntervalIndex([(1, date(2026, 5, 10), date(2026, 5, 20)), (1, date(2026, 5, 1), date(2026, 5, 30))])
+    # A long interval hidden behind a short one that starts later is still seen
+    assert index.overlaps(1, date(2026, 5, 25), date(2026, 5, 27))
+    assert not index.overlaps(1, date(2026, 5, 30), date(2026, 6, 2))  # check-in on the check-out day
+    assert not index.overlaps(1, date(2026, 4, 25), date(2026, 5, 1))
+    assert not index.overlaps(2, date(2026, 5, 1), date(2026, 5, 30))
+
+
+@pytest.mark.django_db
+def test_single_check_and_load_agree():
+    listing = baker.make("listings.Listing", status="available")
+    other = baker.make("listings.Listing", status="available")
+    today = date.today()
+    for i, status in enumerate(["confirmed", "cancelled", "pending", "rejected", "expired"]):
+        start = today + timedelta(days=10 * i)
+        baker.make("bookings.Booking", listing=listing, status=status, start_date=start, end_date=start + timedelta(days=5))
+    busy = baker.make("bookings.Booking", listing=other, status="pending",
+                      start_date=today, end_date=today + timedelta(days=50))
+
+    index = IntervalIndex.load({listing.id: (today, today + timedelta(days=60)), other.id: (today, today + timedelta(days=60))})
+    assert len(index) == 3  # only pending/confirmed
+    for offset in range(0, 55, 2):
+        start, end = today + timedelta(days=offset), today + timedelta(days=offset + 3)
+        for listing_id in (listing.id, other.id):
+            assert is_available(listing_id, start, end) == (not index.overlaps(listing_id, start, end))
+    # Updating a booking doesn't clash with itself
+    assert is_available(other.id, today, today + timedelta(days=5), exclude_pk=busy.pk)
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(connection.vendor != "sqlite", reason="SQLite EXPLAIN QUERY PLAN wording")
+def test_single_check_reads_only_the_covering_index():
+    listing = baker.make("listings.Listing", status="available")
+    qs = overlapping(listing.id, date(2026, 1, 1), date(2026, 1, 5)).order_by()
+    assert "COVERING INDEX booking_overlap_idx" in qs.values("pk")[:1].explain()
@@ -0,0 +1,218 @@
+import threading
+import time
+
+import pytest
+from django.db import OperationalError, close_old_connections, connection
+from django.test.utils import CaptureQueriesContext
+from model_bakery import baker
+
+from bookings import transitions
+from bookings.models import Booking
+from bookings.tests.conftest import in_days
+
+
+LOCK_RETRIES = 50
+
+
+def make_booking(listing, tenant, start_in=10, status="pending"):
+    return baker.make("bookings.Booking", listing=listing, tenant=tenant,
+                      start_date=in_days(start_in), end_date=in_days(start_in + 2), status=status)
+
+
+@pytest.mark.django_db
+def test_bulk_transition_outcomes_in_two_queries(parties, user_with_profile, settings):
+    settings.BOOKING_CANCEL_DEADLINE_DAYS = 2
+    landlord, tenant, listing = parties
+    other_listing = baker.make("listings.Listing", status="available")
+    pending = make_booking(listing, tenant, 10)
+    confirmed = make_booking(listing, tenant, 20, "confirmed")
+    foreign = make_booking(other_listing, tenant, 10)
+
+    with CaptureQueriesContext(connection) as ctx:
+        outcomes = transitions.apply_transition("confirm", landlord, [pending.id, confirmed.id, foreign.id, 999999])
+    # UPDATE + SELECT (inside one transaction: savepoint statements aside)
+    statements = [q["sql"] for q in ctx.captured_queries if "SAVEPOINT" not in q["sql"]]
+    assert len(statements) == 2
+    assert {i: o.outcome for i, o in outcomes.items()} == {
+        pending.id: transitions.SUCCESS,
+        confirmed.id: transitions.CONFLICT,
+        foreign.id: transitions.NOT_FOUND,  # not visible to this landlord
+        999999: transitions.NOT_FOUND,
+    }
+    pending.refresh_from_db()
+    assert pending.status == "confirmed"
+
+
+@pytest.mark.django_db
+def test_failure_after_the_update_rolls_the_batch_back(parties, monkeypatch):
+    landlord, tenant, listing = parties
+    booking = make_booking(listing, tenant, 10)
+
+    def broken(ids):
+        raise OperationalError("connection lost")
+
+    monkeypatch.setattr(transitions.concurrency, "release", broken)
+    with pytest.raises(OperationalError):
+        transitions.transition("reject", landlord, booking.id)
+    booking.refresh_from_db()
+    assert booking.status == "pending"
+
+    # A retry is not mistaken for a conflict
+    monkeypatch.undo()
+    assert transitions.transition("reject", landlord, booking.id).ok
+
+
+@pytest.mark.django_db
+def test_cancel_rules(parties, settings):
+    settings.BOOKING_CANCEL_DEADLINE_DAYS = 2
+    landlord, tenant, listing = parties
+    ok = make_booking(listing, tenant, 10)
+    confirmed = make_booking(listing, tenant, 20, "confirmed")
+    late = make_booking(listing, tenant, 1)
+    started = make_booking(listing, tenant, 0)
+
+    outcomes = transitions.apply_transition("cancel", tenant, [ok.id, confirmed.id, late.id, started.id])
+    assert outcomes[ok.id].ok
+    assert outcomes[confirmed.id].outcome == transitions.FORBIDDEN  # tenant can't cancel once confirmed
+    assert outcomes[late.id].outcome == transitions.TOO_LATE
+    assert "Deadline is 2 day(s)" in outcomes[late.id].detail
+    assert outcomes[started.id].detail == "Booking has already started; cannot cancel."
+
+    assert transitions.transition("cancel", landlord, confirmed.id).ok
+    assert transitions.transition("cancel", landlord, confirmed.id).outcome == transitions.CONFLICT
+    assert transitions.transition("confirm", tenant, ok.id).outcome == transitions.FORBIDDEN
+
+
+@pytest.mark.django_db
+def test_transition_bumps_calendar_cache(api_client, parties, django_capture_on_commit_callbacks):
+    landlord, tenant, listing = parties
+    booking = make_booking(listing, tenant, 10)
+    url = f"/api/listings/listings/{listing.id}/calendar/"
+    assert len(api_client.get(url).json()["busy"]) == 1
+
+    with django_capture_on_commit_callbacks(execute=True):
+        assert transitions.transition("reject", landlord, booking.id).ok
+    assert api_client.get(url).json()["busy"] == []
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_transitions_have_a_single_winner(parties):
+    landlord, tenant, listing = parties
+    booking = make_booking(listing, tenant, 10)
+    actions = ["confirm", "reject", "cancel"] * 6
+    barrier = threading.Barrier(len(actions))
+    results = []
+    lock = threading.Lock()
+
+    def worker(name):
+        try:
+            barrier.wait()
+            for _ in range(LOCK_RETRIES):
+                try:
+                    outcome = transitions.transition(name, landlord, booking.id).outcome
+                    break
+                except OperationalError:
+                    # The shared in-memory test database locks whole tables between threads.
+                    # A failed call rolled back its UPDATE, so retrying it is safe.
+                    time.sleep(0.01)
+            else:
+                outcome = "gave up"
+            with lock:
+                results.append((name, outcome))
+        finally:
+            close_old_connections()
+
+    threads = [threading.Thread(target=worker, args=(name,)) for name in actions]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == len(actions)
+    gave_up = [name for name, outcome in results if outcome == "gave up"]
+    assert not gave_up, f"{len(gave_up)} calls still hit table locks after {LOCK_RETRIES} attempts"
+    assert all(outcome in (transitions.SUCCESS, transitions.CONFLICT) for _, outcome in results)
+    winners = [name for name, outcome in results if outcome == transitions.SUCCESS]
+    booking.refresh_from_db()
+    # Either one of the three wins outright, or confirm/reject wins and a cancel follows it
+    # (cancel is allowed from confirmed/rejected) — never two winners of the same kind.
+    assert 1 <= len(winners) <= 2
+    assert len(set(winners)) == len(winners)
+    assert not {"confirm", "reject"} <= set(winners)
+    if len(winners) == 2:
+        assert "cancel" in winners and booking.status == "cancelled"
+    else:
+        assert booking.status == transitions.TRANSITIONS[winners[0]].target
+
+
+@pytest.mark.django_db
+def test_bulk_confirm_by_ids(api_client, parties, settings):
+    settings.BOOKING_TRANSITION_BATCH_SIZE = 2
+    landlord, tenant, listing = parties
+    pending = [make_booking(listing, tenant, 10 + 3 * i) for i in range(5)]
+    confirmed = make_booking(listing, tenant, 40, "confirmed")
+    foreign = make_booking(baker.make("listings.Listing", status="available"), tenant, 10)
+    ids = [b.id for b in pending] + [confirmed.id, foreign.id]
+
+    api_client.force_authenticate(user=landlord)
+    with CaptureQueriesContext(connection) as ctx:
+        resp = api_client.post("/api/bookings/bulk-confirm/", {"ids": ids}, format="json")
+    assert resp.status_code == 200, resp.data
+    # 7 ids in batches of 2: one UPDATE + one SELECT per batch, nothing per booking
+    assert len([q for q in ctx.captured_queries if "bookings_booking" in q["sql"]]) == 8
+    assert resp.data["counts"] == {"ok": 5, "conflict": 1, "not_found": 1}
+    assert [r["id"] for r in resp.data["results"]] == ids
+    assert resp.data["results"][5] == {
+        "id": confirmed.id, "outcome": "conflict", "status": "confirmed",
+        "detail": "Only bookings with status 'pending' can be confirmed.",
+    }
+    assert Booking.objects.filter(status="confirmed").count() == 6
+
+    api_client.force_authenticate(user=tenant)
+    resp = api_client.post("/api/bookings/bulk-reject/", {"ids": [pending[0].id]}, format="json")
+    assert resp.data["results"][0]["outcome"] == "forbidden"
+
+
+@pytest.mark.django_db
+def test_bulk_cancel_by_filter_pages(api_client, parties, settings):
+    settings.BOOKING_CANCEL_DEADLINE_DAYS = 2
+    settings.BOOKING_BULK_TRANSITION_MAX_IDS = 2
+    landlord, tenant, listing = parties
+    other = baker.make("listings.Listing", landlord=landlord, status="available")
+    in_window = [make_booking(listing, tenant, 10), make_booking(listing, tenant, 13, "confirmed"),
+                 make_booking(listing, tenant, 16)]
+    too_late = make_booking(listing, tenant, 1)
+    outside = make_booking(listing, tenant, 30)
+    other_listing = make_booking(other, tenant, 10)
+
+    api_client.force_authenticate(user=landlord)
+    body = {"listing": listing.id, "start_to": str(in_days(20))}
+    first = api_client.post("/api/bookings/bulk-cancel/", body, format="json")
+    assert first.status_code == 200, first.data
+    assert first.data["has_more"] is True
+    assert first.data["counts"] == {"ok": 2}
+    second = api_client.post("/api/bookings/bulk-cancel/", body, format="json")
+    assert second.data["has_more"] is False
+    assert [r["id"] for r in second.data["results"]] == [in_window[2].id]
+    third = api_client.post("/api/bookings/bulk-cancel/", body, format="json")
+    assert third.data == {"action": "cancel", "counts": {}, "has_more": False, "results": []}
+
+    statuses = dict(Booking.objects.values_list("id", "status"))
+    assert all(statuses[b.id] == "cancelled" for b in in_window)
+    # Past the deadline, outside the window or on another listing: untouched
+    assert statuses[too_late.id] == statuses[outside.id] == statuses[other_listing.id] == "pending"
+
+
+@pytest.mark.django_db
+def test_bulk_transition_validation(api_client, parties, settings):
+    settings.BOOKING_BULK_TRANSITION_MAX_IDS = 3
+    landlord, _, listing = parties
+    api_client.force_authenticate(user=landlord)
+    url = "/api/bookings/bulk-confirm/"
+    assert api_client.post(url, {}, format="json").status_code == 400
+    assert api_client.post(url, {"ids": [1], "listing": listing.id}, format="json").status_code == 400
+    assert api_client.post(url, {"ids": [1, 2, 3, 4]}, format="json").status_code == 400
+    resp = api_client.post(url, {"start_from": str(in_days(5)), "start_to": str(in_days(1))}, format="json")
+    assert resp.status_code == 400 and "start_to" in resp.data
+    api_client.force_authenticate(user=None)
+    assert api_client.post(url, {"ids": [1]}, format="json").status_code in (401, 403)
@@ -0,0 +1,100 @@
+from datetime import date, timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from model_bakery import baker
+
+from bookings.models import Booking
+
+URL = "/api/bookings/"
+
+
+@pytest.fixture
+def mixed_user(user_with_profile):
+    """A landlord who also books elsewhere, with bookings interleaved in time."""
+    user = user_with_profile(username="both", role="landlord")
+    guest = user_with_profile(username="guest", role="tenant")
+    own_listings = baker.make("listings.Listing", landlord=user, status="available", _quantity=2)
+    elsewhere = baker.make("listings.Listing", status="available")
+    now = timezone.now()
+    expected = []
+    for i in range(9):
+        if i % 3 == 0:
+            listing, tenant = elsewhere, user
+        else:
+            listing, tenant = own_listings[i % 2], guest
+        start = date.today() + timedelta(days=10 + 3 * i)
+        booking = baker.make("bookings.Booking", listing=listing, tenant=tenant,
+                             start_date=start, end_date=start + timedelta(days=2))
+        # Two bookings share created_at: the id tie-breaker keeps pages stable
+        Booking.objects.filter(pk=booking.pk).update(created_at=now - timedelta(hours=i // 2 * 2))
+        expected.append(booking)
+    # Not visible: someone else's booking on someone else's listing
+    baker.make("bookings.Booking", listing=elsewhere, tenant=guest,
+               start_date=date.today() + timedelta(days=100), end_date=date.today() + timedelta(days=102))
+    expected = sorted(
+        Booking.objects.filter(pk__in=[b.pk for b in expected]).values_list("created_at", "id"), reverse=True
+    )
+    return user, [pk for _, pk in expected]
+
+
+@pytest.mark.django_db
+def test_union_pages_match_ordered_visibility(api_client, mixed_user):
+    user, expected = mixed_user
+    api_client.force_authenticate(user=user)
+    api_client.get(URL)  # warm-up (profile, session)
+
+    with CaptureQueriesContext(connection) as ctx:
+        first = api_client.get(URL)
+    assert first.status_code == 200
+    sql = [q["sql"] for q in ctx.captured_queries if "bookings_booking" in q["sql"]]
+    # COUNT over the union, the page candidates, the page rows by primary key
+    assert len(sql) == 3
+    assert all("DISTINCT" not in q for q in sql)
+    assert "UNION" in sql[0] and "UNION" in sql[1]
+
+    second = api_client.get(URL, {"page": 2})
+    assert first.data["count"] == second.data["count"] == 9
+    ids = [b["id"] for b in first.data["results"]] + [b["id"] for b in second.data["results"]]
+    assert ids == expected
+
+
+@pytest.mark.django_db
+def test_union_respects_ordering_param_and_falls_back(api_client, mixed_user):
+    user, expected = mixed_user
+    api_client.force_authenticate(user=user)
+    by_start = sorted(Booking.objects.filter(pk__in=expected).values_list("start_date", "id"), reverse=True)
+
+    r = api_client.get(URL, {"ordering": "-start_date", "page": 2})
+    assert [b["id"] for b in r.data["results"]] == [pk for _, pk in by_start][5:]
+
+    # A relation can't be ordered on a UNION: the join-free filter serves the page instead
+    r = api_client.get(URL, {"ordering": "listing"})
+    assert r.status_code == 200
+    assert r.data["count"] == 9
+
+
+@pytest.mark.django_db
+def test_list_not_modified_through_union(api_client, mixed_user):
+    user, _ = mixed_user
+    api_client.force_authenticate(user=user)
+    r = api_client.get(URL)
+    assert api_client.get(URL, HTTP_IF_NONE_MATCH=r["ETag"]).status_code == 304
+
+
+@pytest.mark.django_db
+def test_benchmark_command_seeds_small_catalogs():
+    out = StringIO()
+    call_command(
+        "benchmark_booking_visibility", "--landlords", "2", "--tenants", "3", "--bookings", "40",
+        "--heavy-listings", "2", "--heavy-bookings", "10", "--repeat", "1", stdout=out,
+    )
+    assert "seeded 50 bookings" in out.getvalue()
+    assert Booking.objects.count() == 0  # rolled back
+
+    with pytest.raises(CommandError):
+        call_command("benchmark_booking_visibility", "--tenants", "0")
@@ -0,0 +1,233 @@
+"""
+Booking state machine.
+
+Every transition is a single compare-and-set statement:
+
+    UPDATE bookings_booking SET status = <target>, updated_at = <now>
+    WHERE id IN (...) AND status IN (<sources>) AND <actor rules> AND <date rules>
+
+so two actors racing on the same booking can never both win: the database applies the
+first UPDATE, the second one matches no row. Which ids were changed is read back in one
+SELECT (rows now carrying the exact `updated_at` this call wrote), in the same transaction as
+the UPDATE: the changed rows stay locked until commit, and if the SELECT fails the UPDATE is
+rolled back, so the reported outcome is always what was written. The remaining ids are
+classified (not_found / forbidden / conflict / too_late) from their current row, with the
+same rules and messages the single-item actions always had.
+
+`apply_transition(name, user, ids)` is the set-based API (one UPDATE + one SELECT per
+BOOKING_TRANSITION_BATCH_SIZE ids); `transition(name, user, booking_id)` is the single-booking
+shortcut used by BookingViewSet.confirm/reject/cancel, and `matching_ids(...)` selects the
+bookings of a bulk action given by filter (BookingViewSet.bulk_confirm/bulk_reject/bulk_cancel).
+
+Rules:
+- confirm: pending -> confirmed; listing's landlord or admin.
+- reject:  pending -> rejected;  listing's landlord or admin.
+- cancel:  -> cancelled, before check-in and at least BOOKING_CANCEL_DEADLINE_DAYS before it;
+           tenant (not once confirmed), listing's landlord or admin.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from listings import cache as listing_cache
+from listings.models import Listing
+from . import concurrency
+from .availability import BUSY_STATUSES
+from .choices import BookingStatus
+from .models import Booking
+
+SUCCESS = "ok"
+NOT_FOUND = "not_found"
+FORBIDDEN = "forbidden"
+CONFLICT = "conflict"
+TOO_LATE = "too_late"
+
+DEFAULT_BATCH_SIZE = 500  # ids per UPDATE/SELECT pair: keeps IN (...) lists well under bind-parameter limits
+
+
+class Transition:
+    def __init__(self, name, target, landlord_sources, tenant_sources=(), deadline=False, conflict_message=""):
+        self.name = name
+        self.target = target
+        self.landlord_sources = tuple(landlord_sources)  # also used for admins
+        self.tenant_sources = tuple(tenant_sources)
+        self.deadline = deadline
+        self.conflict_message = conflict_message
+
+
+TRANSITIONS = {
+    "confirm": Transition(
+        "confirm",
+        BookingStatus.CONFIRMED,
+        landlord_sources=[BookingStatus.PENDING],
+        conflict_message="Only bookings with status 'pending' can be confirmed.",
+    ),
+    "reject": Transition(
+        "reject",
+        BookingStatus.REJECTED,
+        landlord_sources=[BookingStatus.PENDING],
+        conflict_message="Only bookings with status PENDING can be REJECTED.",
+    ),
+    "cancel": Transition(
+        "cancel",
+        BookingStatus.CANCELLED,
+        landlord_sources=[BookingStatus.PENDING, BookingStatus.CONFIRMED, BookingStatus.REJECTED],
+        tenant_sources=[BookingStatus.PENDING, BookingStatus.REJECTED],
+        deadline=True,
+        conflict_message="Booking is already canceled.",
+    ),
+}
+
+
+class Outcome:
+    """Result of one booking: `outcome` is one of the constants above; `detail` is the client message."""
+
+    def __init__(self, booking_id, outcome, detail="", status=None):
+        self.booking_id = booking_id
+        self.outcome = outcome
+        self.detail = detail
+        self.status = status
+
+    @property
+    def ok(self):
+        return self.outcome == SUCCESS
+
+    def as_dict(self):
+        data = {"id": self.booking_id, "outcome": self.outcome}
+        if self.detail:
+            data["detail"] = self.detail
+        if self.status:
+            data["status"] = self.status
+        return data
+
+
+def is_admin(user):
+    return user.is_staff or user.is_superuser
+
+
+def earliest_cancellable_start(today=None):
+    """Bookings starting on or after this day can still be cancelled."""
+    today = today or timezone.localdate()
+    deadline = getattr(settings, "BOOKING_CANCEL_DEADLINE_DAYS", 0)
+    return today + timedelta(days=max(deadline, 1))
+
+
+def _actor_condition(transition, user):
+    if is_admin(user):
+        return Q(status__in=transition.landlord_sources)
+    # A subquery on listings (not a join): MySQL can then run the UPDATE in one statement
+    owned = Q(listing_id__in=Listing.objects.filter(landlord_id=user.pk).values("pk"))
+    condition = owned & Q(status__in=transition.landlord_sources)
+    if transition.tenant_sources:
+        condition |= Q(tenant_id=user.pk, status__in=transition.tenant_sources)
+    return condition
+
+
+def _classify(transition, user, row, today):
+    """Why the UPDATE did not match an existing booking, with the single-action messages."""
+    admin = is_admin(user)
+    is_landlord = row["listing__landlord_id"] == user.pk
+    is_tenant = row["tenant_id"] == user.pk
+    if not (admin or is_landlord or is_tenant):
+        return NOT_FOUND, "Not found."
+    if not transition.tenant_sources and not (admin or is_landlord):
+        return FORBIDDEN, "Insufficient permissions."
+    if transition.deadline:
+        if row["start_date"] <= today:
+            return TOO_LATE, "Booking has already started; cannot cancel."
+        if row["status"] == transition.target:
+            return CONFLICT, transition.conflict_message
+        if row["status"] == BookingStatus.EXPIRED:
+            return CONFLICT, "Booking has expired."
+        if row["status"] == BookingStatus.CONFIRMED and not (admin or is_landlord):
+            return FORBIDDEN, "Only landlord or admin can cancel a confirmed booking."
+        if row["start_date"] < earliest_cancellable_start(today):
+            deadline = getattr(settings, "BOOKING_CANCEL_DEADLINE_DAYS", 0)
+            return TOO_LATE, f"Too late to cancel. Deadline is {deadline} day(s) before check-in."
+    return CONFLICT, transition.conflict_message
+
+
+def _condition(transition, user, today):
+    condition = _actor_condition(transition, user)
+    if transition.deadline:
+        condition &= Q(start_date__gte=earliest_cancellable_start(today))
+    return condition
+
+
+def _apply_batch(transition, user, ids, today, now, outcomes, changed):
+    batch_outcomes, batch_changed, released = {}, [], []
+    with transaction.atomic():
+        Booking.objects.filter(Q(pk__in=ids) & _condition(transition, user, today)).update(
+            status=transition.target, updated_at=now
+        )
+        rows = Booking.objects.filter(pk__in=ids).values(
+            "pk", "status", "updated_at", "start_date", "tenant_id", "listing_id", "listing__landlord_id"
+        )
+        for row in rows:
+            if row["status"] == transition.target and row["updated_at"] == now:
+                batch_outcomes[row["pk"]] = Outcome(row["pk"], SUCCESS, status=transition.target)
+                batch_changed.append((row["listing_id"], row["listing__landlord_id"]))
+                released.append(row["pk"])
+            else:
+                outcome, detail = _classify(transition, user, row, today)
+                batch_outcomes[row["pk"]] = Outcome(row["pk"], outcome, detail, row["status"])
+        if transition.target not in BUSY_STATUSES:
+            concurrency.release(released)
+    # Only record the batch once it is committed
+    outcomes.update(batch_outcomes)
+    changed.extend(batch_changed)
+
+
+def apply_transition(name, user, ids):
+    """
+    Apply transition `name` to the bookings `ids` on behalf of `user`.
+    Returns {booking_id: Outcome} for every requested id, in the order given.
+    """
+    transition = TRANSITIONS[name]
+    ids = list(dict.fromkeys(int(i) for i in ids))
+    if not ids:
+        return {}
+    today = timezone.localdate()
+    now = timezone.now()
+    batch_size = getattr(settings, "BOOKING_TRANSITION_BATCH_SIZE", DEFAULT_BATCH_SIZE)
+
+    found = {}
+    changed = []
+    for i in range(0, len(ids), batch_size):
+        _apply_batch(transition, user, ids[i:i + batch_size], today, now, found, changed)
+    outcomes = {
+        booking_id: found.get(booking_id) or Outcome(booking_id, NOT_FOUND, "Not found.")
+        for booking_id in ids
+    }
+
+    if changed:
+        # queryset.update() sends no post_save: bump calendars and dashboards here
+        listing_cache.bookings_changed(changed)
+    return outcomes
+
+
+def matching_ids(name, user, listing_id=None, start_from=None, start_to=None, limit=None):
+    """
+    Ids (ascending) of the bookings transition `name` can currently be applied to by `user`,
+    optionally restricted to one listing and/or a check-in window (inclusive days).
+    Only applicable bookings are returned, so repeating a bulk action by filter converges.
+    """
+    transition = TRANSITIONS[name]
+    qs = Booking.objects.filter(_condition(transition, user, timezone.localdate()))
+    if listing_id is not None:
+        qs = qs.filter(listing_id=listing_id)
+    if start_from is not None:
+        qs = qs.filter(start_date__gte=start_from)
+    if start_to is not None:
+        qs = qs.filter(start_date__lte=start_to)
+    qs = qs.order_by("pk").values_list("pk", flat=True)
+    return list(qs[:limit] if limit is not None else qs)
+
+
+def transition(name, user, booking_id):
+    if not str(booking_id).isdigit():
+        return Outcome(booking_id, NOT_FOUND, "Not found.")
+    return apply_transition(name, user, [booking_id])[int(booking_id)]
@@ -1,23 +1,22 @@
 from django.conf import settings
-from django.db import transaction
-from django.db.models import Q
-from django.utils import timezone
 
 from rest_framework import viewsets, permissions, status as drf_status
 from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 
-from listings.models import Listing
 from .choices import BookingStatus
-from .models import Booking
-from .serializers import BookingSerializer
+from . import concurrency, transitions, visibility
+from .bulk import create_bookings
+from .serializers import BookingBulkCreateSerializer, BookingBulkTransitionSerializer, BookingSerializer
+from utils.conditional import ConditionalGetMixin
 from utils.permissions import IsBookingActorOrAdmin
 
 
-class BookingViewSet(viewsets.ModelViewSet):
+class BookingViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     CRUD + actions for bookings.
+    GET list/detail support ETag / Last-Modified (304 when nothing changed).
 
     Visibility (get_queryset):
       - Admin/staff: all bookings.
@@ -27,14 +26,25 @@ class BookingViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated, IsBookingActorOrAdmin]
 
     def get_queryset(self):
-        user = self.request.user
-        qs = Booking.objects.select_related("listing")
-        if user.is_staff or user.is_superuser:
-            return qs
-        # Non-admins: see (a) own bookings, (b) bookings for their listings
-        return qs.filter(
-            Q(tenant_id=user.pk) | Q(listing__landlord_id=user.pk)
-        ).distinct()
+        # Non-admins: see (a) own bookings, (b) bookings for their listings (join-free, see visibility.py)
+        return visibility.visible_bookings(self.request.user).select_related("listing")
+
+    def list(self, request, *args, **kwargs):
+        """
+        Non-admins: the page is picked from a UNION of the tenant and landlord branches
+        (each served by its own index), then only its rows are loaded.
+        """
+        user = request.user
+        queryset = self.filter_queryset(self.get_queryset())
+        if transitions.is_admin(user):
+            return self.conditional_list_response(request, queryset)
+        branches = [self.filter_queryset(branch) for branch in visibility.branches(user)]
+        ordering = visibility.union_ordering(branches[0])
+        if ordering is None:
+            # e.g. ?ordering=listing (a relation): not expressible on a UNION
+            return self.conditional_list_response(request, queryset)
+        light = visibility.BranchUnion(branches, ordering, {"pk", self.version_field})
+        return self.conditional_list_response(request, queryset, light=light)
 
     def perform_create(self, serializer):
         user = self.request.user
@@ -44,59 +54,112 @@ class BookingViewSet(viewsets.ModelViewSet):
         if listing.landlord_id == user.pk:
             raise ValidationError({"detail": "You cannot book your own listing."})
 
-        # Concurrency guard: lock the listing row while saving the booking
-        # (SQLite: no-op; MySQL/Postgres: proper row-level lock)
-        with transaction.atomic():
-            Listing.objects.select_for_update().get(pk=listing.pk)
-            serializer.save(tenant=user)
+        # Concurrency guard: listing row lock, night claims or retries (BOOKING_CONCURRENCY)
+        concurrency.save_booking(serializer, tenant=user)
 
     def perform_update(self, serializer):
-        # Lock the related listing to avoid race conditions while updating
-        with transaction.atomic():
-            listing = serializer.validated_data.get("listing") or serializer.instance.listing
-            Listing.objects.select_for_update().get(pk=listing.pk)
-            serializer.save()
+        concurrency.save_booking(serializer)
 
     # ----------------- helpers -----------------
 
-    def _is_admin(self, user):
-        return user.is_staff or user.is_superuser
+    _OUTCOME_STATUS = {
+        transitions.NOT_FOUND: drf_status.HTTP_404_NOT_FOUND,
+        transitions.FORBIDDEN: drf_status.HTTP_403_FORBIDDEN,
+        transitions.CONFLICT: drf_status.HTTP_400_BAD_REQUEST,
+        transitions.TOO_LATE: drf_status.HTTP_400_BAD_REQUEST,
+    }
+
+    def _transition_error(self, outcome):
+        body = {"detail": outcome.detail}
+        if outcome.outcome == transitions.CONFLICT:
+            body["current_status"] = outcome.status
+        return Response(body, status=self._OUTCOME_STATUS[outcome.outcome])
+
+    def _bulk_transition(self, request, name):
+        params = BookingBulkTransitionSerializer(data=request.data)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+        has_more = False
+        if "ids" in data:
+            ids = data["ids"]
+        else:
+            limit = getattr(settings, "BOOKING_BULK_TRANSITION_MAX_IDS", 5000)
+            ids = transitions.matching_ids(
+                name,
+                request.user,
+                listing_id=data.get("listing"),
+                start_from=data.get("start_from"),
+                start_to=data.get("start_to"),
+                limit=limit + 1,
+            )
+            has_more = len(ids) > limit
+            ids = ids[:limit]
+
+        outcomes = transitions.apply_transition(name, request.user, ids).values()
+        counts = {}
+        for outcome in outcomes:
+            counts[outcome.outcome] = counts.get(outcome.outcome, 0) + 1
+        return Response({
+            "action": name,
+            "counts": counts,
+            "has_more": has_more,
+            "results": [outcome.as_dict() for outcome in outcomes],
+        })
 
-    def _is_landlord_of(self, user, booking):
-        return getattr(booking.listing, "landlord_id", None) == user.pk
+    # ----------------- actions -----------------
 
-    def _is_tenant_of(self, user, booking):
-        return getattr(booking, "tenant_id", None) == user.pk
+    @action(detail=False, methods=["post"])
+    def bulk(self, request):
+        """
+        Create several bookings at once: {"items": [{"listing", "start_date", "end_date"}, ...]}.
+        Listings are locked once, overlaps are checked for the whole batch (including
+        between its own items) and the bookings are inserted together.
+        Per-item results; 201 if at least one booking was created, otherwise 400.
+        """
+        envelope = BookingBulkCreateSerializer(data=request.data)
+        envelope.is_valid(raise_exception=True)
+        results, created = create_bookings(request.user, envelope.validated_data["items"])
+        return Response(
+            {"created": created, "results": results},
+            status=drf_status.HTTP_201_CREATED if created else drf_status.HTTP_400_BAD_REQUEST,
+        )
 
-    # ----------------- actions -----------------
+    @action(detail=False, methods=["post"], url_path="bulk-confirm")
+    def bulk_confirm(self, request):
+        """
+        Confirm many bookings: {"ids": [...]} or {"listing", "start_from", "start_to"}.
+        Same rules as confirm/, applied with set-based UPDATEs; per-id outcomes
+        ("ok", "not_found", "forbidden", "conflict", "too_late"). A filter selects at most
+        BOOKING_BULK_TRANSITION_MAX_IDS bookings; "has_more" tells to call again.
+        """
+        return self._bulk_transition(request, "confirm")
+
+    @action(detail=False, methods=["post"], url_path="bulk-reject")
+    def bulk_reject(self, request):
+        """Reject many bookings; same body and response as bulk-confirm/."""
+        return self._bulk_transition(request, "reject")
+
+    @action(detail=False, methods=["post"], url_path="bulk-cancel")
+    def bulk_cancel(self, request):
+        """Cancel many bookings (BOOKING_CANCEL_DEADLINE_DAYS applies); same body and response as bulk-confirm/."""
+        return self._bulk_transition(request, "cancel")
 
     @action(detail=True, methods=["get", "post"])
     def confirm(self, request, pk=None):
         """
         Confirm a booking — allowed for the listing's landlord or admins.
-        GET: hint message. POST: changes status to CONFIRMED.
+        GET: hint message. POST: changes status to CONFIRMED (one conditional UPDATE, see transitions.py).
         """
-        booking = self.get_object()
-        user = request.user
-
         if request.method == "GET":
+            booking = self.get_object()
             return Response({
                 "detail": "Use POST to confirm the booking.",
                 "current_status": booking.status,
             })
 
-        if not (self._is_admin(user) or self._is_landlord_of(user, booking)):
-            return Response({"detail": "Insufficient permissions."}, status=drf_status.HTTP_403_FORBIDDEN)
-
-        # Only pending bookings can be confirmed
-        if booking.status != BookingStatus.PENDING:
-            return Response(
-                {"detail": "Only bookings with status 'pending' can be confirmed."},
-                status=drf_status.HTTP_400_BAD_REQUEST,
-            )
-
-        booking.status = BookingStatus.CONFIRMED
-        booking.save(update_fields=["status"])
+        outcome = transitions.transition("confirm", request.user, pk)
+        if not outcome.ok:
+            return self._transition_error(outcome)
         return Response({"status": BookingStatus.CONFIRMED},
                         status=drf_status.HTTP_200_OK)
 
@@ -104,46 +167,13 @@ class BookingViewSet(viewsets.ModelViewSet):
     def cancel(self, request, pk=None):
         """
         Cancel a booking.
-        Allowed for: admin/staff, tenant (owner of booking), or landlord of the listing.
+        Allowed for: admin/staff, tenant (owner of booking), or landlord of the listing;
+        a confirmed booking only by the landlord or admin; not after BOOKING_CANCEL_DEADLINE_DAYS.
         """
-        booking = self.get_object()
-        user = request.user
-
-
-        is_admin = user.is_staff or user.is_superuser
-        is_tenant = getattr(booking, "tenant_id", None) == user.pk
-        is_landlord = getattr(booking.listing, "landlord_id", None) == user.pk
-        if not (is_admin or is_tenant or is_landlord):
-            return Response({"detail": "Insufficient permissions."}, status=drf_status.HTTP_403_FORBIDDEN)
-
-        # cannot be cancelled retroactively / after the start
-        today = timezone.localdate()
-        if booking.start_date <= today:
-            return Response({"detail": "Booking has already started; cannot cancel."},
-                            status=drf_status.HTTP_400_BAD_REQUEST)
-
-        # check the current status
-        if booking.status == BookingStatus.CANCELLED:
-            return Response({"detail": "Booking is already canceled."},
-                            status=drf_status.HTTP_400_BAD_REQUEST)
-
-        # (opt.) prohibition on cancellation of CONFIRMED by ordinary tenant:
-        if booking.status == BookingStatus.CONFIRMED and not (is_admin or is_landlord):
-            return Response({"detail": "Only landlord or admin can cancel a confirmed booking."},
-                            status=drf_status.HTTP_403_FORBIDDEN)
-
-        deadline = getattr(settings, "BOOKING_CANCEL_DEADLINE_DAYS", 0)
-        days_to_start = (booking.start_date - today).days
-        # We block if there are LESS than the deadline days left
-        if days_to_start < deadline:
-            return Response(
-                {"detail": f"Too late to cancel. Deadline is {deadline} day(s) before check-in."},
-                status=drf_status.HTTP_400_BAD_REQUEST,
-            )
-
-        booking.status = BookingStatus.CANCELLED
-        booking.save(update_fields=["status"])
-        return Response({"detail": "Booking canceled.", "status": booking.status})
+        outcome = transitions.transition("cancel", request.user, pk)
+        if not outcome.ok:
+            return self._transition_error(outcome)
+        return Response({"detail": "Booking canceled.", "status": BookingStatus.CANCELLED})
 
     @action(detail=True, methods=['get', 'post'])
     def reject(self, request, pk=None):
@@ -152,31 +182,14 @@ class BookingViewSet(viewsets.ModelViewSet):
         Only 'pending' bookings can be rejected.
         GET: hint message. POST: changes status to REJECT.
         """
-        booking = self.get_object()
-        user = request.user
-
         if request.method == 'GET':
+            booking = self.get_object()
             return Response({"detail": "Use POST to REJECT the booking.",
                              "current_status": booking.status})
 
-        if not (self._is_admin(user) or self._is_landlord_of(user, booking)):
-            return Response(
-                {'detail': 'Insufficient permissions.'},
-                status=drf_status.HTTP_403_FORBIDDEN
-            )
-
-        if booking.status != BookingStatus.PENDING:
-            return Response(
-                {
-                    'detail': 'Only bookings with status PENDING can be REJECTED.',
-                    'current_status': booking.status
-                },
-                status=drf_status.HTTP_400_BAD_REQUEST
-            )
-
-        booking.status = BookingStatus.REJECTED
-        booking.save(update_fields=['status'])
-
+        outcome = transitions.transition("reject", request.user, pk)
+        if not outcome.ok:
+            return self._transition_error(outcome)
         return Response(
             {'detail': BookingStatus.REJECTED},
             status=drf_status.HTTP_200_OK
@@ -0,0 +1,90 @@
+"""
+Which bookings a user sees (BookingViewSet).
+
+A non-admin sees the bookings they made (tenant) and the bookings of their listings
+(landlord). As one `tenant = X OR listing.landlord = X` over a join plus DISTINCT, neither
+index can be used and the whole result is sorted; instead:
+
+- `visible_bookings(user)` is a join-free filter (`tenant_id = X OR listing_id IN (SELECT id
+  FROM listings WHERE landlord_id = X)`), no DISTINCT needed: used for detail lookups,
+  actions and for loading the rows of a page by primary key;
+- `BranchUnion` serves list pages: the two branches run separately (Booking(tenant,
+  created_at) index / the landlord's listings -> Booking(listing, ...) indexes) and are
+  merged with `UNION`, which also drops a booking present in both. Where the database allows
+  LIMIT inside a compound statement (MySQL, PostgreSQL), each branch is cut to the end of
+  the requested page first, so a heavy landlord's first page does not read all their
+  bookings. The count is `COUNT(*)` over the un-cut union.
+"""
+from django.db import connection
+from django.db.models import Q
+
+from listings.models import Listing
+from .models import Booking
+from .transitions import is_admin
+
+# Tie-breaker appended to every ordering, so pages never overlap or skip rows
+TIEBREAK = "-id"
+
+
+def visible_bookings(user):
+    qs = Booking.objects.all()
+    if is_admin(user):
+        return qs
+    return qs.filter(Q(tenant_id=user.pk) | Q(listing_id__in=Listing.objects.filter(landlord_id=user.pk).values("pk")))
+
+
+def branches(user):
+    """The two visibility branches of a non-admin, as separate querysets."""
+    return [
+        Booking.objects.filter(tenant_id=user.pk),
+        Booking.objects.filter(listing__landlord_id=user.pk),
+    ]
+
+
+def union_ordering(queryset):
+    """
+    The ordering of `queryset` (explicit or Meta.ordering) + TIEBREAK, or None when it can't be
+    applied to a UNION (anything but plain local columns).
+    """
+    ordering = list(queryset.query.order_by or Booking._meta.ordering)
+    columns = {f.name for f in Booking._meta.concrete_fields if not f.is_relation} | {"pk"}
+    if not all(isinstance(o, str) and o.lstrip("-") in columns for o in ordering):
+        return None
+    ordering = ["-id" if o == "-pk" else "id" if o == "pk" else o for o in ordering]
+    if not {"id", "-id"} & set(ordering):
+        ordering.append(TIEBREAK)
+    return ordering
+
+
+class BranchUnion:
+    """
+    A sliceable, countable sequence (what Django's Paginator needs) over the UNION of
+    `branch_querysets`, ordered by `ordering`. Rows only carry `fields`.
+    """
+
+    def __init__(self, branch_querysets, ordering, fields):
+        self.fields = sorted(set(fields) | {"id"} | {o.lstrip("-") for o in ordering})
+        self.branches = [qs.select_related(None).order_by().only(*self.fields) for qs in branch_querysets]
+        self.ordering = ordering
+
+    def _union(self, limit=None):
+        branches = self.branches
+        if limit is not None and connection.features.supports_slicing_ordering_in_compound:
+            branches = [qs.order_by(*self.ordering)[:limit] for qs in branches]
+        return branches[0].union(*branches[1:]).order_by(*self.ordering)
+
+    def count(self):
+        return self._union().count()
+
+    def __len__(self):
+        return self.count()
+
+    def __iter__(self):
+        return iter(self._union())
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            if key.step is not None:
+                raise ValueError("Stepped slices are not supported.")
+            return list(self._union(key.stop)[key])
+        return self._union(key + 1)[key]
@@ -0,0 +1,144 @@
+import json
+from base64 import b64decode, b64encode
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.utils.urls import replace_query_param
+
+
+class CustomCursorPagination(CursorPagination):
+    """
+    Keyset pagination: no COUNT(*) and no OFFSET, so deep pages cost the same as the first one.
+
+    - The ordering comes from OrderingFilter (?ordering=price, ?ordering=-views_count, ...)
+      or falls back to `ordering` below; `id` is always appended as a tie-breaker,
+      so non-unique fields (price, views_count) page without gaps or duplicates.
+    - Full-text search results (queryset annotated with `search_rank`) are paged by relevance
+      unless an explicit ?ordering= is given.
+    - The cursor stores the ordering and the values of the last/first row of the page:
+      WHERE (f1, id) < (v1, last_id)  — written as an OR chain for portability.
+      A cursor issued for another ordering, or with values that don't parse as the ordering
+      fields, is rejected with 404.
+
+    Response shape: {"next": url|null, "previous": url|null, "results": [...]}.
+    """
+    ordering = "-created_at"
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    tie_breaker = "id"
+    relevance_field = "search_rank"
+
+    def get_ordering(self, request, queryset, view):
+        explicit = request.query_params.get("ordering")
+        if not explicit and self.relevance_field in queryset.query.annotations:
+            ordering = ("-" + self.relevance_field,)
+        else:
+            ordering = super().get_ordering(request, queryset, view)
+
+        fields = [f.lstrip("-") for f in ordering]
+        if self.tie_breaker not in fields and "pk" not in fields:
+            prefix = "-" if ordering[0].startswith("-") else ""
+            ordering = (*ordering, prefix + self.tie_breaker)
+        return tuple(ordering)
+
+    # ----------------- cursor encoding -----------------
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            payload = json.loads(b64decode(encoded.encode("ascii")).decode("utf-8"))
+            reverse = bool(payload["r"])
+            if payload["o"] != list(self.ordering) or len(payload["p"]) != len(self.ordering):
+                raise ValueError("The cursor belongs to another ordering.")
+            position = [self._parse(order, str(v)) for order, v in zip(self.ordering, payload["p"])]
+        except (TypeError, ValueError, KeyError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return reverse, position
+
+    def _parse(self, order, value):
+        """A cursor value as the Python value of its ordering field (ValidationError if it isn't one)."""
+        name = order.lstrip("-")
+        try:
+            field = self.model._meta.get_field("id" if name == "pk" else name)
+        except FieldDoesNotExist:
+            return float(value)  # annotations: search_rank
+        return field.to_python(value)
+
+    def encode_cursor(self, reverse, position):
+        payload = json.dumps({"r": int(reverse), "o": list(self.ordering), "p": position}, separators=(",", ":"))
+        encoded = b64encode(payload.encode("utf-8")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def _position(self, instance):
+        position = []
+        for order in self.ordering:
+            name = order.lstrip("-")
+            value = instance[name] if isinstance(instance, dict) else getattr(instance, name)
+            position.append(str(value))
+        return position
+
+    # ----------------- keyset filtering -----------------
+
+    def _after(self, position, reverse):
+        """
+        Q for rows strictly after `position` in the current ordering
+        (or strictly before it when paging backwards).
+        """
+        condition = Q(pk__in=[])
+        equal = Q()
+        for order, value in zip(self.ordering, position):
+            name = order.lstrip("-")
+            descending = order.startswith("-") != reverse
+            lookup = "lt" if descending else "gt"
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.model = queryset.model
+        self.cursor = self.decode_cursor(request)
+        reverse, position = self.cursor or (False, None)
+
+        if reverse:
+            queryset = queryset.order_by(*[o[1:] if o.startswith("-") else "-" + o for o in self.ordering])
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if position is not None:
+            queryset = queryset.filter(self._after(position, reverse))
+
+        # Fetch one extra row to know whether there is a following page
+        results = list(queryset[:self.page_size + 1])
+        has_following = len(results) > self.page_size
+        self.page = results[:self.page_size]
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = position is not None
+            self.has_previous = has_following
+        else:
+            self.has_next = has_following
+            self.has_previous = position is not None
+
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(False, self._position(self.page[-1]))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(True, self._position(self.page[0]))
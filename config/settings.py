@@ -151,7 +151,7 @@ REST_FRAMEWORK = {
     # "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
     # "PAGE_SIZE": 10,  # Acts as 'default_limit' for LimitOffsetPagination
 
-    # Custom cursor pagination (use full dotted path):
+    # Custom cursor pagination (use full dotted path; already used by the listings viewsets):
     # "DEFAULT_PAGINATION_CLASS": "config.paginations.CustomCursorPagination",
     # "PAGE_SIZE": 5,
 
@@ -186,6 +186,67 @@ SIMPLE_JWT = {
 # How many days before check-in a tenant can cancel a booking.
 # Example: 1 => cancellation allowed strictly before 1 day prior to start_date (not on the check-in day).
 BOOKING_CANCEL_DEADLINE_DAYS = 1  # 0 => allow until the day before check-in (excluding the check-in day)
+BOOKING_BULK_MAX_ITEMS = env.int("BOOKING_BULK_MAX_ITEMS", default=100)  # items per POST /api/bookings/bulk/
+BOOKING_BULK_TRANSITION_MAX_IDS = env.int("BOOKING_BULK_TRANSITION_MAX_IDS", default=5000)  # bookings per bulk-confirm/reject/cancel call
+BOOKING_TRANSITION_BATCH_SIZE = env.int("BOOKING_TRANSITION_BATCH_SIZE", default=500)  # ids per UPDATE of a transition
+BOOKING_PENDING_TTL_HOURS = env.int("BOOKING_PENDING_TTL_HOURS", default=72)  # unanswered PENDING -> EXPIRED (0 = never)
+BOOKING_EXPIRY_BATCH_SIZE = env.int("BOOKING_EXPIRY_BATCH_SIZE", default=500)  # bookings per expiry UPDATE
+BOOKING_EXPIRY_INTERVAL = env.int("BOOKING_EXPIRY_INTERVAL", default=300)  # seconds between sweeps of `expire_bookings --loop`
+# "lock" (listing row lock), "claims" (per-night unique rows), "retry" (SQLite) or "optimistic" (claims/retry by backend)
+BOOKING_CONCURRENCY = env("BOOKING_CONCURRENCY", default="lock")
+BOOKING_CONCURRENCY_RETRIES = env.int("BOOKING_CONCURRENCY_RETRIES", default=25)  # "retry" mode attempts after the first
+
+# Listings per grouped query of `manage.py recount_ratings` (reviews/ratings.py)
+REVIEWS_RECOUNT_CHUNK_SIZE = env.int("REVIEWS_RECOUNT_CHUNK_SIZE", default=1000)
+
+# Full-text search backend for listings (see listings/search.py):
+# "auto" => FULLTEXT on MySQL, FTS5 on SQLite, in-memory inverted index otherwise.
+LISTINGS_SEARCH_BACKEND = env("LISTINGS_SEARCH_BACKEND", default="auto")
+# In-memory backend: best-scored matches passed on to SQL (CASE/IN size)
+LISTINGS_SEARCH_MAX_CANDIDATES = env.int("LISTINGS_SEARCH_MAX_CANDIDATES", default=1000)
+
+# Response cache for anonymous listing reads (see listings/cache.py).
+# Point LISTINGS_CACHE_ALIAS at a shared cache (Redis/Memcached) when running several processes.
+LISTINGS_CACHE_ENABLED = env.bool("LISTINGS_CACHE_ENABLED", default=True)
+LISTINGS_CACHE_ALIAS = "default"
+LISTINGS_CACHE_LIST_TTL = env.int("LISTINGS_CACHE_LIST_TTL", default=60)  # seconds
+LISTINGS_CACHE_DETAIL_TTL = env.int("LISTINGS_CACHE_DETAIL_TTL", default=300)  # seconds
+LISTINGS_CACHE_STATS_TTL = env.int("LISTINGS_CACHE_STATS_TTL", default=300)  # seconds, landlord dashboard
+LISTINGS_CACHE_CALENDAR_TTL = env.int("LISTINGS_CACHE_CALENDAR_TTL", default=300)  # seconds, availability calendar
+# Bookings per query of the streamed iCal feed (/api/listings/my-listings/{id}/calendar.ics)
+LISTINGS_ICAL_CHUNK_SIZE = env.int("LISTINGS_ICAL_CHUNK_SIZE", default=1000)
+
+# How ListingViewSet.retrieve records view events (see analytics/recorder.py):
+# "buffered" => deduplicated in-process buffer flushed in batches by a background thread;
+# "sync" => written inline.
+ANALYTICS_VIEW_RECORDER = env("ANALYTICS_VIEW_RECORDER", default="buffered")
+ANALYTICS_VIEW_BUFFER_SIZE = env.int("ANALYTICS_VIEW_BUFFER_SIZE", default=500)  # events per flush
+ANALYTICS_VIEW_FLUSH_INTERVAL = env.int("ANALYTICS_VIEW_FLUSH_INTERVAL", default=5)  # seconds
+# Events kept for retry after a failed flush; the rest are dropped and counted in `failed`
+ANALYTICS_VIEW_MAX_PENDING = env.int("ANALYTICS_VIEW_MAX_PENDING", default=10000)
+
+# Search history logging (analytics/search_log.py): "async" (bounded queue + batch writer) or "sync"
+ANALYTICS_SEARCH_LOG = env("ANALYTICS_SEARCH_LOG", default="async")
+ANALYTICS_SEARCH_QUEUE_SIZE = env.int("ANALYTICS_SEARCH_QUEUE_SIZE", default=10000)  # max queued events
+ANALYTICS_SEARCH_BATCH_SIZE = env.int("ANALYTICS_SEARCH_BATCH_SIZE", default=200)  # rows per INSERT
+ANALYTICS_SEARCH_FLUSH_INTERVAL = env.int("ANALYTICS_SEARCH_FLUSH_INTERVAL", default=2)  # seconds
+# When the queue is full: "drop_newest" or "drop_oldest"
+ANALYTICS_SEARCH_SHED_POLICY = env("ANALYTICS_SEARCH_SHED_POLICY", default="drop_newest")
+
+# Trending keywords (analytics/trending.py): keywords tracked per window, DB checkpoint period
+ANALYTICS_TRENDING_CAPACITY = env.int("ANALYTICS_TRENDING_CAPACITY", default=200)
+ANALYTICS_TRENDING_CHECKPOINT_INTERVAL = env.int("ANALYTICS_TRENDING_CHECKPOINT_INTERVAL", default=30)  # seconds
+
+# Raw SearchHistory/ListingView retention (manage.py prune_analytics); run rollup_analytics first
+ANALYTICS_RAW_RETENTION_DAYS = env.int("ANALYTICS_RAW_RETENTION_DAYS", default=90)
+ANALYTICS_PRUNE_CHUNK_SIZE = env.int("ANALYTICS_PRUNE_CHUNK_SIZE", default=5000)  # rows per DELETE
+
+# Monthly occupancy report (manage.py occupancy_report, analytics/occupancy.py)
+ANALYTICS_OCCUPANCY_CHUNK_SIZE = env.int("ANALYTICS_OCCUPANCY_CHUNK_SIZE", default=2000)  # listings per query
+ANALYTICS_OCCUPANCY_MONTHS = env.int("ANALYTICS_OCCUPANCY_MONTHS", default=12)  # months rebuilt by default
+
+# Upper edges of the price buckets in /api/listings/listings/facets/ (last bucket is open-ended)
+LISTINGS_FACET_PRICE_BUCKETS = [500, 1000, 1500, 2000]
 
 
 LOG_FORMAT_VERBOSE = "[%(asctime)s] %(levelname)s %(name)s req=%(request_id)s user=%(user_id)s: %(message)s"
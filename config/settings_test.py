@@ -16,3 +16,7 @@ AUTH_PASSWORD_VALIDATORS = []
 EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
 
 DEBUG = True
+
+# Deterministic analytics in tests: write view events and search history inline
+ANALYTICS_VIEW_RECORDER = "sync"
+ANALYTICS_SEARCH_LOG = "sync"
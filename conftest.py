@@ -1,5 +1,6 @@
 import pytest
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from users.models import UserProfile
 from rest_framework.test import APIClient
 
@@ -20,6 +21,14 @@ Supports both paginated vocabulary and pure list.
     return _as_list
 
 
+@pytest.fixture(autouse=True)
+def clean_cache():
+    """Response caches and their version counters never leak from one test into another."""
+    cache.clear()
+    yield
+    cache.clear()
+
+
 @pytest.fixture
 def api_client():
     return APIClient()
@@ -0,0 +1,215 @@
+"""
+Cache-aside layer for anonymous reads of the public listings feed.
+
+Keys are versioned instead of being deleted:
+- `listings:v:catalog`      — bumped on any Listing save/delete (list + search pages);
+- `listings:v:listing:<id>` — bumped when that listing changes (detail page);
+- `listings:v:calendar:<id>` — bumped when that listing or one of its bookings changes (availability
+                               calendar: a listing leaving the public feed must stop serving it);
+- `listings:v:availability` — bumped with every calendar; part of list/search/facets keys only when
+                               ?check_in/?check_out filter by availability, which bookings decide;
+- `listings:v:landlord:<id>` — bumped when a listing, booking or review of that landlord changes
+                               (my-listings/stats dashboard).
+A bump makes every key built with the old version unreachable; stale entries simply expire.
+
+Settings:
+- LISTINGS_CACHE_ENABLED     (default True)
+- LISTINGS_CACHE_ALIAS       (default "default")
+- LISTINGS_CACHE_LIST_TTL    seconds for list/search pages (default 60)
+- LISTINGS_CACHE_DETAIL_TTL  seconds for detail pages (default 300)
+- LISTINGS_CACHE_STATS_TTL   seconds for the landlord dashboard (default 300)
+- LISTINGS_CACHE_CALENDAR_TTL seconds for availability calendars (default 300)
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.response import Response
+
+from utils.conditional import is_not_modified, not_modified_response
+
+CATALOG_VERSION_KEY = "listings:v:catalog"
+LISTING_VERSION_KEY = "listings:v:listing:{}"
+LANDLORD_VERSION_KEY = "listings:v:landlord:{}"
+CALENDAR_VERSION_KEY = "listings:v:calendar:{}"
+AVAILABILITY_VERSION_KEY = "listings:v:availability"
+AVAILABILITY_PARAMS = ("check_in", "check_out")
+STATS_KEY = "listings:stats:{}"
+# Validator headers stored next to the body, so a cache hit can still answer 304
+CACHED_HEADERS = ("ETag", "Last-Modified")
+
+
+def is_enabled():
+    return getattr(settings, "LISTINGS_CACHE_ENABLED", True)
+
+
+def get_cache():
+    return caches[getattr(settings, "LISTINGS_CACHE_ALIAS", "default")]
+
+
+def _incr(cache, key):
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Missing (or evicted) counter: start from the clock, never from 1,
+        # so a reset version can't collide with keys written before the eviction.
+        value = int(time.time() * 1000)
+        cache.set(key, value, timeout=None)
+        return value
+
+
+def _version(cache, key):
+    version = cache.get(key)
+    if version is None:
+        version = _incr(cache, key)
+    return version
+
+
+def bump_listing(listing_id):
+    """Invalidate the detail page and calendar of one listing and every list/search page."""
+    cache = get_cache()
+    _incr(cache, LISTING_VERSION_KEY.format(listing_id))
+    _incr(cache, CALENDAR_VERSION_KEY.format(listing_id))
+    _incr(cache, CATALOG_VERSION_KEY)
+
+
+def bump_landlord(landlord_id):
+    """Invalidate the dashboard of one landlord."""
+    _incr(get_cache(), LANDLORD_VERSION_KEY.format(landlord_id))
+
+
+def bump_calendar(listing_id):
+    """Invalidate the availability calendar of one listing and every availability-filtered page."""
+    cache = get_cache()
+    _incr(cache, CALENDAR_VERSION_KEY.format(listing_id))
+    _incr(cache, AVAILABILITY_VERSION_KEY)
+
+
+def bookings_changed(listings):
+    """
+    For bulk booking writes that bypass post_save (bulk_create, queryset.update()):
+    `listings` is an iterable of (listing_id, landlord_id). Calendars and landlord dashboards
+    are bumped now and once more after commit, like the signal handlers do.
+    """
+    listings = set(listings)
+
+    def bump():
+        for listing_id, landlord_id in listings:
+            bump_calendar(listing_id)
+        for landlord_id in {landlord_id for _, landlord_id in listings}:
+            bump_landlord(landlord_id)
+
+    bump()
+    transaction.on_commit(bump)
+
+
+def normalize_params(query_params):
+    """Stable representation of query params: sorted keys, sorted values, empty values dropped."""
+    items = []
+    for key in sorted(query_params.keys()):
+        values = sorted(v.strip() for v in query_params.getlist(key) if v.strip())
+        if values:
+            items.append(f"{key}={','.join(values)}")
+    return "&".join(items)
+
+
+def _params_digest(request):
+    # The host is part of the key because paginated responses embed absolute next/previous links
+    raw = f"{request.get_host()}?{normalize_params(request.query_params)}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def list_key(request, action):
+    cache = get_cache()
+    version = _version(cache, CATALOG_VERSION_KEY)
+    if any(request.query_params.get(name) for name in AVAILABILITY_PARAMS):
+        # Bookings don't touch the catalog version, but they change which listings are free
+        version = f"{version}.{_version(cache, AVAILABILITY_VERSION_KEY)}"
+    return f"listings:{action}:{version}:{_params_digest(request)}"
+
+
+def detail_key(request, pk):
+    version = _version(get_cache(), LISTING_VERSION_KEY.format(pk))
+    return f"listings:detail:{pk}:{version}:{_params_digest(request)}"
+
+
+def stats_key(request, landlord_id):
+    version = _version(get_cache(), LANDLORD_VERSION_KEY.format(landlord_id))
+    return f"listings:stats:{landlord_id}:{version}:{_params_digest(request)}"
+
+
+def calendar_key(request, listing_id):
+    version = _version(get_cache(), CALENDAR_VERSION_KEY.format(listing_id))
+    return f"listings:calendar:{listing_id}:{version}:{_params_digest(request)}"
+
+
+def record(outcome):
+    """Count a cache 'hit' or 'miss'."""
+    cache = get_cache()
+    key = STATS_KEY.format(outcome)
+    if not cache.add(key, 1, timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=None)
+
+
+def stats():
+    cache = get_cache()
+    hits = cache.get(STATS_KEY.format("hit"), 0)
+    misses = cache.get(STATS_KEY.format("miss"), 0)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": round(hits / total, 4) if total else None,
+    }
+
+
+def reset_stats():
+    get_cache().delete_many([STATS_KEY.format("hit"), STATS_KEY.format("miss")])
+
+
+def cached_response(request, key_func, ttl, produce, anonymous_only=True):
+    """
+    Serve `produce()` through the cache for anonymous requests
+    (for everyone with anonymous_only=False, when the response is not user-specific).
+    Only 200 responses are stored.
+    """
+    if not is_enabled() or (anonymous_only and request.user.is_authenticated):
+        return produce()
+
+    cache = get_cache()
+    key = key_func()
+    entry = cache.get(key)
+    if entry is not None:
+        record("hit")
+        data, headers = entry
+        if is_not_modified(request, headers.get("ETag")):
+            return not_modified_response(headers)
+        return Response(data, headers=headers)
+
+    record("miss")
+    response = produce()
+    if response.status_code == 200:
+        headers = {name: response[name] for name in CACHED_HEADERS if name in response}
+        cache.set(key, (response.data, headers), timeout=ttl)
+    return response
+
+
+def list_ttl():
+    return getattr(settings, "LISTINGS_CACHE_LIST_TTL", 60)
+
+
+def detail_ttl():
+    return getattr(settings, "LISTINGS_CACHE_DETAIL_TTL", 300)
+
+
+def stats_ttl():
+    return getattr(settings, "LISTINGS_CACHE_STATS_TTL", 300)
+
+
+def calendar_ttl():
+    return getattr(settings, "LISTINGS_CACHE_CALENDAR_TTL", 300)
@@ -0,0 +1,70 @@
+"""
+Availability calendar of one listing (GET /api/listings/listings/{id}/calendar/?from=&to=).
+
+The PENDING/CONFIRMED bookings overlapping the range are loaded in one query (ordered by
+start_date, served by the Booking(listing, ...) date indexes, see bookings.availability) and merged
+into disjoint busy intervals. Intervals are half-open like bookings: `start` is the first
+busy night, `end` the first free one (a check-out day can be a check-in day).
+
+Two encodings are returned:
+- `busy`:   [{"start", "end"}] merged intervals, clipped to the range;
+- `months`: {"YYYY-MM": bitmask} with bit (day - 1) set when that night is busy.
+"""
+from datetime import timedelta
+
+from bookings.models import Booking
+from .filters import BUSY_BOOKING_STATUSES
+
+
+def merge_intervals(intervals):
+    """Merge sorted half-open (start, end) pairs; touching intervals are joined."""
+    merged = []
+    for start, end in intervals:
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
+
+
+def busy_intervals(listing_id, start, end):
+    """Busy nights of a listing between `start` and `end` (inclusive days), merged and clipped."""
+    until = end + timedelta(days=1)
+    rows = (
+        Booking.objects.filter(
+            listing_id=listing_id,
+            status__in=BUSY_BOOKING_STATUSES,
+            start_date__lt=until,
+            end_date__gt=start,
+        )
+        .order_by("start_date")
+        .values_list("start_date", "end_date")
+    )
+    return [(max(s, start), min(e, until)) for s, e in merge_intervals(rows)]
+
+
+def month_bitmasks(intervals, start, end):
+    months = {}
+    day = start.replace(day=1)
+    while day <= end:
+        months[day.strftime("%Y-%m")] = 0
+        day = (day + timedelta(days=32)).replace(day=1)
+    for s, e in intervals:
+        day = s
+        while day < e:
+            months[day.strftime("%Y-%m")] |= 1 << (day.day - 1)
+            day += timedelta(days=1)
+    return months
+
+
+def listing_calendar(listing_id, start, end):
+    intervals = busy_intervals(listing_id, start, end)
+    return {
+        "listing": listing_id,
+        "from": start,
+        "to": end,
+        "busy": [{"start": s, "end": e} for s, e in intervals],
+        "months": month_bitmasks(intervals, start, end),
+    }
+
@@ -0,0 +1,109 @@
+"""
+Facet counts for the public listings catalog (GET /api/listings/listings/facets/).
+
+Each facet is counted with every *other* active filter applied, but not its own
+(drill-down: choosing a city still shows how many listings the other cities have).
+Instead of one query per facet, two grouped queries are used:
+- A: price filter applied in SQL, GROUP BY (city, district, housing_type, rooms);
+     the four facets and their cross-filters are then resolved over the grouped rows in Python;
+- B: every filter except price, GROUP BY price bucket.
+"""
+from collections import defaultdict
+
+from django.conf import settings
+from django.db.models import Case, CharField, Count, Q, Value, When
+from django_filters.rest_framework import DjangoFilterBackend
+from django_filters.utils import translate_validation
+
+from .filters import ListingSearchFilter
+
+# facet -> query params that filter on it
+FACET_PARAMS = {
+    "location_city": ("location_city",),
+    "location_district": ("location_district",),
+    "housing_type": ("housing_type",),
+    "rooms": ("rooms__gte", "rooms__lte"),
+    "price": ("price__gte", "price__lte"),
+}
+GROUPED_FACETS = ("location_city", "location_district", "housing_type", "rooms")
+
+DEFAULT_PRICE_BUCKETS = (500, 1000, 1500, 2000)
+
+
+def price_buckets():
+    """[(label, low, high)] with high=None for the open-ended top bucket."""
+    edges = list(getattr(settings, "LISTINGS_FACET_PRICE_BUCKETS", DEFAULT_PRICE_BUCKETS))
+    buckets = []
+    low = 0
+    for high in edges:
+        buckets.append((f"{low}-{high}", low, high))
+        low = high
+    buckets.append((f"{low}+", low, None))
+    return buckets
+
+
+def _matches(row, facet, cleaned):
+    value = row[facet]
+    if facet == "rooms":
+        low, high = cleaned.get("rooms__gte"), cleaned.get("rooms__lte")
+        return (low is None or value >= low) and (high is None or value <= high)
+    wanted = cleaned.get(facet)
+    return wanted in (None, "") or value == wanted
+
+
+def compute_facets(view, request):
+    base = ListingSearchFilter().filter_queryset(request, view.get_queryset(), view).order_by()
+    filterset_class = DjangoFilterBackend().get_filterset_class(view, base)
+
+    def filtered(without):
+        data = request.query_params.copy()
+        for param in without:
+            data.pop(param, None)
+        filterset = filterset_class(data=data, queryset=base, request=request)
+        if not filterset.is_valid():
+            raise translate_validation(filterset.errors)
+        return filterset
+
+    # Parsed values of every active filter (validates the request like `list` does)
+    cleaned = filtered(()).form.cleaned_data
+
+    # Query A: everything but the four grouped facets is applied in SQL
+    qs_a = filtered([p for facet in GROUPED_FACETS for p in FACET_PARAMS[facet]]).qs
+    rows = list(qs_a.values(*GROUPED_FACETS).annotate(n=Count("id")))
+
+    counts = {facet: defaultdict(int) for facet in GROUPED_FACETS}
+    total = 0
+    for row in rows:
+        passing = {facet: _matches(row, facet, cleaned) for facet in GROUPED_FACETS}
+        if all(passing.values()):
+            total += row["n"]
+        for facet in GROUPED_FACETS:
+            others = all(ok for other, ok in passing.items() if other != facet)
+            if others:
+                counts[facet][row[facet]] += row["n"]
+
+    # Query B: price buckets with every filter but price
+    qs_b = filtered(FACET_PARAMS["price"]).qs
+    buckets = price_buckets()
+    whens = []
+    for label, low, high in buckets:
+        condition = Q(price__gte=low) if high is None else Q(price__gte=low, price__lt=high)
+        whens.append(When(condition, then=Value(label)))
+    price_rows = (
+        qs_b.annotate(bucket=Case(*whens, output_field=CharField()))
+        .values("bucket")
+        .annotate(n=Count("id"))
+    )
+    price_counts = {row["bucket"]: row["n"] for row in price_rows}
+
+    result = {"total": total}
+    for facet in GROUPED_FACETS:
+        result[facet] = [
+            {"value": value, "count": n}
+            for value, n in sorted(counts[facet].items(), key=lambda item: (-item[1], str(item[0])))
+        ]
+    result["price"] = [
+        {"value": label, "min": low, "max": high, "count": price_counts.get(label, 0)}
+        for label, low, high in buckets
+    ]
+    return result
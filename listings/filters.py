@@ -0,0 +1,89 @@
+import django_filters
+from django.db.models import Exists, OuterRef
+from rest_framework.filters import SearchFilter
+
+from bookings.availability import BUSY_STATUSES
+from bookings.models import Booking
+from .models import Listing
+from .search import get_search_backend
+
+# Bookings that make a listing unavailable for their dates
+BUSY_BOOKING_STATUSES = BUSY_STATUSES
+
+
+def order_by_relevance(request, queryset):
+    """Sort by `search_rank` unless the client asked for an explicit ?ordering=."""
+    if request.query_params.get("ordering"):
+        return queryset
+    return queryset.order_by("-search_rank", "-created_at")
+
+
+class ListingSearchFilter(SearchFilter):
+    """
+    Drop-in replacement for DRF's SearchFilter: the same `?search=` parameter,
+    but matching goes through the full-text backend (listings.search)
+    instead of `LIKE '%term%'` over `search_fields`.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+        queryset = get_search_backend().filter(queryset, " ".join(terms))
+        return order_by_relevance(request, queryset)
+
+
+def busy_bookings(check_in, check_out):
+    """PENDING/CONFIRMED bookings of the outer listing overlapping [check_in, check_out)."""
+    return Booking.objects.filter(
+        listing=OuterRef("pk"),
+        status__in=BUSY_BOOKING_STATUSES,
+        start_date__lt=check_out,  # same overlap rule as BookingSerializer.validate
+        end_date__gt=check_in,
+    )
+
+
+class ListingFilter(django_filters.FilterSet):
+    """
+    Field filters of the public feed + availability:
+    ?check_in=YYYY-MM-DD&check_out=YYYY-MM-DD keeps only listings without an overlapping
+    PENDING/CONFIRMED booking, as a single NOT EXISTS anti-join (served by the covering
+    Booking(listing, end_date, start_date, status) index, see bookings.availability).
+    """
+    check_in = django_filters.DateFilter(method="filter_noop")
+    check_out = django_filters.DateFilter(method="filter_noop")
+
+    class Meta:
+        model = Listing
+        fields = {
+            "status": ["exact"],
+            "location_city": ["exact"],
+            "location_district": ["exact"],
+            "rooms": ["gte", "lte"],
+            "housing_type": ["exact"],
+            "price": ["gte", "lte"],
+        }
+
+    def filter_noop(self, queryset, name, value):
+        # Both dates are applied together in filter_queryset()
+        return queryset
+
+    def is_valid(self):
+        valid = super().is_valid()
+        if valid:
+            check_in = self.form.cleaned_data.get("check_in")
+            check_out = self.form.cleaned_data.get("check_out")
+            if (check_in is None) != (check_out is None):
+                missing = "check_out" if check_out is None else "check_in"
+                self.form.add_error(missing, "check_in and check_out must be given together.")
+            elif check_in is not None and check_in >= check_out:
+                self.form.add_error("check_out", "check_out must be later than check_in.")
+        return valid and not self.form.errors
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        check_in = self.form.cleaned_data.get("check_in")
+        check_out = self.form.cleaned_data.get("check_out")
+        if check_in and check_out:
+            queryset = queryset.filter(~Exists(busy_bookings(check_in, check_out)))
+        return queryset
@@ -0,0 +1,145 @@
+"""
+iCalendar feed of a listing's bookings (GET /api/listings/my-listings/{id}/calendar.ics).
+
+External calendars poll the feed, so:
+- `with_feed_version(queryset)` annotates the listing with the latest change and the number of
+  its bookings (MAX(updated_at), COUNT over the Booking(listing, updated_at) index); together
+  with the listing's own `updated_at` they make the ETag/Last-Modified. A poll of an unchanged
+  calendar is one query and a 304. The count catches deleted bookings, which leave no
+  `updated_at` behind.
+- `feed()` streams the PENDING/CONFIRMED bookings as VEVENTs. Rows are read in keyset pages of
+  LISTINGS_ICAL_CHUNK_SIZE ordered by (start_date, id), each page through `.iterator()`, so
+  memory stays flat however long the history is (MySQL drivers buffer a whole result set, even
+  with `.iterator()`, so a single query would not do).
+
+Events carry the stay dates and status only, never tenant data.
+"""
+from datetime import timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import Count, Max, Q
+from rest_framework.renderers import BaseRenderer
+
+from bookings.choices import BookingStatus
+from bookings.models import Booking
+from utils.conditional import make_etag
+from .filters import BUSY_BOOKING_STATUSES
+
+DEFAULT_CHUNK_SIZE = 1000
+PRODID = "-//HousingRent//Listing calendar//EN"
+CONTENT_TYPE = "text/calendar; charset=utf-8"
+SUMMARIES = {
+    BookingStatus.CONFIRMED: ("Booked", "CONFIRMED"),
+    BookingStatus.PENDING: ("Booking request", "TENTATIVE"),
+}
+
+
+class ICalendarRenderer(BaseRenderer):
+    """Lets `Accept: text/calendar` through content negotiation; errors are rendered as plain text."""
+    media_type = "text/calendar"
+    format = "ics"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if isinstance(data, dict) and "detail" in data:
+            data = data["detail"]
+        return str(data).encode(self.charset)
+
+
+def chunk_size():
+    return getattr(settings, "LISTINGS_ICAL_CHUNK_SIZE", DEFAULT_CHUNK_SIZE)
+
+
+def with_feed_version(queryset):
+    return queryset.annotate(bookings_changed_at=Max("bookings__updated_at"), bookings_count=Count("bookings"))
+
+
+def validators(listing):
+    """(ETag, Last-Modified) of an annotated listing (see `with_feed_version`)."""
+    changed = listing.bookings_changed_at
+    last_modified = max(listing.updated_at, changed) if changed else listing.updated_at
+    etag = make_etag(
+        "ical", listing.pk, listing.updated_at.isoformat(), changed.isoformat() if changed else None,
+        listing.bookings_count,
+    )
+    return etag, last_modified
+
+
+def escape(text):
+    return (
+        str(text).replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+        .replace("\r\n", "\\n").replace("\n", "\\n")
+    )
+
+
+def fold(line):
+    """Content line folded at 75 octets (RFC 5545 3.1), as CRLF-terminated bytes."""
+    data = line.encode("utf-8")
+    parts = []
+    while len(data) > 75:
+        cut = 75 if not parts else 74  # continuation lines start with a space
+        while cut and (data[cut] & 0xC0) == 0x80:  # don't split a UTF-8 sequence
+            cut -= 1
+        parts.append(data[:cut])
+        data = data[cut:]
+    parts.append(data)
+    return b"\r\n ".join(parts) + b"\r\n"
+
+
+def _stamp(moment):
+    return moment.astimezone(dt_timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _event(pk, start, end, status, updated_at, host):
+    summary, ical_status = SUMMARIES.get(status, ("Booked", "CONFIRMED"))
+    return b"".join(fold(line) for line in (
+        "BEGIN:VEVENT",
+        f"UID:booking-{pk}@{host}",
+        f"DTSTAMP:{_stamp(updated_at)}",
+        f"LAST-MODIFIED:{_stamp(updated_at)}",
+        f"DTSTART;VALUE=DATE:{start:%Y%m%d}",
+        f"DTEND;VALUE=DATE:{end:%Y%m%d}",
+        f"SUMMARY:{summary}",
+        f"STATUS:{ical_status}",
+        "TRANSP:OPAQUE",
+        "END:VEVENT",
+    ))
+
+
+def bookings(listing_id, size=None):
+    """(pk, start_date, end_date, status, updated_at) of the busy bookings, page by page."""
+    size = size or chunk_size()
+    base = (
+        Booking.objects.filter(listing_id=listing_id, status__in=BUSY_BOOKING_STATUSES)
+        .order_by("start_date", "pk")
+        .values_list("pk", "start_date", "end_date", "status", "updated_at")
+    )
+    after = None
+    while True:
+        page = base
+        if after is not None:
+            page = page.filter(Q(start_date__gt=after[1]) | Q(start_date=after[1], pk__gt=after[0]))
+        count = 0
+        for row in page[:size].iterator(chunk_size=size):
+            count += 1
+            after = row
+            yield row
+        if count < size:
+            return
+
+
+def feed(listing, host="housingrent", size=None):
+    """The calendar as a stream of byte chunks: header, one chunk per event, footer."""
+    yield b"".join(fold(line) for line in (
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{escape(listing.title)}",
+    ))
+    for row in bookings(listing.pk, size):
+        yield _event(*row, host)
+    yield fold("END:VCALENDAR")
@@ -0,0 +1,137 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Exists
+from django.utils import timezone
+
+from bookings.choices import BookingStatus
+from bookings.models import Booking
+from listings.choices import ListingStatus
+from listings.filters import busy_bookings
+from listings.models import Listing
+
+CITIES = ["Kyiv", "Odessa", "Lviv", "Dnipro", "Kharkiv", "Uman"]
+BATCH = 5000
+PAGE = 20
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the ?check_in=&check_out= availability filter (NOT EXISTS anti-join) against "
+        "probing bookings listing by listing. Synthetic data is rolled back at the end."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--listings", type=int, default=100_000)
+        parser.add_argument("--bookings", type=int, default=1_000_000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._run(**options)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _timed(self, repeat, func):
+        samples = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            result = func()
+            samples.append((time.perf_counter() - t0) * 1000)
+        return result, statistics.median(samples)
+
+    def _seed(self, listings, bookings, seed):
+        rng = random.Random(seed)
+        run = time.time_ns()
+        landlord = User.objects.create_user(username=f"bench-ll-{run}")
+        tenant = User.objects.create_user(username=f"bench-tt-{run}")
+        for offset in range(0, listings, BATCH):
+            Listing.objects.bulk_create(
+                Listing(
+                    landlord=landlord, title=f"bench-{run}-{i}", description="bench",
+                    location_city=CITIES[i % len(CITIES)], location_district="Center",
+                    price=Decimal(300 + i % 1500), rooms=1 + i % 4, status=ListingStatus.AVAILABLE,
+                )
+                for i in range(offset, min(offset + BATCH, listings))
+            )
+        ids = list(Listing.objects.filter(landlord=landlord).values_list("id", flat=True))
+
+        today = timezone.localdate()
+        per_listing = max(1, bookings // len(ids))
+        statuses = BookingStatus.values
+        batch = []
+        for listing_id in ids:
+            day = today + timedelta(days=rng.randint(0, 14))
+            for _ in range(per_listing):
+                nights = rng.randint(1, 7)
+                batch.append(Booking(
+                    listing_id=listing_id, tenant=tenant, start_date=day,
+                    end_date=day + timedelta(days=nights), status=rng.choice(statuses),
+                ))
+                day += timedelta(days=nights + rng.randint(0, 10))
+            if len(batch) >= BATCH:
+                Booking.objects.bulk_create(batch)
+                batch = []
+        Booking.objects.bulk_create(batch)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+        return len(ids) * per_listing
+
+    def _run(self, listings, bookings, repeat, seed, **_):
+        t0 = time.perf_counter()
+        created = self._seed(listings, bookings, seed)
+        self.stdout.write(f"seeded {listings} listings / {created} bookings in {time.perf_counter() - t0:.1f} s")
+
+        check_in = timezone.localdate() + timedelta(days=30)
+        check_out = check_in + timedelta(days=5)
+        self.stdout.write(f"stay {check_in}..{check_out}")
+        # The public feed's query shapes (rows already in the database take part too)
+        for label, filters in (("all cities", {}), ("location_city=Kyiv", {"location_city": "Kyiv"})):
+            base = Listing.objects.filter(status=ListingStatus.AVAILABLE, **filters).order_by("-created_at", "-id")
+            self._scenario(label, base, check_in, check_out, repeat)
+
+    def _scenario(self, label, base, check_in, check_out, repeat):
+        available = base.filter(~Exists(busy_bookings(check_in, check_out)))
+        page, anti_join_ms = self._timed(repeat, lambda: list(available.values_list("id", flat=True)[:PAGE]))
+        total, count_ms = self._timed(repeat, available.count)
+
+        def probe_one_by_one(limit):
+            # The previous approach: walk the listings and check each one for overlaps
+            found = []
+            for listing_id in base.values_list("id", flat=True).iterator():
+                overlapping = Booking.objects.filter(
+                    listing_id=listing_id,
+                    status__in=(BookingStatus.PENDING, BookingStatus.CONFIRMED),
+                    start_date__lt=check_out,
+                    end_date__gt=check_in,
+                ).exists()
+                if not overlapping:
+                    found.append(listing_id)
+                    if len(found) == limit:
+                        break
+            return found
+
+        probed, probe_page_ms = self._timed(repeat, lambda: probe_one_by_one(PAGE))
+        assert probed == page
+        probed_all, probe_all_ms = self._timed(1, lambda: probe_one_by_one(None))
+        assert len(probed_all) == total
+
+        self.stdout.write(f"\n[{label}] available: {total}")
+        self.stdout.write(f"  NOT EXISTS, first page of {PAGE}:       {anti_join_ms:.1f} ms")
+        self.stdout.write(f"  NOT EXISTS, COUNT(*):                  {count_ms:.1f} ms")
+        self.stdout.write(f"  per-listing probes, first page:        {probe_page_ms:.1f} ms")
+        self.stdout.write(f"  per-listing probes, all listings:      {probe_all_ms:.1f} ms")
+        self.stdout.write("  plan:\n" + available[:PAGE].explain())
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from listings.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index for all listings."
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Search index rebuilt ({backend.name} backend)."))
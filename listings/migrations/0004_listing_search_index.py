@@ -0,0 +1,43 @@
+from django.db import migrations, transaction
+from django.db.utils import OperationalError
+
+FTS_TABLE = "listings_listing_fts"
+FULLTEXT_INDEX = "listings_listing_fulltext"
+COLUMNS = "title, description, location_city, location_district"
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "mysql":
+        schema_editor.execute(
+            f"ALTER TABLE listings_listing ADD FULLTEXT INDEX {FULLTEXT_INDEX} ({COLUMNS})"
+        )
+    elif vendor == "sqlite":
+        try:
+            # SQLite builds without FTS5 fall back to the in-memory backend
+            with transaction.atomic(using=schema_editor.connection.alias):
+                schema_editor.execute(f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5({COLUMNS})")
+        except OperationalError:
+            return
+        schema_editor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, {COLUMNS}) SELECT id, {COLUMNS} FROM listings_listing"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "mysql":
+        schema_editor.execute(f"ALTER TABLE listings_listing DROP INDEX {FULLTEXT_INDEX}")
+    elif vendor == "sqlite":
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0003_alter_listing_title'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
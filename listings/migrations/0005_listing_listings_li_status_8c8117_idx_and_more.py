@@ -0,0 +1,31 @@
+# Generated by Django 5.2.4 on 2026-10-17 23:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0004_listing_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(fields=['status', 'created_at', 'id'], name='listings_li_status_8c8117_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(fields=['status', 'price', 'id'], name='listings_li_status_18426a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(fields=['status', 'views_count', 'id'], name='listings_li_status_9f3843_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(fields=['landlord', 'created_at', 'id'], name='listings_li_landlor_ddc709_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.4 on 2026-10-17 23:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0005_listing_listings_li_status_8c8117_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(fields=['status', 'location_city', 'price'], name='listings_li_status_f404f3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(fields=['status', 'location_city', 'location_district'], name='listings_li_status_b82b9c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(fields=['status', 'housing_type', 'rooms'], name='listings_li_status_c150b0_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(fields=['status', 'rooms', 'price'], name='listings_li_status_7266fd_idx'),
+        ),
+    ]
@@ -0,0 +1,85 @@
+# Generated by Django 5.2.4 on 2026-10-18 00:21
+
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_ratings(apps, schema_editor):
+    # Same result as `manage.py recount_ratings`, for the reviews written before this migration
+    Listing = apps.get_model('listings', 'Listing')
+    Review = apps.get_model('reviews', 'Review')
+    stars = {}
+    rows = Review.objects.order_by().values_list('listing_id', 'rating').annotate(n=Count('id'))
+    for listing_id, rating, n in rows:
+        stars.setdefault(listing_id, {})[rating] = n
+    fields = ['rating_count', 'rating_sum', 'rating_avg', 'rating_1', 'rating_2', 'rating_3', 'rating_4', 'rating_5']
+    batch = []
+    for listing in Listing.objects.filter(pk__in=list(stars)).only('pk'):
+        ratings = stars[listing.pk]
+        listing.rating_count = sum(ratings.values())
+        listing.rating_sum = sum(star * n for star, n in ratings.items())
+        listing.rating_avg = (Decimal(listing.rating_sum) / listing.rating_count).quantize(Decimal('0.01'))
+        for star in range(1, 6):
+            setattr(listing, f'rating_{star}', ratings.get(star, 0))
+        batch.append(listing)
+    Listing.objects.bulk_update(batch, fields, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0007_listing_updated_at'),
+        ('reviews', '0008_review_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='listing',
+            name='rating_1',
+            field=models.PositiveIntegerField(default=0, help_text='Reviews with 1 star'),
+        ),
+        migrations.AddField(
+            model_name='listing',
+            name='rating_2',
+            field=models.PositiveIntegerField(default=0, help_text='Reviews with 2 stars'),
+        ),
+        migrations.AddField(
+            model_name='listing',
+            name='rating_3',
+            field=models.PositiveIntegerField(default=0, help_text='Reviews with 3 stars'),
+        ),
+        migrations.AddField(
+            model_name='listing',
+            name='rating_4',
+            field=models.PositiveIntegerField(default=0, help_text='Reviews with 4 stars'),
+        ),
+        migrations.AddField(
+            model_name='listing',
+            name='rating_5',
+            field=models.PositiveIntegerField(default=0, help_text='Reviews with 5 stars'),
+        ),
+        migrations.AddField(
+            model_name='listing',
+            name='rating_avg',
+            field=models.DecimalField(decimal_places=2, default=0, help_text='rating_sum / rating_count, 0 without reviews (sort key)', max_digits=3),
+        ),
+        migrations.AddField(
+            model_name='listing',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='listing',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='listing',
+            index=models.Index(fields=['status', 'rating_avg', 'id'], name='listings_li_status_d3c180_idx'),
+        ),
+        migrations.RunPython(backfill_ratings, migrations.RunPython.noop),
+    ]
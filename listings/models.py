@@ -32,7 +32,19 @@ class Listing(models.Model):
         help_text='Status for apartment',
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, help_text='Last change; used as HTTP validator (ETag/Last-Modified)')
     views_count = models.PositiveIntegerField(default=0)
+    # Rating summary of the listing's reviews, kept in sync by reviews.ratings
+    # (F() updates on review save/delete; `manage.py recount_ratings` repairs it)
+    rating_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_avg = models.DecimalField(max_digits=3, decimal_places=2, default=0,
+                                     help_text='rating_sum / rating_count, 0 without reviews (sort key)')
+    rating_1 = models.PositiveIntegerField(default=0, help_text='Reviews with 1 star')
+    rating_2 = models.PositiveIntegerField(default=0, help_text='Reviews with 2 stars')
+    rating_3 = models.PositiveIntegerField(default=0, help_text='Reviews with 3 stars')
+    rating_4 = models.PositiveIntegerField(default=0, help_text='Reviews with 4 stars')
+    rating_5 = models.PositiveIntegerField(default=0, help_text='Reviews with 5 stars')
 
     def __str__(self):
         return f"{self.title} ({self.location_city}, {self.price}€)"
@@ -41,3 +53,18 @@ class Listing(models.Model):
         verbose_name = 'Listing'
         verbose_name_plural = 'Listings'
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination: the public feed always filters status=available,
+            # "my listings" always filters by landlord; `id` is the cursor tie-breaker.
+            models.Index(fields=['status', 'created_at', 'id']),
+            models.Index(fields=['status', 'price', 'id']),
+            models.Index(fields=['status', 'views_count', 'id']),
+            models.Index(fields=['status', 'rating_avg', 'id']),
+            models.Index(fields=['landlord', 'created_at', 'id']),
+            # Public filters (filters.ListingFilter) — equality columns first, the range column last.
+            # Checked by listings/tests/test_query_plans.py.
+            models.Index(fields=['status', 'location_city', 'price']),
+            models.Index(fields=['status', 'location_city', 'location_district']),
+            models.Index(fields=['status', 'housing_type', 'rooms']),
+            models.Index(fields=['status', 'rooms', 'price']),
+        ]
@@ -0,0 +1,296 @@
+"""
+Full-text search backends for listings.
+
+Every backend exposes the same small API:
+- `filter(queryset, query)` — narrow a Listing queryset to matches and annotate
+  each row with `search_rank` (higher = more relevant);
+- `index(listing)` / `remove(listing_id)` — keep the index in sync (called from signals);
+- `rebuild()` — re-index the whole catalog (used by `manage.py rebuild_search_index`).
+
+Backend selection: settings.LISTINGS_SEARCH_BACKEND
+- "auto"   — FULLTEXT on MySQL, FTS5 on SQLite, in-memory index otherwise;
+- "mysql" / "sqlite" / "memory" — force a specific backend.
+"""
+import heapq
+import math
+import re
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Case, FloatField, Value, When
+from django.db.models.expressions import RawSQL
+
+from .models import Listing
+
+# Fields that take part in full-text search (same set as ListingViewSet.search_fields)
+SEARCH_FIELDS = ("title", "description", "location_city", "location_district")
+
+DEFAULT_MAX_CANDIDATES = 1000
+
+FTS_TABLE = "listings_listing_fts"
+FULLTEXT_INDEX = "listings_listing_fulltext"
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text):
+    """Lower-cased word tokens of the given text."""
+    return TOKEN_RE.findall((text or "").lower())
+
+
+class BaseSearchBackend:
+    name = "base"
+
+    def filter(self, queryset, query):
+        raise NotImplementedError
+
+    def index(self, listing):
+        """Add or refresh a single listing in the index."""
+
+    def remove(self, listing_id):
+        """Drop a single listing from the index."""
+
+    def rebuild(self):
+        """Re-index all listings."""
+
+
+class MySQLFullTextBackend(BaseSearchBackend):
+    """
+    InnoDB FULLTEXT index over SEARCH_FIELDS (created by migration 0004).
+    MySQL maintains the index itself, so index/remove are no-ops.
+    """
+    name = "mysql"
+
+    def _boolean_query(self, terms):
+        # +term* => every term is required, prefix match
+        return " ".join(f"+{t}*" for t in terms)
+
+    def filter(self, queryset, query):
+        terms = tokenize(query)
+        if not terms:
+            return queryset
+        table = Listing._meta.db_table
+        columns = ", ".join(f"{table}.{f}" for f in SEARCH_FIELDS)
+        match_sql = f"MATCH ({columns}) AGAINST (%s IN BOOLEAN MODE)"
+        return queryset.annotate(
+            search_rank=RawSQL(match_sql, (self._boolean_query(terms),), output_field=FloatField())
+        ).filter(search_rank__gt=0)
+
+
+class SQLiteFTS5Backend(BaseSearchBackend):
+    """
+    FTS5 virtual table (rowid = listing id), created by migration 0004
+    and kept in sync from listings.signals.
+    """
+    name = "sqlite"
+
+    def _match_query(self, terms):
+        # "term"* => prefix match; quoting keeps FTS5 operators out of user input
+        return " ".join('"{}"*'.format(t.replace('"', '""')) for t in terms)
+
+    def filter(self, queryset, query):
+        terms = tokenize(query)
+        if not terms:
+            return queryset
+        table = Listing._meta.db_table
+        match = self._match_query(terms)
+        # bm25() is "lower is better", so negate it to get a descending rank
+        rank_sql = (
+            f"SELECT -bm25({FTS_TABLE}) FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s AND {FTS_TABLE}.rowid = {table}.id"
+        )
+        ids_sql = f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s"
+        return queryset.filter(id__in=RawSQL(ids_sql, (match,))).annotate(
+            search_rank=RawSQL(rank_sql, (match,), output_field=FloatField())
+        )
+
+    def index(self, listing):
+        values = [getattr(listing, f) or "" for f in SEARCH_FIELDS]
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [listing.pk])
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(SEARCH_FIELDS)}) VALUES (%s, %s, %s, %s, %s)",
+                [listing.pk, *values],
+            )
+
+    def remove(self, listing_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [listing_id])
+
+    def rebuild(self):
+        table = Listing._meta.db_table
+        columns = ", ".join(SEARCH_FIELDS)
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, {columns}) SELECT id, {columns} FROM {table}"
+            )
+
+
+class InMemorySearchBackend(BaseSearchBackend):
+    """
+    Per-process inverted index: token -> {listing_id: term frequency}.
+    Built lazily from the database on first use, then updated from signals.
+    Ranking is TF-IDF summed over the query terms; terms match by prefix.
+    Only the LISTINGS_SEARCH_MAX_CANDIDATES best-scored matches among the rows of the given
+    queryset (i.e. after its filters) reach the SQL query, which carries one CASE branch and
+    one IN item per candidate; the CASE ranks them in SQL.
+    """
+    name = "memory"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings = defaultdict(dict)
+        self._doc_tokens = {}
+        self._sorted_tokens = []
+        self._loaded = False
+
+    def _add(self, listing_id, values):
+        self._drop(listing_id)
+        counts = defaultdict(int)
+        for value in values:
+            for token in tokenize(value):
+                counts[token] += 1
+        for token, tf in counts.items():
+            self._postings[token][listing_id] = tf
+        self._doc_tokens[listing_id] = tuple(counts)
+
+    def _drop(self, listing_id):
+        for token in self._doc_tokens.pop(listing_id, ()):
+            docs = self._postings.get(token)
+            if docs is not None:
+                docs.pop(listing_id, None)
+                if not docs:
+                    del self._postings[token]
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            for row in Listing.objects.values_list("id", *SEARCH_FIELDS).iterator(chunk_size=2000):
+                self._add(row[0], row[1:])
+            self._sorted_tokens = sorted(self._postings)
+            self._loaded = True
+
+    def _expand(self, term):
+        """All indexed tokens starting with `term`."""
+        i = bisect_left(self._sorted_tokens, term)
+        while i < len(self._sorted_tokens) and self._sorted_tokens[i].startswith(term):
+            yield self._sorted_tokens[i]
+            i += 1
+
+    def scores(self, query):
+        """Return {listing_id: score} for documents matching every query term."""
+        self._ensure_loaded()
+        terms = tokenize(query)
+        if not terms:
+            return {}
+        total = max(len(self._doc_tokens), 1)
+        result = None
+        with self._lock:
+            for term in terms:
+                term_scores = defaultdict(float)
+                for token in self._expand(term):
+                    docs = self._postings[token]
+                    idf = math.log(1 + total / len(docs))
+                    for listing_id, tf in docs.items():
+                        term_scores[listing_id] += tf * idf
+                if result is None:
+                    result = dict(term_scores)
+                else:
+                    result = {k: v + term_scores[k] for k, v in result.items() if k in term_scores}
+                if not result:
+                    return {}
+        return result
+
+    def filter(self, queryset, query):
+        if not tokenize(query):
+            return queryset
+        scores = self.scores(query)
+        if not scores:
+            return queryset.annotate(search_rank=Value(0.0, output_field=FloatField())).none()
+        limit = getattr(settings, "LISTINGS_SEARCH_MAX_CANDIDATES", DEFAULT_MAX_CANDIDATES)
+        if len(scores) > limit:
+            # Truncate the matches that pass the queryset's own filters (status, fields,
+            # availability), never the raw index hits: filtered-out rows must not fill the cap
+            allowed = set(queryset.order_by().values_list("pk", flat=True))
+            scores = {pk: score for pk, score in scores.items() if pk in allowed}
+            if len(scores) > limit:
+                scores = dict(heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0])))
+            if not scores:
+                return queryset.annotate(search_rank=Value(0.0, output_field=FloatField())).none()
+        whens = [When(pk=pk, then=Value(score)) for pk, score in scores.items()]
+        return queryset.filter(pk__in=list(scores)).annotate(
+            search_rank=Case(*whens, default=Value(0.0), output_field=FloatField())
+        )
+
+    def index(self, listing):
+        if not self._loaded:
+            return  # the next search loads a fresh snapshot anyway
+        with self._lock:
+            self._add(listing.pk, [getattr(listing, f) for f in SEARCH_FIELDS])
+            self._sorted_tokens = sorted(self._postings)
+
+    def remove(self, listing_id):
+        if not self._loaded:
+            return
+        with self._lock:
+            self._drop(listing_id)
+            self._sorted_tokens = sorted(self._postings)
+
+    def rebuild(self):
+        with self._lock:
+            self._postings.clear()
+            self._doc_tokens.clear()
+            self._sorted_tokens = []
+            self._loaded = False
+        self._ensure_loaded()
+
+
+BACKENDS = {
+    "mysql": MySQLFullTextBackend,
+    "sqlite": SQLiteFTS5Backend,
+    "memory": InMemorySearchBackend,
+}
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def _sqlite_fts_available():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+        return cursor.fetchone() is not None
+
+
+def _resolve_name():
+    name = getattr(settings, "LISTINGS_SEARCH_BACKEND", "auto")
+    if name != "auto":
+        return name
+    if connection.vendor == "mysql":
+        return "mysql"
+    if connection.vendor == "sqlite" and _sqlite_fts_available():
+        return "sqlite"
+    return "memory"
+
+
+def get_search_backend():
+    """Return the process-wide search backend instance."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = BACKENDS[_resolve_name()]()
+    return _backend
+
+
+def reset_search_backend():
+    """Forget the cached backend (settings change, tests)."""
+    global _backend
+    with _backend_lock:
+        _backend = None
@@ -8,6 +8,9 @@ class ListingSerializer(serializers.ModelSerializer):
     # Hidden field: the current request.user becomes the landlord
     landlord = serializers.HiddenField(default=serializers.CurrentUserDefault())
     is_bookable = serializers.SerializerMethodField()
+    # Rating summary maintained on the listing (reviews/ratings.py), no Review query
+    rating_average = serializers.SerializerMethodField()
+    rating_histogram = serializers.SerializerMethodField()
 
     class Meta:
         model = Listing
@@ -26,8 +29,18 @@ class ListingSerializer(serializers.ModelSerializer):
             "landlord",
             "created_at",
             "views_count",
+            "rating_average",
+            "rating_count",
+            "rating_histogram",
         )
-        read_only_fields = ("created_at", "views_count")
+        read_only_fields = ("created_at", "views_count", "rating_count")
 
     def get_is_bookable(self, obj):
         return obj.status == ListingStatus.AVAILABLE
+
+    def get_rating_average(self, obj):
+        # null rather than 0 for a listing nobody has rated yet
+        return str(obj.rating_avg) if obj.rating_count else None
+
+    def get_rating_histogram(self, obj):
+        return {str(star): getattr(obj, f"rating_{star}") for star in range(1, 6)}
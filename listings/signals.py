@@ -0,0 +1,57 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from . import cache as listing_cache
+from .models import Listing
+from .search import get_search_backend
+
+
+@receiver(post_save, sender=Listing)
+def index_listing(sender, instance, **kwargs):
+    # Index after commit so a rolled-back save never reaches the search index
+    transaction.on_commit(lambda: get_search_backend().index(instance))
+
+
+@receiver(post_delete, sender=Listing)
+def unindex_listing(sender, instance, **kwargs):
+    listing_id = instance.pk
+    transaction.on_commit(lambda: get_search_backend().remove(listing_id))
+
+
+@receiver(post_save, sender=Listing)
+@receiver(post_delete, sender=Listing)
+def invalidate_listing_cache(sender, instance, **kwargs):
+    # Covers MyListingViewSet writes and admin list_editable edits (both go through save()).
+    # Detail, calendar and list pages: e.g. a listing made unavailable must 404 everywhere.
+    # Bump now, and once more after commit: a reader may have re-cached the old row in between.
+    listing_id = instance.pk
+    listing_cache.bump_listing(listing_id)
+    transaction.on_commit(lambda: listing_cache.bump_listing(listing_id))
+    _bump_landlord(instance.landlord_id)
+
+
+def _bump_landlord(landlord_id):
+    if landlord_id is None:
+        return
+    listing_cache.bump_landlord(landlord_id)
+    transaction.on_commit(lambda: listing_cache.bump_landlord(landlord_id))
+
+
+@receiver(post_save, sender="bookings.Booking")
+@receiver(post_delete, sender="bookings.Booking")
+@receiver(post_save, sender="reviews.Review")
+@receiver(post_delete, sender="reviews.Review")
+def invalidate_landlord_stats(sender, instance, **kwargs):
+    # Bookings and reviews feed the landlord dashboard (my-listings/stats)
+    landlord_id = Listing.objects.filter(pk=instance.listing_id).values_list("landlord_id", flat=True).first()
+    _bump_landlord(landlord_id)
+
+
+@receiver(post_save, sender="bookings.Booking")
+@receiver(post_delete, sender="bookings.Booking")
+def invalidate_listing_calendar(sender, instance, **kwargs):
+    # Create, confirm, reject, cancel, delete: any of them can change the busy nights
+    listing_id = instance.listing_id
+    listing_cache.bump_calendar(listing_id)
+    transaction.on_commit(lambda: listing_cache.bump_calendar(listing_id))
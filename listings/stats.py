@@ -0,0 +1,98 @@
+"""
+Landlord dashboard (GET /api/listings/my-listings/stats/?from=YYYY-MM-DD&to=YYYY-MM-DD).
+
+Everything is computed for all of the landlord's listings with four grouped queries,
+whatever the number of listings:
+1. the listings themselves (price, views_count);
+2. ListingView GROUP BY (listing, viewed_on) inside the range;
+3. Booking GROUP BY (listing, status) for stays overlapping the range, with the nights
+   clipped to the range summed in SQL (end_date is the check-out day, so nights = end - start);
+4. Review GROUP BY listing: count and average rating (all time).
+Estimated revenue = price x confirmed nights in the range.
+"""
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db.models import Avg, Count, DateField, DurationField, ExpressionWrapper, F, Sum, Value
+from django.db.models.functions import Greatest, Least
+
+from analytics.models import ListingView
+from bookings.choices import BookingStatus
+from bookings.models import Booking
+from reviews.models import Review
+
+
+def _clipped_nights(start, end):
+    """Nights of a booking that fall on days start..end (inclusive)."""
+    return ExpressionWrapper(
+        Least(F("end_date"), Value(end + timedelta(days=1), output_field=DateField()))
+        - Greatest(F("start_date"), Value(start, output_field=DateField())),
+        output_field=DurationField(),
+    )
+
+
+def landlord_stats(listings, start, end):
+    """`listings`: queryset of the landlord's listings; `start`/`end`: inclusive days."""
+    rows = list(listings.order_by("id").values("id", "title", "price", "views_count", "status"))
+    ids = [row["id"] for row in rows]
+
+    views_by_day = defaultdict(list)
+    for row in (
+        ListingView.objects.filter(listing_id__in=ids, viewed_on__range=(start, end))
+        .values("listing_id", "viewed_on")
+        .annotate(n=Count("id"))
+        .order_by("listing_id", "viewed_on")
+    ):
+        views_by_day[row["listing_id"]].append({"day": row["viewed_on"], "views": row["n"]})
+
+    bookings = defaultdict(dict)
+    nights = defaultdict(int)
+    for row in (
+        Booking.objects.filter(listing_id__in=ids, start_date__lte=end, end_date__gt=start)
+        .values("listing_id", "status")
+        .annotate(n=Count("id"), nights=Sum(_clipped_nights(start, end)))
+        .order_by()
+    ):
+        bookings[row["listing_id"]][row["status"]] = row["n"]
+        if row["status"] == BookingStatus.CONFIRMED and row["nights"]:
+            nights[row["listing_id"]] = row["nights"].days
+
+    reviews = {
+        row["listing_id"]: row
+        for row in Review.objects.filter(listing_id__in=ids)
+        .values("listing_id")
+        .annotate(n=Count("id"), avg=Avg("rating"))
+        .order_by()
+    }
+
+    result = []
+    totals = {"views": 0, "confirmed_nights": 0, "estimated_revenue": Decimal("0"), "bookings": defaultdict(int)}
+    for row in rows:
+        listing_id = row["id"]
+        by_status = {status: bookings[listing_id].get(status, 0) for status in BookingStatus.values}
+        revenue = row["price"] * nights[listing_id]
+        review = reviews.get(listing_id)
+        views = views_by_day[listing_id]
+        result.append({
+            "id": listing_id,
+            "title": row["title"],
+            "status": row["status"],
+            "price": row["price"],
+            "views_count": row["views_count"],
+            "views": sum(v["views"] for v in views),
+            "views_by_day": views,
+            "bookings": by_status,
+            "confirmed_nights": nights[listing_id],
+            "estimated_revenue": revenue,
+            "reviews_count": review["n"] if review else 0,
+            "average_rating": round(review["avg"], 2) if review else None,
+        })
+        totals["views"] += result[-1]["views"]
+        totals["confirmed_nights"] += nights[listing_id]
+        totals["estimated_revenue"] += revenue
+        for status, n in by_status.items():
+            totals["bookings"][status] += n
+
+    totals["bookings"] = dict(totals["bookings"])
+    return {"from": start, "to": end, "totals": totals, "listings": result}
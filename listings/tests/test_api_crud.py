@@ -1,5 +1,11 @@
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from model_bakery import baker
+
+from analytics import recorder
+from analytics.models import ListingView
+from analytics.uniques import get_unique_viewers_recorder
 from listings.models import Listing
 
 BASE = "/api/listings/"
@@ -119,3 +125,30 @@ def test_listings_delete_only_owner(api_client, user_with_profile):
     api_client.force_authenticate(user=owner)
     r2 = api_client.delete(detail_my)
     assert r2.status_code in (200, 202, 204)
+
+
+
+@pytest.mark.django_db
+def test_retrieve_fetches_once_and_logs_view(api_client, user_with_profile, settings, monkeypatch):
+    tenant = user_with_profile(username="tt", role="tenant")
+    listing = baker.make("listings.Listing", status="available")
+    api_client.force_authenticate(user=tenant)
+
+    # Buffered recorder: the request itself only reads the listing once
+    settings.ANALYTICS_VIEW_RECORDER = "buffered"
+    recorded = []
+    monkeypatch.setattr(recorder, "write_views", lambda events: recorded.extend(events) or len(events))
+    monkeypatch.setattr(get_unique_viewers_recorder(), "_ensure_worker", lambda: None)
+    with CaptureQueriesContext(connection) as ctx:
+        resp = api_client.get(f"{BASE}listings/{listing.id}/")
+    assert resp.status_code == 200
+    assert len([q for q in ctx.captured_queries if "listings_listing" in q["sql"]]) == 1
+    recorder.get_view_recorder().shutdown()
+    assert recorded[0][:2] == (tenant.pk, listing.id)
+    assert get_unique_viewers_recorder().flush() == 1
+
+    # Sync recorder (test default): the view row is written
+    monkeypatch.undo()
+    settings.ANALYTICS_VIEW_RECORDER = "sync"
+    api_client.get(f"{BASE}listings/{listing.id}/")
+    assert ListingView.objects.filter(user=tenant, listing=listing).count() == 1
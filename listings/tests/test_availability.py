@@ -0,0 +1,67 @@
+from datetime import date
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from model_bakery import baker
+
+LIST_URL = "/api/listings/listings/"
+
+
+def ids(response):
+    return {row["id"] for row in response.json()["results"]}
+
+
+@pytest.fixture
+def listings(user_with_profile):
+    tenant = user_with_profile(username="tt")
+    free, busy, edge, cancelled = baker.make("listings.Listing", status="available", location_city="Kyiv", _quantity=4)
+    # Overlaps Sep 10 -> Sep 15
+    baker.make("bookings.Booking", listing=busy, tenant=tenant,
+               start_date=date(2025, 9, 12), end_date=date(2025, 9, 20), status="pending")
+    # Checks out on the check-in day: no overlap
+    baker.make("bookings.Booking", listing=edge, tenant=tenant,
+               start_date=date(2025, 9, 5), end_date=date(2025, 9, 10), status="confirmed")
+    # Cancelled/rejected bookings don't block
+    baker.make("bookings.Booking", listing=cancelled, tenant=tenant,
+               start_date=date(2025, 9, 10), end_date=date(2025, 9, 15), status="cancelled")
+    return {"free": free, "busy": busy, "edge": edge, "cancelled": cancelled}
+
+
+@pytest.mark.django_db
+def test_availability_filter(api_client, listings):
+    r = api_client.get(LIST_URL, {"check_in": "2025-09-10", "check_out": "2025-09-15"})
+    assert r.status_code == 200
+    assert ids(r) == {listings["free"].id, listings["edge"].id, listings["cancelled"].id}
+
+    # Before the busy stay
+    r = api_client.get(LIST_URL, {"check_in": "2025-09-01", "check_out": "2025-09-12", "location_city": "Kyiv"})
+    assert listings["busy"].id in ids(r)
+    assert listings["edge"].id not in ids(r)
+
+
+@pytest.mark.django_db
+def test_availability_is_a_single_anti_join(api_client, listings, settings):
+    settings.LISTINGS_CACHE_ENABLED = False
+    with CaptureQueriesContext(connection) as ctx:
+        api_client.get(LIST_URL, {"check_in": "2025-09-10", "check_out": "2025-09-15"})
+    booking_queries = [q["sql"] for q in ctx.captured_queries if "bookings_booking" in q["sql"]]
+    assert booking_queries and all("NOT EXISTS" in sql for sql in booking_queries)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("params", [
+    {"check_in": "2025-09-10"},
+    {"check_out": "2025-09-10"},
+    {"check_in": "2025-09-10", "check_out": "2025-09-10"},
+    {"check_in": "bad", "check_out": "2025-09-10"},
+])
+def test_availability_validation(api_client, params):
+    assert api_client.get(LIST_URL, params).status_code == 400
+
+
+@pytest.mark.django_db
+def test_facets_respect_availability(api_client, listings):
+    r = api_client.get(f"{LIST_URL}facets/", {"check_in": "2025-09-10", "check_out": "2025-09-15"})
+    assert r.status_code == 200
+    assert r.json()["total"] == 3
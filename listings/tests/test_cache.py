@@ -0,0 +1,91 @@
+from datetime import date
+
+import pytest
+from model_bakery import baker
+
+from listings import cache as listing_cache
+
+LIST_URL = "/api/listings/listings/"
+MY_URL = "/api/listings/my-listings/"
+
+
+@pytest.mark.django_db
+def test_anonymous_list_is_cached_until_a_listing_changes(api_client, user_with_profile):
+    ll = user_with_profile(username="ll", role="landlord")
+    listing = baker.make("listings.Listing", landlord=ll, status="available", price="100.00")
+
+    first = api_client.get(LIST_URL, {"ordering": "price"})
+    second = api_client.get(LIST_URL, {"ordering": "price"})
+    assert first.json() == second.json()
+    assert listing_cache.stats()["hits"] == 1
+    assert listing_cache.stats()["misses"] == 1
+
+    # A write through my-listings bumps the catalog version
+    api_client.force_authenticate(user=ll)
+    assert api_client.patch(f"{MY_URL}{listing.id}/", {"price": "150.00"}, format="json").status_code == 200
+    api_client.force_authenticate(user=None)
+
+    third = api_client.get(LIST_URL, {"ordering": "price"})
+    assert third.json()["results"][0]["price"] == "150.00"
+    assert listing_cache.stats()["misses"] == 2
+
+
+@pytest.mark.django_db
+def test_param_order_does_not_matter(api_client):
+    baker.make("listings.Listing", status="available", location_city="Kyiv", rooms=2)
+    api_client.get(f"{LIST_URL}?location_city=Kyiv&rooms__gte=1")
+    api_client.get(f"{LIST_URL}?rooms__gte=1&location_city=Kyiv&search=")
+    assert listing_cache.stats() == {"hits": 1, "misses": 1, "hit_ratio": 0.5}
+
+
+@pytest.mark.django_db
+def test_availability_filtered_pages_follow_bookings(api_client):
+    listing = baker.make("listings.Listing", status="available")
+    params = {"check_in": "2030-05-01", "check_out": "2030-05-05"}
+    assert [item["id"] for item in api_client.get(LIST_URL, params).json()["results"]] == [listing.id]
+    unfiltered = api_client.get(LIST_URL).json()
+
+    baker.make(
+        "bookings.Booking", listing=listing, status="confirmed",
+        start_date=date(2030, 5, 3), end_date=date(2030, 5, 7),
+    )
+
+    assert api_client.get(LIST_URL, params).json()["results"] == []
+    # Pages without availability filters stay cached across booking writes
+    assert api_client.get(LIST_URL).json() == unfiltered
+    assert listing_cache.stats()["hits"] == 1
+
+
+@pytest.mark.django_db
+def test_detail_is_invalidated_on_save_and_delete(api_client):
+    listing = baker.make("listings.Listing", status="available", title="Before")
+    url = f"{LIST_URL}{listing.id}/"
+
+    assert api_client.get(url).json()["title"] == "Before"
+    listing.title = "After"
+    listing.save()  # e.g. admin list_editable
+    assert api_client.get(url).json()["title"] == "After"
+
+    listing.delete()
+    assert api_client.get(url).status_code == 404
+
+
+@pytest.mark.django_db
+def test_authenticated_requests_bypass_cache(api_client, user_with_profile):
+    user = user_with_profile(username="tt")
+    baker.make("listings.Listing", status="available")
+    api_client.force_authenticate(user=user)
+    api_client.get(LIST_URL)
+    api_client.get(LIST_URL)
+    assert listing_cache.stats()["hits"] == 0
+
+
+@pytest.mark.django_db
+def test_cache_stats_admin_only(api_client, user_with_profile):
+    url = f"{LIST_URL}cache-stats/"
+    assert api_client.get(url).status_code in (401, 403)
+
+    admin = user_with_profile(username="admin", is_staff=True, is_superuser=True)
+    api_client.force_authenticate(user=admin)
+    body = api_client.get(url).json()
+    assert {"hits", "misses", "hit_ratio", "enabled"} <= set(body)
@@ -0,0 +1,109 @@
+from datetime import date
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from model_bakery import baker
+
+from listings.calendar import merge_intervals, month_bitmasks
+
+RANGE = {"from": "2025-09-01", "to": "2025-10-31"}
+
+
+def url(listing):
+    return f"/api/listings/listings/{listing.pk}/calendar/"
+
+
+def book(listing, tenant, start, end, status="confirmed"):
+    return baker.make("bookings.Booking", listing=listing, tenant=tenant,
+                      start_date=start, end_date=end, status=status)
+
+
+def d(day):
+    return date(2025, 9, day)
+
+
+def test_merge_intervals():
+    assert merge_intervals([(d(1), d(3)), (d(3), d(5)), (d(4), d(6)), (d(10), d(12))]) == [
+        (d(1), d(6)),
+        (d(10), d(12)),
+    ]
+    assert merge_intervals([(d(1), d(10)), (d(2), d(3))]) == [(d(1), d(10))]
+    assert merge_intervals([]) == []
+
+
+def test_month_bitmasks():
+    months = month_bitmasks([(date(2025, 9, 29), date(2025, 10, 2))], date(2025, 9, 1), date(2025, 11, 15))
+    assert months == {"2025-09": (1 << 28) | (1 << 29), "2025-10": 1, "2025-11": 0}
+
+
+@pytest.mark.django_db
+def test_calendar_merges_and_clips(api_client, user_with_profile):
+    tenant = user_with_profile(username="tt")
+    listing = baker.make("listings.Listing", status="available")
+    book(listing, tenant, date(2025, 8, 28), date(2025, 9, 3))            # clipped at 'from'
+    book(listing, tenant, date(2025, 9, 3), date(2025, 9, 5), "pending")  # touches the previous stay
+    book(listing, tenant, date(2025, 9, 10), date(2025, 9, 12), "cancelled")
+    book(listing, tenant, date(2025, 10, 30), date(2025, 11, 4))          # clipped at 'to'
+
+    with CaptureQueriesContext(connection) as ctx:
+        r = api_client.get(url(listing), RANGE)
+    assert r.status_code == 200
+    data = r.json()
+    assert data["busy"] == [
+        {"start": "2025-09-01", "end": "2025-09-05"},
+        {"start": "2025-10-30", "end": "2025-11-01"},
+    ]
+    assert data["months"] == {"2025-09": 0b1111, "2025-10": (1 << 29) | (1 << 30)}
+    assert len([q for q in ctx.captured_queries if "bookings_booking" in q["sql"]]) == 1
+
+
+@pytest.mark.django_db
+def test_calendar_cache_invalidated_by_booking_changes(api_client, user_with_profile):
+    tenant = user_with_profile(username="tt")
+    listing = baker.make("listings.Listing", status="available")
+    assert api_client.get(url(listing), RANGE).json()["busy"] == []
+
+    booking = book(listing, tenant, date(2025, 9, 10), date(2025, 9, 12), "pending")
+    assert len(api_client.get(url(listing), RANGE).json()["busy"]) == 1
+
+    with CaptureQueriesContext(connection) as ctx:
+        api_client.get(url(listing), RANGE)
+    assert not any("bookings_booking" in q["sql"] for q in ctx.captured_queries)
+
+    booking.status = "rejected"
+    booking.save(update_fields=["status", "updated_at"])
+    assert api_client.get(url(listing), RANGE).json()["busy"] == []
+
+
+@pytest.mark.django_db
+def test_cached_calendar_is_dropped_when_the_listing_is_hidden(api_client, user_with_profile):
+    listing = baker.make("listings.Listing", status="available")
+    assert api_client.get(url(listing), RANGE).status_code == 200
+    api_client.force_authenticate(user=user_with_profile(username="tt"))
+    assert api_client.get(url(listing), RANGE).status_code == 200  # cached for everyone
+
+    listing.status = "unavailable"
+    listing.save()
+    assert api_client.get(url(listing), RANGE).status_code == 404
+    api_client.force_authenticate(user=None)
+    assert api_client.get(url(listing), RANGE).status_code == 404
+
+    listing.delete()
+    assert api_client.get(url(listing), RANGE).status_code == 404
+
+
+@pytest.mark.django_db
+def test_calendar_errors(api_client):
+    listing = baker.make("listings.Listing", status="unavailable")
+    assert api_client.get(url(listing), RANGE).status_code == 404
+    assert api_client.get("/api/listings/listings/999999/calendar/").status_code == 404
+
+    listing = baker.make("listings.Listing", status="available")
+    assert api_client.get(url(listing)).status_code == 200
+    assert api_client.get(url(listing), {"from": "2025-09-10", "to": "2025-09-01"}).status_code == 400
+    assert api_client.get(url(listing), {"from": "2025-01-01", "to": "2026-06-01"}).status_code == 400
+    assert api_client.get(url(listing), {"from": "x"}).status_code == 400
+    invalid = api_client.get(url(listing), {"from": "2026-02-30"})
+    assert invalid.status_code == 400
+    assert "from" in invalid.json()
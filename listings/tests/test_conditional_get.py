@@ -0,0 +1,100 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from model_bakery import baker
+
+LIST_URL = "/api/listings/listings/"
+
+
+@pytest.mark.django_db
+def test_detail_strong_etag_and_304(api_client, settings):
+    settings.LISTINGS_CACHE_ENABLED = False
+    listing = baker.make("listings.Listing", status="available")
+    url = f"{LIST_URL}{listing.id}/"
+
+    first = api_client.get(url)
+    etag = first["ETag"]
+    assert not etag.startswith("W/")
+    assert "Last-Modified" in first
+
+    with CaptureQueriesContext(connection) as ctx:
+        again = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert again.status_code == 304
+    assert not again.content
+    # only the validator query: no full fetch, no serializer
+    # (the other queries are the sync-mode unique-viewers write)
+    listing_queries = [q for q in ctx.captured_queries if '"listings_listing"' in q["sql"]]
+    assert len(listing_queries) == 1
+    assert "description" not in listing_queries[0]["sql"]
+
+    listing.title = "Changed"
+    listing.save()
+    changed = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert changed.status_code == 200
+    assert changed["ETag"] != etag
+
+
+@pytest.mark.django_db
+def test_list_weak_etag_changes_with_page_contents(api_client):
+    listings = baker.make("listings.Listing", status="available", _quantity=3)
+
+    first = api_client.get(LIST_URL)
+    etag = first["ETag"]
+    assert etag.startswith("W/")
+    # served from the response cache, still honours If-None-Match
+    assert api_client.get(LIST_URL, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    listings[0].price = "1.00"
+    listings[0].save()
+    resp = api_client.get(LIST_URL, HTTP_IF_NONE_MATCH=etag)
+    assert resp.status_code == 200
+    assert resp["ETag"] != etag
+
+
+@pytest.mark.django_db
+def test_if_modified_since(api_client, settings):
+    settings.LISTINGS_CACHE_ENABLED = False
+    listing = baker.make("listings.Listing", status="available")
+    url = f"{LIST_URL}{listing.id}/"
+
+    last_modified = api_client.get(url)["Last-Modified"]
+    assert api_client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code == 304
+    assert api_client.get(url, HTTP_IF_MODIFIED_SINCE="Mon, 01 Jan 2001 00:00:00 GMT").status_code == 200
+
+
+@pytest.mark.django_db
+def test_list_has_no_last_modified_so_a_removed_row_is_not_a_304(api_client, settings):
+    settings.LISTINGS_CACHE_ENABLED = False
+    kept, removed = baker.make("listings.Listing", status="available", _quantity=2)
+    # the removed row is the newest one on the page
+    removed.title = "Newest"
+    removed.save()
+
+    first = api_client.get(LIST_URL)
+    assert "Last-Modified" not in first
+    removed.delete()
+    resp = api_client.get(LIST_URL, HTTP_IF_MODIFIED_SINCE="Mon, 01 Jan 2035 00:00:00 GMT")
+    assert resp.status_code == 200
+    assert [item["id"] for item in resp.json()["results"]] == [kept.id]
+    assert api_client.get(LIST_URL, HTTP_IF_NONE_MATCH=first["ETag"]).status_code == 200
+
+
+@pytest.mark.django_db
+def test_conditional_detail_checks_object_permissions_before_304(api_client, settings, monkeypatch, user_with_profile):
+    from rest_framework.permissions import BasePermission
+
+    from listings.views import ListingViewSet
+
+    class NoObjectAccess(BasePermission):
+        def has_object_permission(self, request, view, obj):
+            return False
+
+    settings.LISTINGS_CACHE_ENABLED = False
+    listing = baker.make("listings.Listing", status="available")
+    url = f"{LIST_URL}{listing.id}/"
+    api_client.force_authenticate(user=user_with_profile(username="tenant", role="tenant"))
+    etag = api_client.get(url)["ETag"]
+
+    monkeypatch.setattr(ListingViewSet, "permission_classes", [NoObjectAccess])
+    assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 403
+    assert api_client.get(f"{LIST_URL}0/", HTTP_IF_NONE_MATCH=etag).status_code == 404
@@ -0,0 +1,70 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from model_bakery import baker
+
+FACETS_URL = "/api/listings/listings/facets/"
+
+
+@pytest.fixture
+def catalog():
+    rows = [
+        ("Kyiv", "Podil", "apartment", 1, 400),
+        ("Kyiv", "Podil", "apartment", 2, 800),
+        ("Kyiv", "Obolon", "house", 3, 1200),
+        ("Odessa", "Arcadia", "apartment", 2, 900),
+        ("Odessa", "Center", "studio", 1, 2500),
+    ]
+    for city, district, housing_type, rooms, price in rows:
+        baker.make("listings.Listing", status="available", location_city=city, location_district=district,
+                   housing_type=housing_type, rooms=rooms, price=price)
+    baker.make("listings.Listing", status="unavailable", location_city="Kyiv", price=100)
+
+
+def counts(facet_list):
+    return {item["value"]: item["count"] for item in facet_list}
+
+
+@pytest.mark.django_db
+def test_facets_without_filters(api_client, catalog):
+    with CaptureQueriesContext(connection) as ctx:
+        data = api_client.get(FACETS_URL).json()
+    assert len(ctx.captured_queries) == 2
+
+    assert data["total"] == 5
+    assert counts(data["location_city"]) == {"Kyiv": 3, "Odessa": 2}
+    assert counts(data["housing_type"]) == {"apartment": 3, "house": 1, "studio": 1}
+    assert counts(data["rooms"]) == {1: 2, 2: 2, 3: 1}
+    assert counts(data["price"]) == {"0-500": 1, "500-1000": 2, "1000-1500": 1, "1500-2000": 0, "2000+": 1}
+
+
+@pytest.mark.django_db
+def test_facets_drill_down_excludes_own_filter(api_client, catalog):
+    data = api_client.get(FACETS_URL, {"location_city": "Kyiv", "price__lte": "1000"}).json()
+
+    assert data["total"] == 2
+    # city facet ignores the city filter, but honours the price filter
+    assert counts(data["location_city"]) == {"Kyiv": 2, "Odessa": 1}
+    assert counts(data["location_district"]) == {"Podil": 2}
+    # price facet ignores the price filter, but honours the city filter
+    assert counts(data["price"])["1000-1500"] == 1
+    assert counts(data["price"])["0-500"] == 1
+
+
+@pytest.mark.django_db
+def test_facets_rooms_range_and_invalid_params(api_client, catalog):
+    data = api_client.get(FACETS_URL, {"rooms__gte": "2"}).json()
+    assert data["total"] == 3
+    assert counts(data["rooms"]) == {1: 2, 2: 2, 3: 1}
+    assert counts(data["location_city"]) == {"Kyiv": 2, "Odessa": 1}
+
+    assert api_client.get(FACETS_URL, {"rooms__gte": "many"}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_facets_cache_invalidated_by_listing_change(api_client, catalog):
+    assert api_client.get(FACETS_URL).json()["total"] == 5
+    baker.make("listings.Listing", status="available", location_city="Lviv")
+    data = api_client.get(FACETS_URL).json()
+    assert data["total"] == 6
+    assert counts(data["location_city"])["Lviv"] == 1
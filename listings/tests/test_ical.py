@@ -0,0 +1,117 @@
+from datetime import date
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from model_bakery import baker
+
+from bookings.choices import BookingStatus
+from listings import ical
+
+BASE = "/api/listings/my-listings/"
+
+
+def url(listing):
+    return f"{BASE}{listing.pk}/calendar.ics"
+
+
+def body(resp):
+    return b"".join(resp.streaming_content).decode("utf-8")
+
+
+@pytest.fixture
+def owned(user_with_profile):
+    landlord = user_with_profile(username="ll", role="landlord")
+    listing = baker.make("listings.Listing", landlord=landlord, title="Loft, Podil; river view")
+    return landlord, listing
+
+
+def book(listing, start, end, status=BookingStatus.CONFIRMED):
+    return baker.make("bookings.Booking", listing=listing, start_date=start, end_date=end, status=status)
+
+
+@pytest.mark.django_db
+def test_calendar_ics_streams_busy_bookings(api_client, owned):
+    landlord, listing = owned
+    confirmed = book(listing, date(2025, 3, 1), date(2025, 3, 4))
+    pending = book(listing, date(2025, 2, 1), date(2025, 2, 3), BookingStatus.PENDING)
+    book(listing, date(2025, 4, 1), date(2025, 4, 3), BookingStatus.CANCELLED)
+    api_client.force_authenticate(user=landlord)
+
+    resp = api_client.get(url(listing), HTTP_ACCEPT="text/calendar")
+
+    assert resp.status_code == 200
+    assert resp.streaming
+    assert resp["Content-Type"] == "text/calendar; charset=utf-8"
+    assert resp["ETag"] and resp["Last-Modified"]
+    text = body(resp)
+    assert text.startswith("BEGIN:VCALENDAR\r\n") and text.endswith("END:VCALENDAR\r\n")
+    assert "X-WR-CALNAME:Loft\\, Podil\\; river view\r\n" in text
+    assert text.count("BEGIN:VEVENT") == 2
+    # Ordered by start date
+    assert text.index(f"UID:booking-{pending.pk}@") < text.index(f"UID:booking-{confirmed.pk}@")
+    assert "DTSTART;VALUE=DATE:20250301\r\nDTEND;VALUE=DATE:20250304\r\n" in text
+    assert "STATUS:TENTATIVE" in text and "STATUS:CONFIRMED" in text
+    assert "20250401" not in text
+
+
+@pytest.mark.django_db
+def test_calendar_ics_pages_through_long_histories():
+    listing = baker.make("listings.Listing")
+    for day in range(1, 8):
+        book(listing, date(2025, 1, day), date(2025, 1, day + 1))
+    book(listing, date(2025, 1, 3), date(2025, 1, 5), BookingStatus.PENDING)  # same start, next by id
+
+    rows = list(ical.bookings(listing.pk, size=3))
+
+    assert [row[1].day for row in rows] == [1, 2, 3, 3, 4, 5, 6, 7]
+    assert len({row[0] for row in rows}) == 8
+
+
+@pytest.mark.django_db
+def test_calendar_ics_conditional_poll_is_one_query(api_client, owned):
+    landlord, listing = owned
+    booking = book(listing, date(2025, 3, 1), date(2025, 3, 4))
+    api_client.force_authenticate(user=landlord)
+    first = api_client.get(url(listing))
+    body(first)
+    etag = first["ETag"]
+
+    with CaptureQueriesContext(connection) as ctx:
+        resp = api_client.get(url(listing), HTTP_IF_NONE_MATCH=etag)
+    assert resp.status_code == 304
+    assert resp["ETag"] == etag
+    assert len(ctx.captured_queries) == 1
+
+    resp = api_client.get(url(listing), HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+    assert resp.status_code == 304
+
+    # A status change and a deletion both change the validator
+    booking.status = BookingStatus.CANCELLED
+    booking.save()
+    changed = api_client.get(url(listing), HTTP_IF_NONE_MATCH=etag)
+    assert changed.status_code == 200
+    assert "BEGIN:VEVENT" not in body(changed)
+
+    other = book(listing, date(2025, 5, 1), date(2025, 5, 2))
+    etag = api_client.get(url(listing))["ETag"]
+    other.delete()
+    assert api_client.get(url(listing), HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+@pytest.mark.django_db
+def test_calendar_ics_only_for_the_owner(api_client, owned, user_with_profile):
+    _, listing = owned
+    api_client.force_authenticate(user=user_with_profile(username="other", role="landlord"))
+    assert api_client.get(url(listing), HTTP_ACCEPT="text/calendar").status_code == 404
+
+    api_client.force_authenticate(user=user_with_profile(username="ten", role="tenant"))
+    assert api_client.get(url(listing)).status_code == 403
+
+
+def test_fold_splits_long_lines_without_breaking_utf8():
+    line = "X-WR-CALNAME:" + "Квартира " * 20
+    folded = ical.fold(line)
+    parts = folded[:-2].split(b"\r\n ")
+    assert all(len(part) <= 75 for part in parts)
+    assert b"".join(parts).decode("utf-8") == line
@@ -0,0 +1,86 @@
+import json
+from base64 import b64decode, b64encode
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from model_bakery import baker
+
+LIST_URL = "/api/listings/listings/"
+MY_URL = "/api/listings/my-listings/"
+
+
+def walk(client, url, params=None):
+    """Follow `next` links to the end; return (ids in order, list of page responses)."""
+    ids, pages = [], []
+    resp = client.get(url, params or {})
+    while True:
+        assert resp.status_code == 200
+        data = resp.json()
+        assert "count" not in data
+        pages.append(data)
+        ids.extend(item["id"] for item in data["results"])
+        if not data["next"]:
+            return ids, pages
+        resp = client.get(data["next"])
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("ordering", ["-created_at", "price", "-price", "views_count", "-views_count"])
+def test_cursor_walk_covers_every_listing_once(api_client, user_with_profile, ordering):
+    ll = user_with_profile(username="ll", role="landlord")
+    # Lots of ties on price / views_count: the id tie-breaker must keep pages stable
+    for i in range(13):
+        baker.make("listings.Listing", landlord=ll, status="available",
+                   price=100 + (i % 3) * 50, views_count=i % 2)
+    baker.make("listings.Listing", landlord=ll, status="unavailable")
+
+    ids, pages = walk(api_client, LIST_URL, {"ordering": ordering})
+    assert len(ids) == 13 and len(set(ids)) == 13
+    assert len(pages) == 3  # PAGE_SIZE = 5
+
+    field = ordering.lstrip("-")
+    rows = {item["id"]: item for page in pages for item in page["results"]}
+    key = (lambda i: (float(rows[i][field]), i)) if field != "created_at" else (lambda i: (rows[i][field], i))
+    assert ids == sorted(ids, key=key, reverse=ordering.startswith("-"))
+
+
+@pytest.mark.django_db
+def test_cursor_previous_link_returns_same_page(api_client, user_with_profile):
+    ll = user_with_profile(username="ll", role="landlord")
+    baker.make("listings.Listing", landlord=ll, status="available", price=100, _quantity=12)
+
+    first = api_client.get(LIST_URL, {"ordering": "price"}).json()
+    second = api_client.get(first["next"]).json()
+    back = api_client.get(second["previous"]).json()
+    assert [i["id"] for i in back["results"]] == [i["id"] for i in first["results"]]
+    assert back["previous"] is None
+
+
+@pytest.mark.django_db
+def test_invalid_cursor_is_404(api_client):
+    assert api_client.get(LIST_URL, {"cursor": "garbage"}).status_code == 404
+
+
+@pytest.mark.django_db
+def test_cursor_from_another_ordering_or_tampered_is_404(api_client, user_with_profile):
+    ll = user_with_profile(username="ll", role="landlord")
+    baker.make("listings.Listing", landlord=ll, status="available", _quantity=7)
+    next_link = api_client.get(LIST_URL, {"ordering": "price"}).json()["next"]
+    cursor = parse_qs(urlparse(next_link).query)["cursor"][0]
+
+    assert api_client.get(LIST_URL, {"ordering": "-created_at", "cursor": cursor}).status_code == 404
+
+    payload = json.loads(b64decode(cursor))
+    payload["p"][0] = "not-a-price"
+    tampered = b64encode(json.dumps(payload).encode()).decode()
+    assert api_client.get(LIST_URL, {"ordering": "price", "cursor": tampered}).status_code == 404
+
+
+@pytest.mark.django_db
+def test_my_listings_use_cursor_pagination(api_client, user_with_profile):
+    ll = user_with_profile(username="ll", role="landlord")
+    mine = baker.make("listings.Listing", landlord=ll, _quantity=7)
+    api_client.force_authenticate(user=ll)
+
+    ids, _ = walk(api_client, MY_URL, {"ordering": "-views_count"})
+    assert sorted(ids) == sorted(obj.id for obj in mine)
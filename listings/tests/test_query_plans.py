@@ -0,0 +1,148 @@
+"""
+Query-plan regression suite for the public listings feed.
+
+Seeds a catalog, builds the exact queryset ListingViewSet runs for every supported
+filter/ordering combination (filters + cursor pagination ordering) and checks
+EXPLAIN: the listings table must be reached through an index, never a full scan.
+The availability anti-join (?check_in=&check_out=) must probe bookings through an index.
+Works on SQLite (EXPLAIN QUERY PLAN) and MySQL (EXPLAIN, access type "ALL").
+"""
+import itertools
+import json
+import re
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from bookings.choices import BookingStatus
+from bookings.models import Booking
+from listings.choices import HousingType, ListingStatus
+from listings.models import Listing
+from listings.views import ListingViewSet
+
+CATALOG_SIZE = 3000
+CITIES = ["Kyiv", "Odessa", "Lviv", "Dnipro", "Kharkiv", "Uman"]
+DISTRICTS = ["Center", "North", "South", "East", "West"]
+
+FILTERS = [
+    {},
+    {"location_city": "Odessa"},
+    {"location_city": "Odessa", "location_district": "Center"},
+    {"location_city": "Odessa", "price__gte": "500", "price__lte": "900"},
+    {"housing_type": "house"},
+    {"housing_type": "house", "rooms__gte": "2", "rooms__lte": "3"},
+    {"rooms__gte": "3"},
+    {"rooms__gte": "2", "price__lte": "700"},
+    {"price__gte": "1000"},
+]
+ORDERINGS = [None, "created_at", "-created_at", "price", "-price", "views_count", "-views_count", "rating_avg", "-rating_avg"]
+
+
+@pytest.fixture
+def catalog(user_with_profile):
+    ll = user_with_profile(username="ll", role="landlord")
+    statuses = [ListingStatus.AVAILABLE] * 8 + [ListingStatus.UNAVAILABLE, ListingStatus.MAINTENANCE]
+    Listing.objects.bulk_create(
+        Listing(
+            landlord=ll,
+            title=f"Listing {i}",
+            description="x",
+            location_city=CITIES[i % len(CITIES)],
+            location_district=DISTRICTS[i % len(DISTRICTS)],
+            price=Decimal(200 + (i * 37) % 1500),
+            rooms=1 + i % 5,
+            housing_type=HousingType.values[i % len(HousingType.values)],
+            status=statuses[i % len(statuses)],
+            views_count=(i * 13) % 400,
+            rating_count=i % 4,
+            rating_avg=Decimal((i * 7) % 41) / 10 + 1 if i % 4 else 0,
+        )
+        for i in range(CATALOG_SIZE)
+    )
+    with connection.cursor() as cursor:
+        # Give the planner real statistics, as production databases have
+        cursor.execute("ANALYZE")
+
+
+def feed_queryset(params):
+    """The queryset ListingViewSet.list() would paginate for these query params."""
+    request = Request(APIRequestFactory().get("/api/listings/listings/", params))
+    view = ListingViewSet(request=request, format_kwarg=None, action="list", kwargs={})
+    queryset = view.filter_queryset(view.get_queryset())
+    paginator = view.paginator
+    paginator.ordering = paginator.get_ordering(request, queryset, view)
+    return queryset.order_by(*paginator.ordering)[:paginator.page_size + 1]
+
+
+def _mysql_access_types(node, table):
+    """Walk MySQL's JSON plan and yield access types used for `table`."""
+    if isinstance(node, dict):
+        if node.get("table_name") == table:
+            yield node.get("access_type")
+        for value in node.values():
+            yield from _mysql_access_types(value, table)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _mysql_access_types(value, table)
+
+
+def full_scans(queryset, table=Listing._meta.db_table, alias=None):
+    """
+    Return (offending plan steps, full plan) for `table` in the given queryset.
+    `alias`: the name SQLite prints for the table inside a subquery (Django uses U0, U1...).
+    """
+    if connection.vendor == "sqlite":
+        plan = queryset.explain()
+        # "SCAN listings_listing" (optionally "USING INDEX" = full index walk) vs. "SEARCH ..."
+        names = "|".join(re.escape(name) for name in (table, alias) if name)
+        return [line for line in plan.splitlines() if re.search(rf"\bSCAN ({names})\b", line)], plan
+    if connection.vendor == "mysql":
+        plan = queryset.explain(format="json")
+        # access_type "ALL" = full table scan, "index" = full index scan
+        return [t for t in _mysql_access_types(json.loads(plan), table) if t in ("ALL", "index")], plan
+    pytest.skip(f"No plan checker for {connection.vendor}")
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("filters,ordering", list(itertools.product(FILTERS, ORDERINGS)))
+def test_feed_never_full_scans(catalog, filters, ordering):
+    params = dict(filters)
+    if ordering:
+        params["ordering"] = ordering
+    offending, plan = full_scans(feed_queryset(params))
+    assert not offending, f"full scan for {params}:\n{plan}"
+
+
+@pytest.fixture
+def booked_catalog(catalog, user_with_profile):
+    tenant = user_with_profile(username="tt")
+    statuses = BookingStatus.values
+    Booking.objects.bulk_create(
+        Booking(
+            listing_id=listing_id,
+            tenant=tenant,
+            start_date=date(2025, 1, 1) + timedelta(days=(listing_id * 7 + n * 11) % 300),
+            end_date=date(2025, 1, 1) + timedelta(days=(listing_id * 7 + n * 11) % 300 + 3),
+            status=statuses[(listing_id + n) % len(statuses)],
+        )
+        for listing_id in Listing.objects.values_list("id", flat=True)
+        for n in range(3)
+    )
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("filters", [{}, {"location_city": "Odessa"}, {"price__gte": "1000"}])
+def test_availability_probes_bookings_by_index(booked_catalog, filters):
+    params = {**filters, "check_in": "2025-09-10", "check_out": "2025-09-15"}
+    queryset = feed_queryset(params)
+    offending, plan = full_scans(queryset, table=Booking._meta.db_table, alias="U0")
+    assert not offending, f"bookings full scan for {params}:\n{plan}"
+    if connection.vendor == "sqlite":
+        # Answered inside a covering index, without reading booking rows
+        assert re.search(r"COVERING INDEX booking_(overlap|availability)_idx", plan), plan
@@ -0,0 +1,126 @@
+import pytest
+from model_bakery import baker
+
+from listings.models import Listing
+from listings.search import InMemorySearchBackend, get_search_backend, reset_search_backend, tokenize
+
+LIST_URL = "/api/listings/listings/"
+SEARCH_URL = f"{LIST_URL}search/"
+
+
+@pytest.fixture
+def search_backend(settings):
+    def _use(name):
+        settings.LISTINGS_SEARCH_BACKEND = name
+        reset_search_backend()
+        return get_search_backend()
+    yield _use
+    reset_search_backend()
+
+
+def make_listings(landlord):
+    return [
+        baker.make("listings.Listing", landlord=landlord, status="available",
+                   title="Sunny flat", description="Sunny sunny balcony near the sea",
+                   location_city="Odessa", location_district="Arcadia"),
+        baker.make("listings.Listing", landlord=landlord, status="available",
+                   title="Quiet house", description="Garden, sunny kitchen",
+                   location_city="Kyiv", location_district="Podil"),
+        baker.make("listings.Listing", landlord=landlord, status="available",
+                   title="Studio", description="Compact studio",
+                   location_city="Odessa", location_district="Center"),
+    ]
+
+
+def test_tokenize():
+    assert tokenize("Sunny, FLAT-near sea!") == ["sunny", "flat", "near", "sea"]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("backend_name", ["sqlite", "memory"])
+def test_search_ranks_by_relevance(api_client, user_with_profile, search_backend,
+                                   django_capture_on_commit_callbacks, backend_name):
+    search_backend(backend_name)
+    ll = user_with_profile(username="ll", role="landlord")
+    with django_capture_on_commit_callbacks(execute=True):
+        flat, house, _studio = make_listings(ll)
+
+    resp = api_client.get(LIST_URL, {"search": "sunny"})
+    assert resp.status_code == 200
+    ids = [item["id"] for item in resp.json()["results"]]
+    # "sunny" occurs three times in the flat and once in the house
+    assert ids == [flat.id, house.id]
+
+    # prefix match + AND semantics across terms
+    resp = api_client.get(SEARCH_URL, {"q": "odes stud"})
+    assert [item["id"] for item in resp.json()["results"]] == [_studio.id]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("backend_name", ["sqlite", "memory"])
+def test_index_follows_save_and_delete(api_client, user_with_profile, search_backend,
+                                       django_capture_on_commit_callbacks, backend_name):
+    backend = search_backend(backend_name)
+    ll = user_with_profile(username="ll", role="landlord")
+    with django_capture_on_commit_callbacks(execute=True):
+        listing = baker.make("listings.Listing", landlord=ll, status="available",
+                             title="Old title", description="plain")
+    backend.filter(listing.__class__.objects.all(), "old")  # warm up lazy indexes
+
+    with django_capture_on_commit_callbacks(execute=True):
+        listing.title = "Renamed loft"
+        listing.save()
+    assert [i["id"] for i in api_client.get(SEARCH_URL, {"q": "loft"}).json()["results"]] == [listing.id]
+    assert api_client.get(SEARCH_URL, {"q": "old"}).json()["results"] == []
+
+    with django_capture_on_commit_callbacks(execute=True):
+        listing.delete()
+    assert api_client.get(SEARCH_URL, {"q": "loft"}).json()["results"] == []
+
+
+def test_in_memory_scores_require_every_term():
+    backend = InMemorySearchBackend()
+    backend._loaded = True
+    backend._add(1, ["sea view", "Odessa"])
+    backend._add(2, ["sea", "Kyiv"])
+    backend._sorted_tokens = sorted(backend._postings)
+
+    assert set(backend.scores("sea")) == {1, 2}
+    assert set(backend.scores("sea ode")) == {1}
+    assert backend.scores("mountain") == {}
+
+
+@pytest.mark.django_db
+def test_in_memory_filter_keeps_only_the_best_candidates(settings, user_with_profile):
+    settings.LISTINGS_SEARCH_MAX_CANDIDATES = 2
+    landlord = user_with_profile(username="ll", role="landlord")
+    sunny, house, _ = make_listings(landlord)
+    best = baker.make("listings.Listing", landlord=landlord, status="available",
+                      title="Sunny sunny sunny", description="sunny")
+    backend = InMemorySearchBackend()
+
+    assert len(backend.scores("sunny")) == 3
+    ranked = backend.filter(Listing.objects.all(), "sunny").order_by("-search_rank")
+    assert [listing.pk for listing in ranked] == [best.pk, sunny.pk]
+
+
+@pytest.mark.django_db
+def test_in_memory_cap_counts_only_listings_that_pass_the_filters(api_client, settings, user_with_profile,
+                                                                  search_backend):
+    settings.LISTINGS_CACHE_ENABLED = False
+    settings.LISTINGS_SEARCH_MAX_CANDIDATES = 1
+    landlord = user_with_profile(username="ll", role="landlord")
+    for n in range(2):
+        baker.make("listings.Listing", landlord=landlord, status="unavailable",
+                   title=f"Loft loft loft {n}", description="loft loft")
+    lviv = baker.make("listings.Listing", landlord=landlord, status="available",
+                           title="Loft loft", description="loft", location_city="Lviv")
+    match = baker.make("listings.Listing", landlord=landlord, status="available",
+                       title="Loft", description="Bright", location_city="Kyiv")
+    search_backend("memory")
+
+    r = api_client.get(SEARCH_URL, {"q": "loft"})
+    assert [item["id"] for item in r.json()["results"]] == [lviv.id]
+
+    r = api_client.get(SEARCH_URL, {"q": "loft", "location_city": "Kyiv"})
+    assert [item["id"] for item in r.json()["results"]] == [match.id]
@@ -0,0 +1,116 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from model_bakery import baker
+
+STATS_URL = "/api/listings/my-listings/stats/"
+RANGE = {"from": "2025-09-01", "to": "2025-09-30"}
+
+
+def make_portfolio(landlord, tenant, n):
+    listings = [baker.make("listings.Listing", landlord=landlord, price=Decimal("100.00")) for _ in range(n)]
+    for listing in listings:
+        baker.make("analytics.ListingView", user=tenant, listing=listing, viewed_on=date(2025, 9, 3))
+        # Confirmed, partially outside the range: Aug 29 -> Sep 3 counts Sep 1, 2 (2 nights)
+        confirmed = baker.make(
+            "bookings.Booking", listing=listing, tenant=tenant,
+            start_date=date(2025, 8, 29), end_date=date(2025, 9, 3), status="confirmed",
+        )
+        baker.make(
+            "bookings.Booking", listing=listing, tenant=tenant,
+            start_date=date(2025, 9, 10), end_date=date(2025, 9, 12), status="pending",
+        )
+        baker.make("reviews.Review", listing=listing, tenant=tenant, booking=confirmed, rating=4)
+    return listings
+
+
+@pytest.mark.django_db
+def test_stats_values(api_client, user_with_profile):
+    landlord = user_with_profile(username="ll", role="landlord")
+    tenant = user_with_profile(username="tt")
+    listing = make_portfolio(landlord, tenant, 1)[0]
+    # Outside the range: ignored
+    baker.make(
+        "bookings.Booking", listing=listing, tenant=tenant,
+        start_date=date(2025, 10, 5), end_date=date(2025, 10, 9), status="confirmed",
+    )
+    # Other landlord's listing: not visible
+    make_portfolio(user_with_profile(username="other", role="landlord"), tenant, 1)
+
+    api_client.force_authenticate(user=landlord)
+    r = api_client.get(STATS_URL, RANGE)
+    assert r.status_code == 200
+    data = r.json()
+    assert len(data["listings"]) == 1
+    row = data["listings"][0]
+    assert row["id"] == listing.id
+    assert row["views"] == 1
+    assert row["views_by_day"] == [{"day": "2025-09-03", "views": 1}]
+    assert row["bookings"] == {"rejected": 0, "pending": 1, "confirmed": 1, "cancelled": 0, "expired": 0}
+    assert row["confirmed_nights"] == 2
+    assert Decimal(row["estimated_revenue"]) == Decimal("200.00")
+    assert row["reviews_count"] == 1
+    assert row["average_rating"] == 4
+    assert data["totals"]["confirmed_nights"] == 2
+
+
+@pytest.mark.django_db
+def test_stats_query_count_is_fixed(api_client, user_with_profile, settings):
+    settings.LISTINGS_CACHE_ENABLED = False
+    landlord = user_with_profile(username="ll", role="landlord")
+    tenant = user_with_profile(username="tt")
+    api_client.force_authenticate(user=landlord)
+    api_client.get(STATS_URL, RANGE)  # warm up: the permission check loads the profile once
+
+    counts = []
+    for n in (1, 5):
+        make_portfolio(landlord, tenant, n)
+        with CaptureQueriesContext(connection) as ctx:
+            assert api_client.get(STATS_URL, RANGE).status_code == 200
+        counts.append(len(ctx.captured_queries))
+    assert counts[0] == counts[1] == 4
+
+
+@pytest.mark.django_db
+def test_stats_cached_and_invalidated_by_bookings_and_reviews(api_client, user_with_profile):
+    landlord = user_with_profile(username="ll", role="landlord")
+    tenant = user_with_profile(username="tt")
+    listing = make_portfolio(landlord, tenant, 1)[0]
+    api_client.force_authenticate(user=landlord)
+
+    assert api_client.get(STATS_URL, RANGE).json()["listings"][0]["bookings"]["rejected"] == 0
+    booking = baker.make(
+        "bookings.Booking", listing=listing, tenant=tenant,
+        start_date=date(2025, 9, 20), end_date=date(2025, 9, 22), status="rejected",
+    )
+    assert api_client.get(STATS_URL, RANGE).json()["listings"][0]["bookings"]["rejected"] == 1
+
+    # Served from the cache while nothing changes
+    with CaptureQueriesContext(connection) as ctx:
+        api_client.get(STATS_URL, RANGE)
+    assert not any("bookings_booking" in q["sql"] for q in ctx.captured_queries)
+
+    review = listing.reviews.get()
+    review.rating = 2
+    review.save()
+    assert api_client.get(STATS_URL, RANGE).json()["listings"][0]["average_rating"] == 2
+
+    booking.delete()
+    assert api_client.get(STATS_URL, RANGE).json()["listings"][0]["bookings"]["rejected"] == 0
+
+
+@pytest.mark.django_db
+def test_stats_access_and_validation(api_client, user_with_profile):
+    api_client.force_authenticate(user=user_with_profile(username="tt", role="tenant"))
+    assert api_client.get(STATS_URL).status_code == 403
+
+    api_client.force_authenticate(user=user_with_profile(username="ll", role="landlord"))
+    assert api_client.get(STATS_URL).status_code == 200
+    assert api_client.get(STATS_URL, {"from": "2025-09-10", "to": "2025-09-01"}).status_code == 400
+    assert api_client.get(STATS_URL, {"from": "nope"}).status_code == 400
+    invalid = api_client.get(STATS_URL, {"to": "2026-02-30"})
+    assert invalid.status_code == 400
+    assert "to" in invalid.json()
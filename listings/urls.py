@@ -6,6 +6,10 @@ router = DefaultRouter()
 router.register(r'listings', ListingViewSet, basename='listings')
 router.register(r'my-listings', MyListingViewSet, basename='my-listings')
 
+# Calendar clients poll the feed without a trailing slash
+my_listing_calendar_ics = MyListingViewSet.as_view({'get': 'calendar_ics'}, **MyListingViewSet.calendar_ics.kwargs)
+
 urlpatterns = [
+    path('my-listings/<int:pk>/calendar.ics', my_listing_calendar_ics, name='my-listings-calendar-ics'),
     path('', include(router.urls)),
 ]
@@ -1,75 +1,107 @@
-from django.db import transaction
-from django.db.models import Q, F
+from datetime import timedelta
+
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets, permissions
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.permissions import IsAdminUser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.filters import OrderingFilter
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.response import Response
 
+from config.paginations import CustomCursorPagination
+from . import cache as listing_cache
+from . import ical
 from .models import Listing
 from .serializers import ListingSerializer
 from .choices import ListingStatus
-from analytics.models import SearchHistory, ListingView
+from .calendar import listing_calendar
+from .facets import compute_facets
+from .filters import ListingFilter, ListingSearchFilter, order_by_relevance
+from .search import get_search_backend
+from .stats import landlord_stats
+from analytics.recorder import get_view_recorder
+from analytics.search_log import get_search_logger
+from analytics.uniques import get_unique_viewers_recorder, visitor_id
+from utils.conditional import ConditionalGetMixin, is_not_modified, not_modified_response, validator_headers
+from utils.dates import query_date
 from utils.permissions import IsLandlordOrReadOnly, IsLandlordOwnerOnly
 
 
-class ListingViewSet(viewsets.ReadOnlyModelViewSet):
+class ListingViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """
     Public listings (read-only):
     - Anyone can use GET/HEAD/OPTIONS.
-    - Search over title/description/location_*.
+    - Full-text search over title/description/location_* (ranked by relevance).
     - Field filtering + ordering.
-    - Logs search queries to SearchHistory.
+    - Availability: ?check_in=&check_out= excludes listings with overlapping pending/confirmed bookings.
+    - Logs search queries to SearchHistory (queued, written in batches off the request path).
+    - Anonymous list/retrieve/search responses are served from a versioned cache (listings/cache.py).
+    - Conditional GET: ETag/Last-Modified from `updated_at`, 304 without serializing.
     """
     queryset = Listing.objects.select_related("landlord").all()
     serializer_class = ListingSerializer
     permission_classes = [IsLandlordOrReadOnly]
+    # Keyset pagination: no COUNT(*)/OFFSET on the public feed
+    pagination_class = CustomCursorPagination
 
     # Filters/search/ordering — visible in DRF Browsable API
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
-    filterset_fields = {
-        "status": ["exact"],
-        "location_city": ["exact"],
-        "location_district": ["exact"],
-        "rooms": ["gte", "lte"],
-        "housing_type": ["exact"],
-        "price": ["gte", "lte"],
-    }
+    filter_backends = [DjangoFilterBackend, ListingSearchFilter, OrderingFilter]
+    # Field filters + ?check_in=&check_out= availability
+    filterset_class = ListingFilter
     search_fields = ["title", "description", "location_city", "location_district"]
-    ordering_fields = ["created_at", "price", "views_count"]
+    ordering_fields = ["created_at", "price", "views_count", "rating_avg"]
+    calendar_default_days = 90
+    calendar_max_days = 366
 
     def retrieve(self, request, *args, **kwargs):
-        instance = self.get_object()
-
-        # Log a single view per user per day
+        if not request.user.is_authenticated:
+            # Anonymous views only feed the unique-viewers sketch, so the whole response can come from the cache
+            response = listing_cache.cached_response(
+                request,
+                lambda: listing_cache.detail_key(request, kwargs[self.lookup_field]),
+                listing_cache.detail_ttl(),
+                lambda: super(ListingViewSet, self).retrieve(request, *args, **kwargs),
+            )
+        else:
+            # One fetch (or a 304 from the validator query) + serialization
+            response = super().retrieve(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            self._record_view(request, int(kwargs[self.lookup_field]))
+        return response
+
+    def _record_view(self, request, listing_id):
+        # Both recorders buffer the event and write it off the request path
+        today = timezone.localdate()
         if request.user.is_authenticated:
-            today = timezone.localdate()
-            with transaction.atomic():
-                _, _created = ListingView.objects.get_or_create(
-                    user=request.user,
-                    listing=instance,
-                    viewed_on=today,
-                )
-
-        return super().retrieve(request, *args, **kwargs)
+            # Log a single view per user per day
+            get_view_recorder().record(request.user.pk, listing_id, today)
+        get_unique_viewers_recorder().record(listing_id, today, visitor_id(request))
 
     # If you want the public endpoint to show ONLY available listings:
     def get_queryset(self):
         return super().get_queryset().filter(status=ListingStatus.AVAILABLE)
 
+    def _log_search(self, request, keyword):
+        if keyword:
+            get_search_logger().log(request.user.pk if request.user.is_authenticated else None, keyword)
+
     def list(self, request, *args, **kwargs):
         """
         Log searches if ?search=... or ?q=... is provided
         (DRF's SearchFilter uses the `search` parameter).
         """
         keyword = (request.query_params.get("search") or request.query_params.get("q") or "").strip()
-        if keyword:
-            SearchHistory.objects.create(
-                user=request.user if request.user.is_authenticated else None,
-                keyword=keyword,
-            )
-        return super().list(request, *args, **kwargs)
+        self._log_search(request, keyword)
+        return listing_cache.cached_response(
+            request,
+            lambda: listing_cache.list_key(request, "list"),
+            listing_cache.list_ttl(),
+            lambda: super(ListingViewSet, self).list(request, *args, **kwargs),
+        )
 
     @action(detail=False, methods=["get"])
     def search(self, request):
@@ -79,28 +111,86 @@ class ListingViewSet(viewsets.ReadOnlyModelViewSet):
         Will appear as a "GET" button in Extra actions in the browsable API.
         """
         q = (request.query_params.get("q") or "").strip()
-
+        self._log_search(request, q)
+        return listing_cache.cached_response(
+            request,
+            lambda: listing_cache.list_key(request, "search"),
+            listing_cache.list_ttl(),
+            lambda: self._search_response(request, q),
+        )
+
+    def _search_response(self, request, q):
         # Apply ALL standard filters/search/ordering so ?status=..., ?ordering=..., ?search=... keep working
         qs = self.filter_queryset(self.get_queryset())
-
         if q:
-            qs = qs.filter(Q(title__icontains=q) | Q(description__icontains=q))
-            SearchHistory.objects.create(
-                user=request.user if request.user.is_authenticated else None,
-                keyword=q,
-            )
+            qs = order_by_relevance(request, get_search_backend().filter(qs, q))
+        return self.conditional_list_response(request, qs)
 
-        page = self.paginate_queryset(qs)
-        if page is not None:
-            ser = self.get_serializer(page, many=True)
-            return self.get_paginated_response(ser.data)
-        ser = self.get_serializer(qs, many=True)
-        return Response(ser.data)
+    @action(detail=True, methods=["get"])
+    def calendar(self, request, pk=None):
+        """
+        Busy nights of one listing: /api/listings/listings/{id}/calendar/?from=YYYY-MM-DD&to=YYYY-MM-DD
+        Defaults to today + 90 days, at most 366 days. Merged intervals + a bitmask per month.
+        Cached per listing until the listing or one of its bookings changes.
+        """
+        if not str(pk).isdigit():
+            raise NotFound()
+        start = query_date(request, "from", timezone.localdate())
+        end = query_date(request, "to", start + timedelta(days=self.calendar_default_days - 1))
+        if start > end:
+            raise ValidationError({"from": "Must not be after 'to'."})
+        if (end - start).days >= self.calendar_max_days:
+            raise ValidationError({"to": f"The range can span at most {self.calendar_max_days} days."})
+
+        def produce():
+            # Runs after calendar_key() has read the version: if the listing is hidden meanwhile,
+            # the bump makes whatever this stores unreachable
+            if not self.get_queryset().filter(pk=pk).exists():
+                raise NotFound()
+            return Response(listing_calendar(int(pk), start, end))
+
+        return listing_cache.cached_response(
+            request,
+            lambda: listing_cache.calendar_key(request, pk),
+            listing_cache.calendar_ttl(),
+            produce,
+            anonymous_only=False,
+        )
+
+    @action(detail=False, methods=["get"])
+    def facets(self, request):
+        """
+        Facet counts for the filter UI: /api/listings/listings/facets/?location_city=...&search=...
+        Accepts the same filters as the list; each facet ignores its own filter (drill-down).
+        Cached for all users until any listing changes.
+        """
+        return listing_cache.cached_response(
+            request,
+            lambda: listing_cache.list_key(request, "facets"),
+            listing_cache.list_ttl(),
+            lambda: Response(compute_facets(self, request)),
+            anonymous_only=False,
+        )
+
+    @action(detail=False, methods=["get"], url_path="cache-stats", permission_classes=[IsAdminUser])
+    def cache_stats(self, request):
+        """
+        Admin-only: hit/miss counters of the anonymous response cache (for sizing TTLs/memory).
+        """
+        return Response({
+            "enabled": listing_cache.is_enabled(),
+            "list_ttl": listing_cache.list_ttl(),
+            "detail_ttl": listing_cache.detail_ttl(),
+            **listing_cache.stats(),
+        })
 
 
 class MyListingViewSet(viewsets.ModelViewSet):
     serializer_class = ListingSerializer
     permission_classes = [IsLandlordOwnerOnly]
+    pagination_class = CustomCursorPagination
+    ordering_fields = ["created_at", "price", "views_count", "rating_avg"]
+    stats_default_days = 30
 
     def get_queryset(self):
         user = self.request.user
@@ -108,3 +198,58 @@ class MyListingViewSet(viewsets.ModelViewSet):
             return Listing.objects.all()
         # Critical: only expose the current user's own listings
         return Listing.objects.filter(landlord_id=user.pk)
+
+    @action(detail=False, methods=["get"])
+    def stats(self, request):
+        """
+        Dashboard for all of the landlord's listings: /api/listings/my-listings/stats/?from=...&to=...
+        Views by day, bookings by status, confirmed nights, estimated revenue, average rating.
+        Dates are YYYY-MM-DD (default: the last 30 days). Cached per landlord until
+        one of their listings, bookings or reviews changes.
+        """
+        end = query_date(request, "to", timezone.localdate())
+        start = query_date(request, "from", end - timedelta(days=self.stats_default_days - 1))
+        if start > end:
+            raise ValidationError({"from": "Must not be after 'to'."})
+
+        def produce():
+            return Response(landlord_stats(self.get_queryset(), start, end))
+
+        if request.user.is_superuser:
+            # Superusers see every listing: no single landlord version covers that
+            return produce()
+        return listing_cache.cached_response(
+            request,
+            lambda: listing_cache.stats_key(request, request.user.pk),
+            listing_cache.stats_ttl(),
+            produce,
+            anonymous_only=False,
+        )
+
+    @action(
+        detail=True,
+        methods=["get"],
+        url_path=r"calendar\.ics",
+        renderer_classes=[ical.ICalendarRenderer, JSONRenderer],
+    )
+    def calendar_ics(self, request, pk=None):
+        """
+        iCal feed of the listing's pending/confirmed bookings for external calendars:
+        /api/listings/my-listings/{id}/calendar.ics
+        Streamed in chunks; ETag/Last-Modified follow the latest booking change, so an
+        unchanged calendar is answered with 304 after one query.
+        """
+        listing = get_object_or_404(
+            ical.with_feed_version(self.get_queryset().only("pk", "landlord_id", "title", "updated_at")),
+            pk=pk,
+        )
+        self.check_object_permissions(request, listing)
+        etag, last_modified = ical.validators(listing)
+        headers = validator_headers(etag, last_modified)
+        if is_not_modified(request, etag, last_modified):
+            return not_modified_response(headers)
+        response = StreamingHttpResponse(ical.feed(listing), content_type=ical.CONTENT_TYPE)
+        response["Content-Disposition"] = f'inline; filename="listing-{listing.pk}.ics"'
+        for name, value in headers.items():
+            response[name] = value
+        return response
@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from reviews.ratings import recount
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the rating summary of every listing (rating_count/sum/avg, per-star counts) from "
+        "Review in chunked grouped queries. Needed after writes that bypass the review signals."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, help="Listings per query (default: REVIEWS_RECOUNT_CHUNK_SIZE).")
+
+    def handle(self, *args, **options):
+        t0 = time.perf_counter()
+        result = recount(chunk_size=options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(
+            f"{result['listings']} listings checked, {result['fixed']} repaired in {time.perf_counter() - t0:.1f} s."
+        ))
@@ -32,6 +32,7 @@ class Review(models.Model):
     )
     comment = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, help_text='Last change; used as HTTP validator (ETag/Last-Modified)')
 
     def __str__(self):
         return f"{self.tenant.username}'s review for {self.listing.title} ({self.rating})"
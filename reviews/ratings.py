@@ -0,0 +1,113 @@
+"""
+Rating summary stored on Listing: rating_count, rating_sum, rating_avg and the per-star
+histogram rating_1 .. rating_5, so list pages show and sort by rating without touching Review.
+
+- `apply(listing_id, added, removed)` is called by the review signals (reviews/signals.py):
+  one `UPDATE ... SET col = col + delta` with F() expressions (no read-modify-write, so
+  concurrent reviews of a listing never lose an increment), then rating_avg is derived from
+  the new totals while the row is still locked. `updated_at` and the listing cache versions are
+  bumped, since the rating is part of the listing representation.
+- `recount(chunk_size)` rebuilds the summary from Review for writes that bypass the signals
+  (queryset.update(), bulk_create, raw SQL): listings in primary-key chunks, one GROUP BY
+  (listing, rating) query per chunk, only drifted rows written back. The chunk's listings
+  are locked first, so a review saved meanwhile is either counted here or applied on top.
+"""
+from collections import Counter
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from listings import cache as listing_cache
+from listings.models import Listing
+from .choices import ReviewRating
+from .models import Review
+
+DEFAULT_CHUNK_SIZE = 1000
+STAR_FIELDS = {star: f"rating_{star}" for star in ReviewRating.values}
+SUMMARY_FIELDS = ["rating_count", "rating_sum", "rating_avg", *STAR_FIELDS.values()]
+CENTS = Decimal("0.01")
+
+
+def average(count, total):
+    return (Decimal(total) / count).quantize(CENTS, ROUND_HALF_UP) if count else Decimal(0)
+
+
+def _bump(listing_id):
+    listing_cache.bump_listing(listing_id)
+    transaction.on_commit(lambda: listing_cache.bump_listing(listing_id))
+
+
+def apply(listing_id, added=(), removed=()):
+    """Add the ratings in `added` to a listing's summary and take those in `removed` out."""
+    stars = Counter(added)
+    stars.subtract(removed)
+    updates = {STAR_FIELDS[star]: F(STAR_FIELDS[star]) + delta for star, delta in stars.items() if delta}
+    if not updates:
+        return
+    count = len(added) - len(removed)
+    total = sum(added) - sum(removed)
+    if count:
+        updates["rating_count"] = F("rating_count") + count
+    if total:
+        updates["rating_sum"] = F("rating_sum") + total
+    with transaction.atomic():
+        listings = Listing.objects.filter(pk=listing_id)
+        if listings.update(**updates, updated_at=timezone.now()):
+            # The row stays locked by the UPDATE until commit: derive the average from the new totals
+            count, total = listings.values_list("rating_count", "rating_sum").get()
+            listings.update(rating_avg=average(count, total))
+    _bump(listing_id)
+
+
+def summary(ratings):
+    """{field: value} of the summary for a {star: number of reviews} mapping."""
+    count = sum(ratings.values())
+    total = sum(star * n for star, n in ratings.items())
+    values = {"rating_count": count, "rating_sum": total, "rating_avg": average(count, total)}
+    values.update({field: ratings.get(star, 0) for star, field in STAR_FIELDS.items()})
+    return values
+
+
+def recount(chunk_size=None):
+    """Recompute every listing's summary; returns {"listings", "fixed"}."""
+    chunk_size = chunk_size or getattr(settings, "REVIEWS_RECOUNT_CHUNK_SIZE", DEFAULT_CHUNK_SIZE)
+    listings = fixed = 0
+    last_pk = 0
+    while True:
+        with transaction.atomic():
+            chunk = list(
+                Listing.objects.select_for_update()
+                .filter(pk__gt=last_pk)
+                .order_by("pk")
+                .only("pk", *SUMMARY_FIELDS)[:chunk_size]
+            )
+            if not chunk:
+                break
+            last_pk = chunk[-1].pk
+            ratings = {}
+            rows = (
+                Review.objects.filter(listing_id__gte=chunk[0].pk, listing_id__lte=last_pk)
+                .order_by()
+                .values_list("listing_id", "rating")
+                .annotate(n=Count("id"))
+            )
+            for listing_id, rating, n in rows:
+                ratings.setdefault(listing_id, {})[rating] = n
+            drifted = []
+            now = timezone.now()
+            for listing in chunk:
+                values = summary(ratings.get(listing.pk, {}))
+                if any(getattr(listing, field) != value for field, value in values.items()):
+                    for field, value in values.items():
+                        setattr(listing, field, value)
+                    listing.updated_at = now
+                    drifted.append(listing)
+            Listing.objects.bulk_update(drifted, [*SUMMARY_FIELDS, "updated_at"])
+        for listing in drifted:
+            _bump(listing.pk)
+        listings += len(chunk)
+        fixed += len(drifted)
+    return {"listings": listings, "fixed": fixed}
@@ -0,0 +1,34 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import ratings
+from .models import Review
+
+
+@receiver(pre_save, sender=Review)
+def remember_rating(sender, instance, **kwargs):
+    # The stored (listing, rating) of an edited review, to move it in the listing summary
+    instance._rating_before = None
+    if instance.pk is not None and not instance._state.adding:
+        instance._rating_before = (
+            Review.objects.filter(pk=instance.pk).values_list("listing_id", "rating").first()
+        )
+
+
+@receiver(post_save, sender=Review)
+def update_listing_rating(sender, instance, created, **kwargs):
+    before = None if created else getattr(instance, "_rating_before", None)
+    if before is None:
+        ratings.apply(instance.listing_id, added=[instance.rating])
+    elif before != (instance.listing_id, instance.rating):
+        listing_id, rating = before
+        if listing_id == instance.listing_id:
+            ratings.apply(listing_id, added=[instance.rating], removed=[rating])
+        else:
+            ratings.apply(listing_id, removed=[rating])
+            ratings.apply(instance.listing_id, added=[instance.rating])
+
+
+@receiver(post_delete, sender=Review)
+def remove_listing_rating(sender, instance, **kwargs):
+    ratings.apply(instance.listing_id, removed=[instance.rating])
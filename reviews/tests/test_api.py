@@ -91,3 +91,39 @@ def test_update_delete_permissions(api_client, user_with_profile):
     r = api_client.post(BASE, {"booking": b.id, "rating": 3, "comment": "meh"}, format="json")
     assert r.status_code in (201, 200)
     review_id = r.json()["id"]
+
+
+@pytest.mark.django_db
+def test_review_list_conditional_get(api_client, user_with_profile):
+    ll = user_with_profile(username="ll", role="landlord")
+    tt = user_with_profile(username="tt", role="tenant")
+    review = baker.make("reviews.Review", listing__landlord=ll, tenant=tt, rating=4)
+
+    etag = api_client.get(BASE)["ETag"]
+    assert api_client.get(BASE, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    review.rating = 5
+    review.save()
+    assert api_client.get(BASE, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+@pytest.mark.django_db
+def test_review_etag_follows_the_author_username(api_client, user_with_profile):
+    ll = user_with_profile(username="ll", role="landlord")
+    tt = user_with_profile(username="tt", role="tenant")
+    review = baker.make("reviews.Review", listing__landlord=ll, tenant=tt, rating=4)
+    detail = f"{BASE}{review.pk}/"
+
+    list_etag = api_client.get(BASE)["ETag"]
+    first = api_client.get(detail)
+    assert "Last-Modified" not in first
+    assert api_client.get(detail, HTTP_IF_NONE_MATCH=first["ETag"]).status_code == 304
+
+    tt.username = "renamed"
+    tt.save()
+    resp = api_client.get(BASE, HTTP_IF_NONE_MATCH=list_etag)
+    assert resp.status_code == 200
+    assert resp.json()["results"][0]["tenant_info"]["username"] == "renamed"
+    changed = api_client.get(detail, HTTP_IF_NONE_MATCH=first["ETag"])
+    assert changed.status_code == 200
+    assert changed["ETag"] != first["ETag"]
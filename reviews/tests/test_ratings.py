@@ -0,0 +1,111 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from itertools import count
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from model_bakery import baker
+
+from listings.models import Listing
+from reviews.models import Review
+from reviews.ratings import recount
+
+LIST_URL = "/api/listings/listings/"
+_stays = count()
+
+
+def review(listing, rating):
+    start = date(2025, 1, 1) + timedelta(days=2 * next(_stays))
+    booking = baker.make(
+        "bookings.Booking", listing=listing, status="confirmed", start_date=start, end_date=start + timedelta(days=2)
+    )
+    return baker.make("reviews.Review", listing=listing, booking=booking, tenant=booking.tenant, rating=rating)
+
+
+def summary(listing):
+    listing = Listing.objects.get(pk=listing.pk)
+    histogram = [getattr(listing, f"rating_{star}") for star in range(1, 6)]
+    return listing.rating_count, listing.rating_sum, listing.rating_avg, histogram
+
+
+@pytest.mark.django_db
+def test_summary_follows_review_create_update_delete():
+    listing = baker.make("listings.Listing", status="available")
+    before = Listing.objects.get(pk=listing.pk).updated_at
+
+    first = review(listing, 5)
+    second = review(listing, 4)
+    review(listing, 4)
+    assert summary(listing) == (3, 13, Decimal("4.33"), [0, 0, 0, 2, 1])
+    assert Listing.objects.get(pk=listing.pk).updated_at > before
+
+    first.rating = 1
+    first.save()
+    assert summary(listing) == (3, 9, Decimal("3.00"), [1, 0, 0, 2, 0])
+
+    first.comment = "edited"  # rating unchanged
+    first.save()
+    assert summary(listing)[0] == 3
+
+    second.delete()
+    first.delete()
+    assert summary(listing) == (1, 4, Decimal("4.00"), [0, 0, 0, 1, 0])
+
+    Review.objects.filter(listing=listing).delete()
+    assert summary(listing) == (0, 0, Decimal("0.00"), [0, 0, 0, 0, 0])
+
+
+@pytest.mark.django_db
+def test_stale_instances_never_lose_increments():
+    listing = baker.make("listings.Listing", status="available")
+    stale = Listing.objects.get(pk=listing.pk)
+    review(listing, 3)
+    review(listing, 5)
+    stale.title = "Renamed"
+    stale.save(update_fields=["title"])
+    assert summary(listing)[:2] == (2, 8)
+
+
+@pytest.mark.django_db
+def test_recount_repairs_drift_in_chunks():
+    rated = baker.make("listings.Listing", status="available")
+    other = baker.make("listings.Listing", status="available")
+    unrated = baker.make("listings.Listing", status="available")
+    review(rated, 2)
+    review(rated, 5)
+    review(other, 3)
+    # Writes that bypass the signals
+    Review.objects.filter(listing=rated, rating=2).update(rating=4)
+    Listing.objects.filter(pk=unrated.pk).update(rating_count=7, rating_sum=35, rating_5=7, rating_avg=5)
+
+    assert recount(chunk_size=2) == {"listings": 3, "fixed": 2}
+    assert summary(rated) == (2, 9, Decimal("4.50"), [0, 0, 0, 1, 1])
+    assert summary(other) == (1, 3, Decimal("3.00"), [0, 0, 1, 0, 0])
+    assert summary(unrated) == (0, 0, Decimal("0.00"), [0, 0, 0, 0, 0])
+
+    call_command("recount_ratings", "--chunk-size", "1")
+    assert recount()["fixed"] == 0
+
+
+@pytest.mark.django_db
+def test_listing_api_exposes_and_sorts_by_rating_without_reviews_query(api_client):
+    low = baker.make("listings.Listing", status="available")
+    high = baker.make("listings.Listing", status="available")
+    unrated = baker.make("listings.Listing", status="available")
+    review(low, 2)
+    review(high, 5)
+    review(high, 4)
+
+    with CaptureQueriesContext(connection) as ctx:
+        resp = api_client.get(LIST_URL, {"ordering": "-rating_avg"})
+    assert resp.status_code == 200
+    assert not any("reviews_review" in q["sql"] for q in ctx.captured_queries)
+
+    results = resp.json()["results"]
+    assert [item["id"] for item in results] == [high.pk, low.pk, unrated.pk]
+    assert results[0]["rating_average"] == "4.50"
+    assert results[0]["rating_count"] == 2
+    assert results[0]["rating_histogram"] == {"1": 0, "2": 0, "3": 0, "4": 1, "5": 1}
+    assert results[2]["rating_average"] is None
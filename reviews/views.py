@@ -2,12 +2,18 @@ from rest_framework import viewsets, permissions
 
 from reviews.models import Review
 from reviews.serializers import ReviewSerializer
+from utils.conditional import ConditionalGetMixin
 from utils.permissions import IsReviewOwnerOrAdmin
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
+    """
+    Reviews CRUD; GET list/detail support ETag / If-None-Match. The ETag also covers the
+    author's username shown in `tenant_info`, so no Last-Modified is sent.
+    """
     serializer_class = ReviewSerializer
     queryset = Review.objects.select_related('listing', 'tenant', 'booking').all()
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsReviewOwnerOrAdmin]
+    etag_related_fields = ("tenant__username",)
 
 
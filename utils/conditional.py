@@ -0,0 +1,174 @@
+import hashlib
+
+from django.db.models import F
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+from rest_framework import status
+from rest_framework.generics import get_object_or_404
+from rest_framework.response import Response
+
+
+def make_etag(*parts, weak=False):
+    """Short opaque ETag built from arbitrary parts (ids, versions, links...)."""
+    digest = hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()[:32]
+    etag = quote_etag(digest)
+    return f"W/{etag}" if weak else etag
+
+
+def _opaque(etag):
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def is_not_modified(request, etag=None, last_modified=None):
+    """
+    Evaluate If-None-Match / If-Modified-Since for a GET/HEAD request.
+    If-None-Match takes precedence (RFC 9110); ETags are compared weakly.
+    `last_modified` is a datetime or None.
+    """
+    if request.method not in ("GET", "HEAD"):
+        return False
+
+    if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+    if if_none_match:
+        if not etag:
+            return False
+        tags = parse_etags(if_none_match)
+        return tags == ["*"] or _opaque(etag) in {_opaque(t) for t in tags}
+
+    if_modified_since = request.META.get("HTTP_IF_MODIFIED_SINCE")
+    if if_modified_since and last_modified is not None:
+        since = parse_http_date_safe(if_modified_since)
+        return since is not None and int(last_modified.timestamp()) <= since
+
+    return False
+
+
+def validator_headers(etag=None, last_modified=None):
+    headers = {}
+    if etag:
+        headers["ETag"] = etag
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified.timestamp())
+    return headers
+
+
+def not_modified_response(headers):
+    return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+
+class ConditionalGetMixin:
+    """
+    Conditional GET for ModelViewSets (ETag / If-None-Match, Last-Modified / If-Modified-Since).
+
+    The validators come from the model's `version_field` (an auto_now timestamp), so an
+    unchanged resource is answered with 304 before any serializer runs:
+    - retrieve: with If-None-Match/If-Modified-Since, one `SELECT pk, version_field` query and
+      the object permission check -> 304; otherwise the object is fetched once and the strong
+      ETag comes from the instance;
+    - list: the page is fetched with only (pk, version_field, ordering fields) -> weak ETag
+      over the page's ids/versions and pagination links; on a miss only the rows of that
+      page are loaded in full and serialized. No Last-Modified: the newest timestamp on a page
+      does not change when a row leaves it, so If-Modified-Since would answer a stale 304.
+
+    `etag_related_fields`: lookups of related values the serializer renders (e.g. a nested
+    "tenant__username"). They change without touching `version_field`, so they are read
+    with the validators (a JOIN in the same query) and hashed into the ETag; such resources
+    send no Last-Modified at all, since no timestamp covers them.
+    """
+    version_field = "updated_at"
+    etag_related_fields = ()
+
+    def _renderer_format(self):
+        renderer = getattr(self.request, "accepted_renderer", None)
+        return getattr(renderer, "format", None)
+
+    def retrieve(self, request, *args, **kwargs):
+        conditional = "HTTP_IF_NONE_MATCH" in request.META or "HTTP_IF_MODIFIED_SINCE" in request.META
+        if conditional:
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            lookup = {self.lookup_field: kwargs[lookup_url_kwarg]}
+            light = self.filter_queryset(self.get_queryset()).select_related(None).only("pk", self.version_field)
+            obj = get_object_or_404(self._with_related(light), **lookup)
+            # Object permissions run before the 304, like in get_object(); fields they need
+            # beyond pk/version are loaded lazily
+            self.check_object_permissions(request, obj)
+            headers = self._detail_validators(obj)
+            if is_not_modified(request, headers["ETag"], self._last_modified(obj)):
+                return not_modified_response(headers)
+
+        # A plain GET (or a changed resource) costs a single fetch
+        instance = self.get_object()
+        serializer = self.get_serializer(instance)
+        headers = self._detail_validators(instance)
+        return Response(serializer.data, headers=headers)
+
+    def _with_related(self, queryset):
+        return queryset.annotate(
+            **{f"etag_related_{i}": F(lookup) for i, lookup in enumerate(self.etag_related_fields)}
+        )
+
+    def _related_values(self, obj):
+        """`etag_related_fields` of a row read through `_with_related`, or of a full instance."""
+        values = []
+        for i, lookup in enumerate(self.etag_related_fields):
+            alias = f"etag_related_{i}"
+            if hasattr(obj, alias):
+                values.append(getattr(obj, alias))
+                continue
+            value = obj
+            for name in lookup.split("__"):
+                value = getattr(value, name, None) if value is not None else None
+            values.append(value)
+        return tuple(values)
+
+    def _last_modified(self, obj):
+        return None if self.etag_related_fields else getattr(obj, self.version_field)
+
+    def _detail_validators(self, obj):
+        version = getattr(obj, self.version_field)
+        etag = make_etag(obj.pk, version.isoformat(), self._related_values(obj), self._renderer_format())
+        return validator_headers(etag, self._last_modified(obj))
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.conditional_list_response(request, queryset)
+
+    def _validator_fields(self):
+        fields = {"pk", self.version_field}
+        ordering_fields = getattr(self, "ordering_fields", None)
+        if isinstance(ordering_fields, (list, tuple)):
+            fields.update(ordering_fields)
+        ordering = self.queryset.model._meta.ordering if self.queryset is not None else ()
+        fields.update(o.lstrip("-") for o in ordering or ())
+        return fields
+
+    def conditional_list_response(self, request, queryset, light=None):
+        """
+        `light`: optional paginable sequence of the page candidates (pk + version fields) to use
+        instead of `queryset.only(...)`, e.g. a UNION; full rows are still loaded from `queryset`.
+        """
+        if light is None:
+            light = self._with_related(queryset.select_related(None).only(*self._validator_fields()))
+        page = self.paginate_queryset(light)
+        rows = page if page is not None else list(light)
+
+        versions = [(obj.pk, getattr(obj, self.version_field)) for obj in rows]
+        related = [self._related_values(obj) for obj in rows] if self.etag_related_fields else []
+        links = (self.paginator.get_next_link(), self.paginator.get_previous_link()) if page is not None else ()
+        etag = make_etag(
+            [(pk, ts.isoformat()) for pk, ts in versions], related, links, self._renderer_format(), weak=True
+        )
+        headers = validator_headers(etag)
+        if is_not_modified(request, etag):
+            return not_modified_response(headers)
+
+        # Load the full rows of this page only, keeping the page order
+        full = queryset.in_bulk([pk for pk, _ in versions]) if versions else {}
+        objects = [full[pk] for pk, _ in versions if pk in full]
+        serializer = self.get_serializer(objects, many=True)
+        if page is not None:
+            response = self.get_paginated_response(serializer.data)
+        else:
+            response = Response(serializer.data)
+        for name, value in headers.items():
+            response[name] = value
+        return response
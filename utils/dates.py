@@ -0,0 +1,19 @@
+from django.utils.dateparse import parse_date
+from rest_framework.exceptions import ValidationError
+
+
+def query_date(request, name, default=None):
+    """
+    `?name=YYYY-MM-DD` as a date, `default` when absent. Malformed values and impossible
+    calendar dates (2026-02-30, on which `parse_date` raises) are a 400 on that parameter.
+    """
+    value = request.query_params.get(name)
+    if not value:
+        return default
+    try:
+        day = parse_date(value)
+    except ValueError:
+        day = None
+    if day is None:
+        raise ValidationError({name: "Expected YYYY-MM-DD."})
+    return day